@@ -1,16 +1,26 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser
+
+from core.admin import OperatorScopedAdmin
+from .models import CustomUser, Operator
+
+
+@admin.register(Operator)
+class OperatorAdmin(OperatorScopedAdmin):
+    operator_lookup = "pk"
+
+    list_display = ("name", "created_at")
+    search_fields = ("name",)
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(OperatorScopedAdmin, UserAdmin):
     model = CustomUser
 
     # Edit form
     fieldsets = (
         ("Login Info", {"fields": ("email", "password")}),
-        ("Personal Info", {"fields": ("first_name", "last_name", "username", "company_name", "role")}),
+        ("Personal Info", {"fields": ("first_name", "last_name", "username", "company_name", "operator", "role")}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
         ("Important dates", {"fields": ("last_login", "date_joined")}),
     )
@@ -18,11 +28,12 @@ class CustomUserAdmin(UserAdmin):
     # Add form
     add_fieldsets = (
         ("Login Info", {"fields": ("email", "password")}),
-        ("Personal Info", {"fields": ("first_name", "last_name", "username", "company_name", "role")}),
+        ("Personal Info", {"fields": ("first_name", "last_name", "username", "company_name", "operator", "role")}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
         ("Important dates", {"fields": ("last_login", "date_joined")}),
     )
 
-    list_display = ("email", "first_name", "last_name", "company_name", "role", "is_staff", "is_active")
+    list_display = ("email", "first_name", "last_name", "company_name", "operator", "role", "is_staff", "is_active")
+    list_filter = ("operator", "role", "is_staff", "is_active")
     search_fields = ("email", "company_name", "role")
     ordering = ("email",)
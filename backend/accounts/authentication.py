@@ -0,0 +1,141 @@
+"""
+JWT authentication without a user query per request.
+
+``CachedJWTAuthentication`` keeps the users it loads in a small per-process
+cache for ``AUTH_USER_CACHE_TTL`` seconds; saving or deleting a user drops
+it from the cache of the process that made the change, and other processes
+see the change once their copy expires. ``StatelessJWTAuthentication`` never
+loads the user at all and answers from the claims the token was issued with
+(see MyTokenObtainPairSerializer), so a change of role only takes effect
+when the access token is next refreshed.
+
+Both scope the rest of the request to the user's operator (see
+core.tenancy).
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from core.tenancy import activate_operator, operator_id_for_user
+
+
+class UserCache:
+    """ A bounded, thread-safe map of user id to (user, expiry) """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(str(user_id))
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[str(user_id)]
+                return None
+        # A copy, so that nothing one request sets on its user leaks into another
+        return copy.copy(user)
+
+    def put(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[str(user_id)] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def get_user(user_id):
+    """ The user with the given id, from the cache when possible; None if there is none """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+    if user is not None:
+        user_cache.put(user_id, user)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """ JWTAuthentication that loads users through the per-process user cache """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            activate_operator(operator_id_for_user(result[0]))
+        return result
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # The password hash must be compared against the current row
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.put(user_id, user)
+        return user
+
+
+class ClaimsUser(TokenUser):
+    """ A user built from access token claims; unknown attributes read the claim of that name """
+
+    @cached_property
+    def id(self):
+        user_id = self.token[api_settings.USER_ID_CLAIM]
+        return int(user_id) if str(user_id).isdecimal() else user_id
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def operator_id(self):
+        return self.token.get("operator_id")
+
+    def __str__(self):
+        return f"{self.email} {self.role}"
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """ Authenticate from the token alone; request.user is a ClaimsUser """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            activate_operator(operator_id_for_user(result[0]))
+        return result
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return ClaimsUser(validated_token)
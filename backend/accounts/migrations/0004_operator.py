@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+DEFAULT_OPERATOR = 'Default operator'
+
+
+def assign_default_operator(apps, schema_editor):
+    # Existing users shared one fleet; superusers stay unscoped
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Operator = apps.get_model('accounts', 'Operator')
+    users = CustomUser.objects.filter(is_superuser=False)
+    if users.exists():
+        operator, _ = Operator.objects.get_or_create(name=DEFAULT_OPERATOR)
+        users.update(operator=operator)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_customuser_company_name_alter_customuser_email_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Operator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Example: Acme Executive Aviation', max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='operator',
+            field=models.ForeignKey(blank=True, help_text='The operator whose fleet the user works with; empty for platform staff', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='users', to='accounts.operator'),
+        ),
+        migrations.RunPython(assign_default_operator, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,26 @@ class UserRoles(models.TextChoices):
     OWNER = "owner", "Owner"
     ADMIN = "admin", "Admin"
 
+class Operator(models.Model):
+    """ An operator (tenant) owning a fleet; every fleet row carries its operator """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Example: Acme Executive Aviation"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
 class CustomUser(AbstractUser):
     """ A custom user model to represent a user of the application """
 
@@ -34,6 +54,14 @@ class CustomUser(AbstractUser):
         max_length=50, 
         choices=UserRoles.choices
     )
+    operator = models.ForeignKey(
+        Operator,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="users",
+        help_text="The operator whose fleet the user works with; empty for platform staff"
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name"]
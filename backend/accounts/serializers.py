@@ -1,14 +1,26 @@
 # yourapp/serializers.py
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import get_user
+from .tokens import RotatingRefreshToken
 
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RotatingRefreshToken
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
         # Add custom claims
         token["role"] = user.role
         token["email"] = user.email
+        # Enough for StatelessJWTAuthentication to stand in for the user
+        token["first_name"] = user.first_name
+        token["last_name"] = user.last_name
+        token["is_staff"] = user.is_staff
+        token["operator_id"] = user.operator_id
         return token
 
     def validate(self, attrs):
@@ -23,4 +35,28 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
                 "role": self.user.role,
             }
         })
-        return data
\ No newline at end of file
+        return data
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh with the user read through the user cache and the old refresh
+    token spent in one blacklist write.
+
+    The rotated pair is issued afresh for the user, so its claims carry the
+    user's current role.
+    """
+    token_class = RotatingRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = get_user(refresh.payload.get(api_settings.USER_ID_CLAIM))
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        if not api_settings.ROTATE_REFRESH_TOKENS:
+            return {"access": str(refresh.access_token)}
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            refresh.spend()
+        rotated = MyTokenObtainPairSerializer.get_token(user)
+        return {"access": str(rotated.access_token), "refresh": str(rotated)}
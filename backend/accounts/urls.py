@@ -1,10 +1,9 @@
 from django.urls import path
-from .views import MyTokenObtainPairView
-from rest_framework_simplejwt.views import TokenRefreshView
+from .views import MyTokenObtainPairView, RotatingTokenRefreshView
 from .api_views import MeView
 
 urlpatterns = [
     path("token/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token/refresh/", RotatingTokenRefreshView.as_view(), name="token_refresh"),
     path("me/", MeView.as_view(), name="me"),
 ]
\ No newline at end of file
@@ -1,14 +1,44 @@
 from django.contrib import admin
+from django.db.models import Sum
+from core.admin import OperatorScopedAdmin
+from core.paginator import EstimatedCountPaginator
 from .models import Aircraft, Flight, FlightEngineData
 
 
+class AltitudeBandFilter(admin.SimpleListFilter):
+    """ Filters cruise snapshots by flight level band instead of every distinct altitude """
+
+    title = "cruise altitude"
+    parameter_name = "altitude_band"
+
+    BANDS = {
+        "below_fl100": ("Below FL100", 0, 10000),
+        "fl100_fl200": ("FL100 - FL195", 10000, 20000),
+        "fl200_fl300": ("FL200 - FL295", 20000, 30000),
+        "fl300_fl400": ("FL300 - FL395", 30000, 40000),
+        "above_fl400": ("FL400 and above", 40000, None),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _, _) in self.BANDS.items()]
+
+    def queryset(self, request, queryset):
+        if self.value() not in self.BANDS:
+            return queryset
+        _, low, high = self.BANDS[self.value()]
+        queryset = queryset.filter(press_altitude__gte=low)
+        if high is not None:
+            queryset = queryset.filter(press_altitude__lt=high)
+        return queryset
+
+
 @admin.register(Aircraft)
-class AircraftAdmin(admin.ModelAdmin):
+class AircraftAdmin(OperatorScopedAdmin):
     model = Aircraft
 
     fieldsets = (
         ("Aircraft Information", {
-            "fields": ("manufacturer", "aircraft_type", "model", "registration", "serial")
+            "fields": ("operator", "manufacturer", "aircraft_type", "model", "registration", "serial")
         }),
         ("Time & Cycles", {
             "fields": ("total_time", "total_cycles")
@@ -16,18 +46,33 @@ class AircraftAdmin(admin.ModelAdmin):
     )
 
     list_display = (
+        "operator",
         "get_manufacturer_display",
         "get_aircraft_type_display",
         "model",
         "serial",
         "registration",
-        "total_time",
-        "total_cycles"
+        "get_current_total_time",
+        "get_current_total_cycles",
     )
-    list_filter = ("manufacturer", "aircraft_type")
+    list_filter = ("operator", "manufacturer", "aircraft_type")
     search_fields = ("model", "serial", "registration")
     ordering = ("manufacturer", "aircraft_type", "model", "serial", "registration")
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            pending_hours=Sum("utilization_deltas__hours"),
+            pending_cycles=Sum("utilization_deltas__cycles"),
+        )
+
+    @admin.display(description="TTAF", ordering="total_time")
+    def get_current_total_time(self, obj):
+        return obj.total_time + (obj.pending_hours or 0)
+
+    @admin.display(description="TAC", ordering="total_cycles")
+    def get_current_total_cycles(self, obj):
+        return obj.total_cycles + (obj.pending_cycles or 0)
+
     def get_manufacturer_display(self, obj):
         return obj.get_manufacturer_display()
     get_manufacturer_display.short_description = "Manufacturer"
@@ -54,9 +99,12 @@ class FlightAdmin(admin.ModelAdmin):
         "hours_flown",
     )
     list_filter = ("flight_date", "aircraft__manufacturer", "aircraft__aircraft_type")
+    list_select_related = ("aircraft",)
     search_fields = ("aircraft__registration", "aircraft__model", "aircraft__serial")
     date_hierarchy = "flight_date"
-    ordering = ("-flight_date",)
+    ordering = ("-flight_date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(FlightEngineData)
@@ -65,7 +113,7 @@ class FlightEngineDataAdmin(admin.ModelAdmin):
 
     fieldsets = (
         ("Flight Information", {
-            "fields": ("flight", "get_departure_airport", "get_arrival_airport")
+            "fields": ("flight", "engine", "get_departure_airport", "get_arrival_airport")
         }),
         ("Cruise Flight Conditions", {
             "fields": ("press_altitude", "outside_air_temp", "indicated_air_speed", "mach_number")
@@ -77,9 +125,11 @@ class FlightEngineDataAdmin(admin.ModelAdmin):
     )
 
     readonly_fields = ("created_at", "updated_at", "get_departure_airport", "get_arrival_airport")
+    raw_id_fields = ("flight", "engine")
 
     list_display = (
-        "flight",
+        "get_registration",
+        "flight_date",
         "get_departure_airport",
         "get_arrival_airport",
         "press_altitude",
@@ -89,10 +139,16 @@ class FlightEngineDataAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at"
     )
-    list_filter = ("flight__aircraft__registration", "press_altitude", "flight__flight_date")
+    list_filter = ("flight__aircraft", AltitudeBandFilter, "flight_date")
+    list_select_related = ("flight__aircraft",)
     search_fields = ("flight__aircraft__registration", "flight__aircraft__model", "flight__aircraft__serial")
-    date_hierarchy = "flight__flight_date"
-    ordering = ("-flight__flight_date",)
+    ordering = ("-flight_date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description="Aircraft", ordering="flight__aircraft__registration")
+    def get_registration(self, obj):
+        return obj.flight.aircraft.registration
 
     @admin.display(description="Departure Airport")
     def get_departure_airport(self, obj):
@@ -0,0 +1,81 @@
+import uuid
+
+from django.core.files.storage import default_storage
+from rest_framework import generics, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.pagination import KeysetPagination
+from core.views import FlightFilterMixin
+from .ingest import ingest_engine_data
+from .models import Flight, FlightEngineData
+from .parsers import UPLOAD_ROW_ITERATORS, CSVRowParser, NDJSONRowParser
+from .serializers import FlightEngineDataSerializer, FlightSerializer
+from .tasks import import_engine_data
+
+
+class FlightEngineDataImportView(APIView):
+    """
+    Bulk import of cruise engine snapshots.
+
+    Accepts a raw ``application/x-ndjson`` or ``text/csv`` body, or a
+    multipart upload in a ``file`` field. Rows are parsed as a stream and
+    each row must carry a ``flight`` id plus the FlightEngineData columns,
+    and may carry an ``engine`` id.
+
+    With ``?background=1`` a multipart upload is stored and imported by a
+    job worker instead; the response is 202 with the job to poll.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [NDJSONRowParser, CSVRowParser, MultiPartParser]
+
+    def post(self, request):
+        if "file" in request.FILES:
+            upload = request.FILES["file"]
+            extension = "." + upload.name.rsplit(".", 1)[-1].lower() if "." in upload.name else ""
+            iter_rows = UPLOAD_ROW_ITERATORS.get(extension)
+            if iter_rows is None:
+                return Response(
+                    {"detail": "Uploaded file must be .csv, .ndjson or .jsonl."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if request.query_params.get("background"):
+                path = default_storage.save(f"imports/engine-data/{uuid.uuid4().hex}{extension}", upload)
+                job = import_engine_data.enqueue(kwargs={"path": path}, created_by=request.user)
+                return Response(
+                    {"job": job.pk, "status": job.status},
+                    status=status.HTTP_202_ACCEPTED,
+                    headers={"Location": f"/api/jobs/{job.pk}/"},
+                )
+            rows = iter_rows(upload)
+        elif request.content_type.startswith("multipart/"):
+            return Response({"detail": "No file uploaded."}, status=status.HTTP_400_BAD_REQUEST)
+        elif request.query_params.get("background"):
+            return Response(
+                {"detail": "Background imports take a multipart upload in a 'file' field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        else:
+            rows = request.data
+
+        report = ingest_engine_data(rows)
+        return Response(report.as_dict())
+
+
+class FlightListView(FlightFilterMixin, generics.ListAPIView):
+    """ Flights newest first, paged by keyset cursor """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = FlightSerializer
+    queryset = Flight.objects.select_related("aircraft")
+
+
+class FlightEngineDataListView(FlightFilterMixin, generics.ListAPIView):
+    """ Cruise engine snapshots newest first, paged by keyset cursor """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = FlightEngineDataSerializer
+    queryset = FlightEngineData.objects.all()
+    aircraft_lookup = "flight__aircraft_id"
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AircraftConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'aircraft'
+
+    def ready(self):
+        from . import signals  # noqa: F401
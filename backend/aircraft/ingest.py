@@ -0,0 +1,139 @@
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from analytics.anomaly import score_snapshots
+from analytics.trends import flag_trend_stores_behind
+from core.cache import bump_data_version
+from core.tenancy import operator_filter
+from engines.models import Engine
+from .models import Flight, FlightEngineData
+
+
+BATCH_SIZE = 2000
+MAX_REPORTED_REJECTIONS = 1000
+
+# Plain value columns accepted from an upload. Relations and timestamps are
+# handled separately so that a row never triggers a query of its own.
+INGEST_FIELDS = tuple(
+    field for field in FlightEngineData._meta.concrete_fields
+    if field.editable
+    and not field.primary_key
+    and not field.is_relation
+    and not getattr(field, "auto_now", False)
+    and not getattr(field, "auto_now_add", False)
+)
+
+
+class IngestReport:
+    """ Running totals and per-row rejections for one ingestion run """
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.rejections = []
+
+    def reject(self, row_number, errors):
+        self.rejected += 1
+        if len(self.rejections) < MAX_REPORTED_REJECTIONS:
+            self.rejections.append({"row": row_number, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "rejections": self.rejections,
+            "rejections_truncated": self.rejected > len(self.rejections),
+        }
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _clean_row(row):
+    """ Run each field's own to_python/validators on a raw row """
+    values, errors = {}, {}
+    for field in INGEST_FIELDS:
+        try:
+            values[field.attname] = field.clean(row.get(field.name), None)
+        except ValidationError as exc:
+            errors[field.name] = exc.messages
+    try:
+        values["flight_id"] = int(row.get("flight"))
+    except (TypeError, ValueError):
+        errors["flight"] = ["A valid flight id is required."]
+    if row.get("engine") not in (None, ""):
+        try:
+            values["engine_id"] = int(row["engine"])
+        except (TypeError, ValueError):
+            errors["engine"] = ["Engine must be an id."]
+    return values, errors
+
+
+def _validate_batch(batch, report):
+    """ Validate a batch of rows, resolving referenced flights and engines in one query each """
+    cleaned = []
+    for row_number, row in batch:
+        if isinstance(row, Exception):
+            report.reject(row_number, {"row": [str(row)]})
+            continue
+        values, errors = _clean_row(row)
+        if errors:
+            report.reject(row_number, errors)
+            continue
+        cleaned.append((row_number, values))
+
+    flight_ids = {values["flight_id"] for _, values in cleaned}
+    # Flight dates and operators are denormalized onto each row, and
+    # bulk_create bypasses save(). Flights of other operators are not found.
+    flights = {
+        pk: (aircraft_id, flight_date, operator_id)
+        for pk, aircraft_id, flight_date, operator_id in
+        Flight.objects.filter(pk__in=flight_ids).values_list("pk", "aircraft_id", "flight_date", "operator_id")
+    }
+    engine_ids = {values["engine_id"] for _, values in cleaned if "engine_id" in values}
+    known_engines = set(
+        Engine.objects.filter(operator_filter("aircraft__operator_id"), pk__in=engine_ids).values_list("pk", flat=True)
+    ) if engine_ids else set()
+
+    instances = []
+    for row_number, values in cleaned:
+        if values["flight_id"] not in flights:
+            report.reject(row_number, {"flight": [f"Flight {values['flight_id']} does not exist."]})
+            continue
+        if "engine_id" in values and values["engine_id"] not in known_engines:
+            report.reject(row_number, {"engine": [f"Engine {values['engine_id']} does not exist."]})
+            continue
+        _, flight_date, operator_id = flights[values["flight_id"]]
+        instances.append(FlightEngineData(flight_date=flight_date, operator_id=operator_id, **values))
+    aircraft_ids = {flights[instance.flight_id][0] for instance in instances}
+    operator_ids = {instance.operator_id for instance in instances}
+    return instances, aircraft_ids, operator_ids
+
+
+def ingest_engine_data(rows, batch_size=BATCH_SIZE, on_batch=None):
+    """
+    Validate and insert (row_number, row) pairs in batches.
+
+    Each batch is committed in its own transaction, so memory stays bounded
+    by the batch size and a rejected row never rolls back its neighbours.
+    ``on_batch`` is called with the report after every batch.
+    """
+    report = IngestReport()
+    for batch in _batched(rows, batch_size):
+        instances, aircraft_ids, operator_ids = _validate_batch(batch, report)
+        if instances:
+            with transaction.atomic():
+                FlightEngineData.objects.bulk_create(instances, batch_size=batch_size)
+                flag_trend_stores_behind(aircraft_ids, min(instance.pk for instance in instances))
+                # bulk_create sends no signals, so score the new rows here
+                score_snapshots([instance.pk for instance in instances if instance.engine_id is not None])
+                bump_data_version(*aircraft_ids, operator_ids=operator_ids)
+            report.accepted += len(instances)
+        if on_batch is not None:
+            on_batch(report)
+    return report
@@ -0,0 +1,60 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Aircraft, AircraftUtilizationDelta
+
+
+COMPACTION_BATCH_SIZE = 5000
+
+
+def record_flight_delta(aircraft_id, flight_id, hours, cycles):
+    """ Append one delta row; concurrent writers never touch the aircraft row """
+    if not hours and not cycles:
+        return None
+    return AircraftUtilizationDelta.objects.create(
+        aircraft_id=aircraft_id, flight_id=flight_id, hours=hours, cycles=cycles
+    )
+
+
+def record_new_flights(flights):
+    """ Append the deltas of flights created without signals (bulk_create) in one INSERT """
+    return AircraftUtilizationDelta.objects.bulk_create(
+        AircraftUtilizationDelta(aircraft_id=flight.aircraft_id, flight_id=flight.pk, hours=flight.hours_flown, cycles=1)
+        for flight in flights
+    )
+
+
+def compact_ledger(batch_size=COMPACTION_BATCH_SIZE):
+    """
+    Fold ledger deltas into Aircraft.total_time/total_cycles and delete them.
+
+    Deltas are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so exactly the
+    rows that were summed are removed and concurrent compactions never
+    double count. Returns the number of deltas compacted.
+    """
+    compacted = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                AircraftUtilizationDelta.objects
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "aircraft_id", "hours", "cycles")[:batch_size]
+            )
+            if not batch:
+                return compacted
+
+            totals = defaultdict(lambda: [Decimal("0.0"), 0])
+            for _, aircraft_id, hours, cycles in batch:
+                totals[aircraft_id][0] += hours
+                totals[aircraft_id][1] += cycles
+            for aircraft_id, (hours, cycles) in totals.items():
+                Aircraft.objects.filter(pk=aircraft_id).update(
+                    total_time=F("total_time") + hours,
+                    total_cycles=F("total_cycles") + cycles,
+                )
+            AircraftUtilizationDelta.objects.filter(id__in=[row[0] for row in batch]).delete()
+        compacted += len(batch)
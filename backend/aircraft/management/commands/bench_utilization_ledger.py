@@ -0,0 +1,85 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+
+from accounts.models import Operator
+from aircraft.ledger import compact_ledger, record_flight_delta
+from aircraft.models import Aircraft
+
+
+HOURS = Decimal("1.5")
+
+
+def _write_row_lock(aircraft_id):
+    Aircraft.objects.filter(pk=aircraft_id).update(
+        total_time=F("total_time") + HOURS,
+        total_cycles=F("total_cycles") + 1,
+    )
+
+
+def _write_ledger(aircraft_id):
+    record_flight_delta(aircraft_id, None, HOURS, 1)
+
+
+MODES = {
+    "row-lock": _write_row_lock,
+    "ledger": _write_ledger,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure flight-logging throughput with parallel writers on one aircraft, "
+        "updating the aircraft row in place versus appending to the utilization ledger"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 16])
+        parser.add_argument("--operations", type=int, default=200, help="Writes per writer")
+        parser.add_argument(
+            "--hold-ms", type=float, default=5.0,
+            help="Time each write transaction stays open after the accounting write, "
+                 "standing in for the rest of the request",
+        )
+
+    def handle(self, *args, **options):
+        operator = Operator.objects.create(name=f"Benchmark {time.time_ns()}")
+        aircraft = Aircraft.objects.create(
+            operator=operator, model="BENCHMARK", serial=f"BENCH-{time.time_ns()}", registration="NBENCH"
+        )
+        try:
+            self.stdout.write(f"{'mode':<10}{'writers':>9}{'writes/s':>12}")
+            for writers in options["writers"]:
+                for mode, write in MODES.items():
+                    rate = self._run(write, aircraft.pk, writers, options["operations"], options["hold_ms"] / 1000)
+                    self.stdout.write(f"{mode:<10}{writers:>9}{rate:>12.0f}")
+        finally:
+            compact_ledger()
+            aircraft.delete()
+            operator.delete()
+
+    def _run(self, write, aircraft_id, writers, operations, hold):
+        barrier = threading.Barrier(writers + 1)
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(operations):
+                    with transaction.atomic():
+                        write(aircraft_id)
+                        time.sleep(hold)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return writers * operations / (time.perf_counter() - started)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from aircraft.ledger import compact_ledger
+
+
+class Command(BaseCommand):
+    help = "Fold pending utilization deltas into the aircraft total time and cycles"
+
+    def handle(self, *args, **options):
+        compacted = compact_ledger()
+        self.stdout.write(self.style.SUCCESS(f"Compacted {compacted} utilization deltas."))
@@ -0,0 +1,73 @@
+import argparse
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from aircraft.partitions import (
+    MONTHS_AHEAD, detach_partitions, ensure_upcoming_partitions, month_start, partitioning_enabled,
+)
+from analytics.models import EngineAlert, EngineDeviation
+from engines.rollups import fold_flights_into_baselines
+from finance.models import FlightExpense, FuelPaid
+from telemetry.models import TelemetryRecording
+
+
+def _month(value):
+    parsed = parse_date(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError("Give a date as YYYY-MM-DD.")
+    return month_start(parsed)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly flight and engine snapshot partitions ahead of time and, with "
+        "--archive-before, detach the partitions of earlier months"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=MONTHS_AHEAD, help="Months to create after the current one")
+        parser.add_argument(
+            "--archive-before", type=_month,
+            help="Detach the months before the month of this date (YYYY-MM-DD), keeping them as standalone tables",
+        )
+        parser.add_argument("--drop", action="store_true", help="Drop the detached partitions instead")
+
+    def handle(self, *args, **options):
+        if not partitioning_enabled():
+            raise CommandError("The flight tables are not partitioned; partitioning needs PostgreSQL.")
+        started = time.perf_counter()
+        created = ensure_upcoming_partitions(options["ahead"])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        detached = []
+        if options["archive_before"]:
+            detached = self._archive(options["archive_before"], options["drop"])
+            for name in detached:
+                self.stdout.write(f"{'Dropped' if options['drop'] else 'Detached'} {name}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} and {'dropped' if options['drop'] else 'detached'} {len(detached)} "
+            f"partitions in {elapsed:.1f}s."
+        ))
+
+    def _archive(self, cutoff, drop):
+        # Expenses and fuel uplifts are kept for good, so their flights must stay
+        for model in (FlightExpense, FuelPaid):
+            count = model.objects.unscoped().filter(flight_date__lt=cutoff).count()
+            if count:
+                raise CommandError(
+                    f"{count} {model._meta.verbose_name_plural.lower()} belong to flights before {cutoff}; "
+                    f"delete them before archiving those months."
+                )
+        with transaction.atomic():
+            # Engine counters keep the archived hours; alerts and deviations
+            # are derived from the archived snapshots and go with them, as do
+            # the recordings of the archived flights
+            fold_flights_into_baselines(cutoff)
+            EngineAlert.objects.unscoped().filter(flight_date__lt=cutoff).delete()
+            EngineDeviation.objects.filter(engine_data__flight_date__lt=cutoff).delete()
+            TelemetryRecording.objects.unscoped().filter(flight__flight_date__lt=cutoff).delete()
+            return detach_partitions(cutoff, drop)
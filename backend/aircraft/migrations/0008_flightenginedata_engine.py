@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0007_aircraft_fuel_flow_unit_flightenginedata_engineff_and_more'),
+        ('engines', '0002_rename_type_engine_engine_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flightenginedata',
+            name='engine',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='flight_data', to='engines.engine', verbose_name='Engine'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0008_flightenginedata_engine'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AircraftUtilizationDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flight_id', models.BigIntegerField(blank=True, help_text='Flight that produced the delta (kept after the flight is deleted)', null=True)),
+                ('hours', models.DecimalField(decimal_places=1, max_digits=5)),
+                ('cycles', models.SmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization_deltas', to='aircraft.aircraft', verbose_name='Aircraft')),
+            ],
+            options={
+                'verbose_name': 'Utilization Delta',
+                'verbose_name_plural': 'Utilization Deltas',
+                'indexes': [models.Index(fields=['aircraft', 'id'], name='utilization_delta_aircraft_idx')],
+            },
+        ),
+    ]
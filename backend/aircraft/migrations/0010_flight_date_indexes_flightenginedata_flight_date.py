@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_flight_dates(apps, schema_editor):
+    Flight = apps.get_model('aircraft', 'Flight')
+    FlightEngineData = apps.get_model('aircraft', 'FlightEngineData')
+    FlightEngineData.objects.update(
+        flight_date=Subquery(Flight.objects.filter(pk=OuterRef('flight_id')).values('flight_date')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0009_aircraftutilizationdelta'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='flightenginedata',
+            options={'ordering': ['-flight_date', '-id'], 'verbose_name': 'Flight Engine Data', 'verbose_name_plural': 'Flight Engine Data'},
+        ),
+        migrations.AddField(
+            model_name='flightenginedata',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text="Copy of the flight's date, kept for date-ordered scans without a join", null=True),
+        ),
+        migrations.RunPython(copy_flight_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='flightenginedata',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text="Copy of the flight's date, kept for date-ordered scans without a join"),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['flight_date', 'id'], name='flight_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['aircraft', 'flight_date', 'id'], name='flight_aircraft_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightenginedata',
+            index=models.Index(fields=['flight_date', 'id'], name='engine_data_date_id_idx'),
+        ),
+    ]
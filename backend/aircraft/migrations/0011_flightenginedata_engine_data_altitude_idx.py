@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0010_flight_date_indexes_flightenginedata_flight_date'),
+        ('engines', '0003_engine_aircraft_engine_csn_at_install_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flightenginedata',
+            index=models.Index(fields=['press_altitude', 'flight_date'], name='engine_data_altitude_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+DEFAULT_OPERATOR = 'Default operator'
+
+
+def assign_default_operator(apps, schema_editor):
+    # The fleet so far belongs to the operator the existing users were given
+    Aircraft = apps.get_model('aircraft', 'Aircraft')
+    if not Aircraft.objects.exists():
+        return
+    operator, _ = apps.get_model('accounts', 'Operator').objects.get_or_create(name=DEFAULT_OPERATOR)
+    for model_name in ('Aircraft', 'Flight', 'FlightEngineData'):
+        apps.get_model('aircraft', model_name).objects.update(operator=operator)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('aircraft', '0011_flightenginedata_engine_data_altitude_idx'),
+        ('engines', '0003_engine_aircraft_engine_csn_at_install_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='aircraft',
+            name='unique_aircraft',
+        ),
+        migrations.RemoveIndex(
+            model_name='flight',
+            name='flight_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='flightenginedata',
+            name='engine_data_date_id_idx',
+        ),
+        migrations.AddField(
+            model_name='aircraft',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='aircraft', to='accounts.operator'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AddField(
+            model_name='flightenginedata',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.RunPython(assign_default_operator, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0012 so that the rows it filled are committed before the
+    # tables are altered (PostgreSQL refuses while FK checks are pending)
+
+    dependencies = [
+        ('aircraft', '0012_operator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aircraft',
+            name='operator',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='aircraft', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='flightenginedata',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['operator', 'flight_date', 'id'], name='flight_operator_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightenginedata',
+            index=models.Index(fields=['operator', 'flight_date', 'id'], name='engine_data_operator_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='aircraft',
+            constraint=models.UniqueConstraint(fields=('operator', 'manufacturer', 'model', 'serial', 'registration'), name='unique_aircraft'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0013_operator_required'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flightenginedata',
+            name='flight',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='engine_data', to='aircraft.flight', verbose_name='Flight'),
+        ),
+    ]
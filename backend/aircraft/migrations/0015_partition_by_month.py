@@ -0,0 +1,92 @@
+from datetime import date
+
+from django.db import migrations
+
+
+TABLES = ('aircraft_flightenginedata', 'aircraft_flight')
+PARTITION_KEY = 'flight_date'
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    months = month.year * 12 + month.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def rebuild_table(cursor, table, partitioned):
+    """
+    Copy ``table`` into a new table, range partitioned by month on
+    PARTITION_KEY or plain, and swap it in with the same indexes and foreign
+    keys. Partitions cover every month with rows plus the next few; a
+    default partition takes the rest.
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s AND indexname <> %s",
+        [table, f'{table}_pkey'],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f'SELECT coalesce(max("id"), 0) FROM "{table}"')
+    last_id = cursor.fetchone()[0]
+
+    new = f'{table}_rebuilt'
+    if partitioned:
+        cursor.execute(f'CREATE TABLE "{new}" (LIKE "{table}" INCLUDING CONSTRAINTS) PARTITION BY RANGE ("{PARTITION_KEY}")')
+        cursor.execute(f'SELECT DISTINCT date_trunc(\'month\', "{PARTITION_KEY}")::date FROM "{table}"')
+        this_month = date.today().replace(day=1)
+        months = {row[0] for row in cursor.fetchall()} | {add_months(this_month, n) for n in range(MONTHS_AHEAD + 1)}
+        for month in sorted(months):
+            cursor.execute(
+                f'CREATE TABLE "{table}_p{month:%Y_%m}" PARTITION OF "{new}" FOR VALUES FROM (%s) TO (%s)',
+                [month.isoformat(), add_months(month, 1).isoformat()],
+            )
+        cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{new}" DEFAULT')
+        primary_key = f'"id", "{PARTITION_KEY}"'
+    else:
+        cursor.execute(f'CREATE TABLE "{new}" (LIKE "{table}" INCLUDING CONSTRAINTS)')
+        primary_key = '"id"'
+
+    cursor.execute(f'INSERT INTO "{new}" SELECT * FROM "{table}"')
+    cursor.execute(f'DROP TABLE "{table}"')
+    cursor.execute(f'ALTER TABLE "{new}" RENAME TO "{table}"')
+    cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ({primary_key})')
+    # Identity columns cannot be partitioned before PostgreSQL 17; a sequence owned by the column serves the same
+    cursor.execute(f'CREATE SEQUENCE "{table}_id_seq" OWNED BY "{table}"."id" START WITH {last_id + 1}')
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN "id" SET DEFAULT nextval(\'"{table}_id_seq"\')')
+    for definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def partition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            rebuild_table(cursor, table, partitioned=True)
+
+
+def unpartition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            rebuild_table(cursor, table, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0014_flight_fk_without_constraint'),
+        ('analytics', '0004_engine_data_fk_without_constraint'),
+        ('finance', '0010_flight_fk_without_constraint'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
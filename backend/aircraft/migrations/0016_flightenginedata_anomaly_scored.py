@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0015_partition_by_month'),
+    ]
+
+    operations = [
+        # Existing snapshots were scored on insert or by the last rescore
+        migrations.AddField(
+            model_name='flightenginedata',
+            name='anomaly_scored',
+            field=models.BooleanField(default=True, editable=False, help_text="Set once the snapshot is folded into its engine's anomaly state"),
+        ),
+        migrations.AlterField(
+            model_name='flightenginedata',
+            name='anomaly_scored',
+            field=models.BooleanField(default=False, editable=False, help_text="Set once the snapshot is folded into its engine's anomaly state"),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator
+from core.models import TrackedFieldsMixin
+from core.tenancy import NO_OPERATOR, OperatorManager, current_operator_id
 
 
 # ============================
@@ -33,9 +35,11 @@ class AircraftType(models.TextChoices):
 # AIRCRAFT MODEL
 # ============================
 
-class Aircraft(models.Model):
+class Aircraft(TrackedFieldsMixin, models.Model):
     """ A model to represent an aircraft """
 
+    TRACKED_FIELDS = ("operator_id",)
+
     TEMPERATURE_UNIT_CHOICES = [
         ("C", "°C"),
         ("F", "°F"),
@@ -45,6 +49,13 @@ class Aircraft(models.Model):
         ("LPH", "lb/h"),
     ]
 
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="aircraft",
+        # The unique constraint below leads with the operator
+        db_index=False,
+    )
     manufacturer = models.CharField(
         max_length=2,
         choices=AircraftManufacturer.choices,
@@ -92,16 +103,21 @@ class Aircraft(models.Model):
         verbose_name="Fuel Flow Unit",
     )
 
+    objects = OperatorManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=["manufacturer", "model", "serial", "registration"],
+                fields=["operator", "manufacturer", "model", "serial", "registration"],
                 name="unique_aircraft"
             )
         ]
 
     def save(self, *args, **kwargs):
 
+        if self.operator_id is None and current_operator_id() not in (None, NO_OPERATOR):
+            self.operator_id = current_operator_id()
+
         if self.aircraft_type:
             self.aircraft_type = self.aircraft_type.upper()
 
@@ -116,6 +132,22 @@ class Aircraft(models.Model):
 
         super().save(*args, **kwargs)
     
+    def current_totals(self):
+        """
+        Compacted totals plus any ledger deltas not yet folded in, read in one
+        query so that deltas compacted meanwhile are counted exactly once
+        """
+        total_time, total_cycles, pending_hours, pending_cycles = (
+            type(self)._base_manager.filter(pk=self.pk)
+            .annotate(
+                pending_hours=models.Sum("utilization_deltas__hours"),
+                pending_cycles=models.Sum("utilization_deltas__cycles"),
+            )
+            .values_list("total_time", "total_cycles", "pending_hours", "pending_cycles")
+            .get()
+        )
+        return total_time + (pending_hours or 0), total_cycles + (pending_cycles or 0)
+
     def __str__(self):
         return f"{self.registration}"
 
@@ -124,9 +156,19 @@ class Aircraft(models.Model):
 # FLIGHT MODEL
 # ============================
 
-class Flight(models.Model):
+class Flight(TrackedFieldsMixin, models.Model):
     """" A simple model to record a flight """
-    
+
+    TRACKED_FIELDS = ("aircraft_id", "operator_id", "flight_date", "hours_flown")
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the aircraft's operator",
+    )
     aircraft = models.ForeignKey(
         Aircraft,
         on_delete=models.CASCADE,
@@ -152,12 +194,19 @@ class Flight(models.Model):
         help_text="Example: 2.5",
     )
 
+    objects = OperatorManager()
+
     class Meta:
         ordering = ["-flight_date"]
+        indexes = [
+            models.Index(fields=["operator", "flight_date", "id"], name="flight_operator_date_id_idx"),
+            models.Index(fields=["aircraft", "flight_date", "id"], name="flight_aircraft_date_id_idx"),
+        ]
         verbose_name = "Flight"
         verbose_name_plural = "Flights"
 
     def save(self, *args, **kwargs):
+        self.operator_id = self.aircraft.operator_id
 
         if self.departure_airport:
             self.departure_airport = self.departure_airport.upper()
@@ -170,6 +219,45 @@ class Flight(models.Model):
     def __str__(self):
         return f"{self.departure_airport}-{self.arrival_airport} | {self.aircraft.registration} | {self.flight_date}"
 
+# ============================
+# UTILIZATION LEDGER MODEL
+# ============================
+
+class AircraftUtilizationDelta(models.Model):
+    """ An append-only hours/cycles delta, compacted periodically into the aircraft totals """
+
+    aircraft = models.ForeignKey(
+        Aircraft,
+        on_delete=models.CASCADE,
+        related_name="utilization_deltas",
+        verbose_name="Aircraft",
+    )
+    flight_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Flight that produced the delta (kept after the flight is deleted)",
+    )
+    hours = models.DecimalField(
+        max_digits=5,
+        decimal_places=1,
+    )
+    cycles = models.SmallIntegerField()
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["aircraft", "id"], name="utilization_delta_aircraft_idx"),
+        ]
+        verbose_name = "Utilization Delta"
+        verbose_name_plural = "Utilization Deltas"
+
+    def __str__(self):
+        return f"{self.aircraft_id} {self.hours:+} h {self.cycles:+} cyc"
+
+
 # ============================
 # FLIGHT ENGINE DATA MODEL
 # ============================
@@ -177,12 +265,35 @@ class Flight(models.Model):
 class FlightEngineData(models.Model):
     """" A model to record engine data for a flight """
     
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the flight's operator",
+    )
     flight = models.ForeignKey(
         Flight,
         on_delete=models.CASCADE,
+        # Flights are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
         related_name="engine_data",
         verbose_name="Flight",
     )
+    flight_date = models.DateField(
+        editable=False,
+        help_text="Copy of the flight's date, kept for date-ordered scans without a join",
+    )
+    engine = models.ForeignKey(
+        "engines.Engine",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="flight_data",
+        verbose_name="Engine",
+    )
     press_altitude = models.IntegerField(
         validators=[MinValueValidator(0), MaxValueValidator(70000)],
         verbose_name="Cruise Pressure Altitude (feet)",
@@ -277,6 +388,11 @@ class FlightEngineData(models.Model):
         verbose_name="Engine Vibration",
         help_text="Example: 0.56",
     )
+    anomaly_scored = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Set once the snapshot is folded into its engine's anomaly state",
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Created At"
@@ -286,10 +402,21 @@ class FlightEngineData(models.Model):
         verbose_name="Updated At"
     )
 
+    objects = OperatorManager()
+
     class Meta:
-        ordering = ["-flight__flight_date"]
+        ordering = ["-flight_date", "-id"]
+        indexes = [
+            models.Index(fields=["operator", "flight_date", "id"], name="engine_data_operator_date_idx"),
+            models.Index(fields=["press_altitude", "flight_date"], name="engine_data_altitude_idx"),
+        ]
         verbose_name = "Flight Engine Data"
         verbose_name_plural = "Flight Engine Data"
 
+    def save(self, *args, **kwargs):
+        self.flight_date = self.flight.flight_date
+        self.operator_id = self.flight.operator_id
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return f"{self.flight.aircraft.registration} {self.flight.flight_date} {self.flight.flight_hours}"
\ No newline at end of file
+        return f"{self.flight.aircraft.registration} {self.flight_date} {self.flight.hours_flown}"
\ No newline at end of file
@@ -0,0 +1,81 @@
+import csv
+import json
+
+from rest_framework.parsers import BaseParser
+
+
+# ============================
+# ROW ITERATORS
+# ============================
+
+def _decoded_lines(stream):
+    """ Yield text lines from a binary stream without reading it all into memory """
+    if stream is None:
+        return
+    first = True
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+        yield line
+
+
+def iter_ndjson_rows(stream):
+    """ Yield (row_number, row) pairs from a newline-delimited JSON stream """
+    row_number = 0
+    for line in _decoded_lines(stream):
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield row_number, ValueError(f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield row_number, ValueError("Each line must be a JSON object.")
+            continue
+        yield row_number, row
+
+
+def iter_csv_rows(stream):
+    """ Yield (row_number, row) pairs from a CSV stream with a header line """
+    reader = csv.DictReader(_decoded_lines(stream))
+    for row_number, row in enumerate(reader, start=1):
+        if None in row:
+            yield row_number, ValueError("Row has more columns than the header.")
+            continue
+        yield row_number, {key: (value if value != "" else None) for key, value in row.items()}
+
+
+# Row iterator for each accepted upload file extension
+UPLOAD_ROW_ITERATORS = {
+    ".csv": iter_csv_rows,
+    ".ndjson": iter_ndjson_rows,
+    ".jsonl": iter_ndjson_rows,
+}
+
+
+# ============================
+# DRF PARSERS
+# ============================
+
+class NDJSONRowParser(BaseParser):
+    """ Parses an NDJSON request body lazily into (row_number, row) pairs """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return iter_ndjson_rows(stream)
+
+
+class CSVRowParser(BaseParser):
+    """ Parses a CSV request body lazily into (row_number, row) pairs """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return iter_csv_rows(stream)
@@ -0,0 +1,178 @@
+"""
+Monthly partitions of the flight and engine snapshot tables.
+
+On PostgreSQL, Flight and FlightEngineData are range partitioned by
+flight_date, one partition per calendar month (aircraft_flight_p2025_03 and
+so on), plus a default partition for dates no month partition covers yet.
+Queries bounded by flight date only scan the months they touch, and old
+months are archived by detaching their partitions instead of deleting rows.
+
+PostgreSQL requires the partition key in the primary key, which becomes
+(id, flight_date), and no table can hold a foreign key to a partitioned one
+without it. The foreign keys to flights and snapshots are therefore declared
+with db_constraint=False and kept consistent by Django's on_delete handling;
+new ones must be declared the same way.
+
+On other databases the tables stay plain and these functions do nothing.
+"""
+import re
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Flight, FlightEngineData
+
+
+PARTITIONED_MODELS = (Flight, FlightEngineData)
+PARTITION_FIELD = "flight_date"
+
+# Month partitions are created this many months ahead of the current one
+MONTHS_AHEAD = 3
+
+_LOWER_BOUND = re.compile(r"FROM \('(\d{4})-(\d{2})-01'\)")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    months = month.year * 12 + month.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partitioning_enabled():
+    """ Whether the tables are partitioned: on PostgreSQL, once migrated """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [Flight._meta.db_table])
+        return cursor.fetchone() is not None
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def month_partitions(table):
+    """ Map the first day of each month partition of ``table`` to its name """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+    partitions = {}
+    for name, bound in rows:
+        match = _LOWER_BOUND.search(bound)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def _default_months(table):
+    """ Months of the rows that landed in the default partition """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {_quote(PARTITION_FIELD)})::date "
+            f"FROM {_quote(default_partition_name(table))}"
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _create_partition(table, month):
+    """
+    Attach a partition for ``month``, moving in any rows of that month that
+    went to the default partition meanwhile (attaching would fail otherwise).
+    """
+    name = partition_name(table, month)
+    bounds = [month.isoformat(), add_months(month, 1).isoformat()]
+    key = _quote(PARTITION_FIELD)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {_quote(name)} (LIKE {_quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {_quote(default_partition_name(table))} "
+            f"WHERE {key} >= %s AND {key} < %s RETURNING *) "
+            f"INSERT INTO {_quote(name)} SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(f"ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(name)} FOR VALUES FROM (%s) TO (%s)", bounds)
+    return name
+
+
+def ensure_partitions(first, last):
+    """
+    Create the month partitions from ``first`` through ``last`` that do not
+    exist yet, plus those for months found in the default partitions.
+    Returns the names of the partitions created.
+    """
+    if not partitioning_enabled():
+        return []
+    wanted = set()
+    month = month_start(first)
+    while month <= last:
+        wanted.add(month)
+        month = add_months(month, 1)
+    created = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        existing = month_partitions(table)
+        for month in sorted((wanted | _default_months(table)) - existing.keys()):
+            created.append(_create_partition(table, month))
+    return created
+
+
+def ensure_upcoming_partitions(months_ahead=MONTHS_AHEAD, today=None):
+    """ Create the partitions of the current month and the next ``months_ahead`` """
+    this_month = month_start(today or timezone.localdate())
+    return ensure_partitions(this_month, add_months(this_month, months_ahead))
+
+
+def _make_standalone(cursor, name):
+    """
+    Cut a detached partition loose from the live tables: its foreign keys
+    would stop operators, aircraft and engines from being deleted, and its id
+    default would keep the parent's sequence from being dropped.
+    """
+    cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [name])
+    for (constraint,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {_quote(name)} DROP CONSTRAINT {_quote(constraint)}")
+    cursor.execute(f"ALTER TABLE {_quote(name)} ALTER COLUMN {_quote('id')} DROP DEFAULT")
+
+
+def detach_partitions(before, drop=False):
+    """
+    Detach the month partitions that end on or before ``before`` (dropping
+    them when ``drop`` is set), leaving detached ones as standalone tables
+    that can be dumped and dropped at leisure. Returns their names.
+    """
+    if not partitioning_enabled():
+        return []
+    detached = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            for month, name in sorted(month_partitions(table).items()):
+                if add_months(month, 1) > before:
+                    continue
+                cursor.execute(f"ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(name)}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {_quote(name)}")
+                else:
+                    _make_standalone(cursor, name)
+                detached.append(name)
+    return detached
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from .models import Flight, FlightEngineData
+
+
+class FlightSerializer(serializers.ModelSerializer):
+    registration = serializers.CharField(source="aircraft.registration", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "aircraft",
+            "registration",
+            "flight_date",
+            "departure_airport",
+            "arrival_airport",
+            "hours_flown",
+        ]
+
+
+class FlightEngineDataSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FlightEngineData
+        fields = "__all__"
@@ -0,0 +1,114 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_data_version
+from core.events import publish
+from .ledger import record_flight_delta
+from .models import Aircraft, Flight, FlightEngineData
+
+
+@receiver(post_save, sender=Flight)
+def record_flight_utilization(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    current = instance.tracked_values()
+    if not created and previous is not None:
+        if previous["aircraft_id"] == current["aircraft_id"] and previous["hours_flown"] == current["hours_flown"]:
+            return
+        record_flight_delta(previous["aircraft_id"], instance.pk, -previous["hours_flown"], -1)
+    record_flight_delta(current["aircraft_id"], instance.pk, current["hours_flown"], 1)
+
+
+@receiver(post_delete, sender=Flight)
+def reverse_flight_utilization(sender, instance, origin=None, **kwargs):
+    # The ledger goes away with the aircraft itself
+    if deleted_with(origin, Aircraft):
+        return
+    current = instance.tracked_values()
+    record_flight_delta(current["aircraft_id"], instance.pk, -current["hours_flown"], -1)
+
+
+@receiver(post_save, sender=Flight)
+def propagate_flight_date(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None:
+        return
+    current = instance.tracked_values()
+    changes = {
+        name: current[name] for name in ("flight_date", "operator_id") if previous[name] != current[name]
+    }
+    if changes:
+        FlightEngineData.objects.unscoped().filter(flight_id=instance.pk).update(**changes)
+
+
+@receiver(post_save, sender=Aircraft)
+def propagate_aircraft_operator(sender, instance, created, **kwargs):
+    """ Move an aircraft's whole history along when it changes operator """
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None or previous["operator_id"] == instance.operator_id:
+        return
+    FlightEngineData.objects.unscoped().filter(flight__aircraft_id=instance.pk).update(operator_id=instance.operator_id)
+    Flight.objects.unscoped().filter(aircraft_id=instance.pk).update(operator_id=instance.operator_id)
+
+
+def flight_aircraft_id(instance):
+    """ Aircraft of a row's flight, without a query when the flight is already loaded """
+    if type(instance).flight.is_cached(instance):
+        return instance.flight.aircraft_id
+    return Flight.objects.unscoped().filter(pk=instance.flight_id).values_list("aircraft_id", flat=True).first()
+
+
+def deleted_with(origin, *models):
+    """ Whether a post_delete was cascaded from an instance or queryset of one of models """
+    return isinstance(origin, models) or getattr(origin, "model", None) in models
+
+
+@receiver(post_save, sender=Aircraft)
+@receiver(post_delete, sender=Aircraft)
+def bump_aircraft_data_version(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_values", None) or {}
+    bump_data_version(instance.pk, operator_ids=[instance.operator_id, previous.get("operator_id")])
+
+
+@receiver(post_save, sender=Flight)
+def bump_flight_data_version(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_values", None) or {}
+    bump_data_version(
+        instance.aircraft_id, previous.get("aircraft_id"),
+        operator_ids=[instance.operator_id, previous.get("operator_id")],
+    )
+
+
+def flight_event(flight):
+    """ The live feed's data for a new flight (see core.events) """
+    return {
+        "id": flight.pk,
+        "aircraft": flight.aircraft_id,
+        "registration": flight.aircraft.registration,
+        "flight_date": flight.flight_date,
+        "departure_airport": flight.departure_airport,
+        "arrival_airport": flight.arrival_airport,
+        "hours_flown": flight.hours_flown,
+    }
+
+
+@receiver(post_save, sender=Flight)
+def publish_new_flight(sender, instance, created, **kwargs):
+    if created:
+        publish("flight", instance.operator_id, flight_event(instance))
+
+
+@receiver(post_delete, sender=Flight)
+def bump_deleted_flight_data_version(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Aircraft):
+        bump_data_version(instance.aircraft_id, operator_ids=[instance.operator_id])
+
+
+@receiver(post_save, sender=FlightEngineData)
+def bump_engine_data_version(sender, instance, **kwargs):
+    bump_data_version(flight_aircraft_id(instance), operator_ids=[instance.operator_id])
+
+
+@receiver(post_delete, sender=FlightEngineData)
+def bump_deleted_engine_data_version(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Aircraft, Flight):
+        bump_data_version(flight_aircraft_id(instance), operator_ids=[instance.operator_id])
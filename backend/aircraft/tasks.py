@@ -0,0 +1,36 @@
+import os
+
+from django.core.files.storage import default_storage
+
+from jobs.registry import report_progress, task
+from .ingest import ingest_engine_data
+from .ledger import compact_ledger
+from .partitions import ensure_upcoming_partitions
+from .parsers import UPLOAD_ROW_ITERATORS
+
+
+@task(priority=10)
+def compact_utilization_ledger():
+    return {"compacted": compact_ledger()}
+
+
+@task()
+def create_partitions():
+    return {"created": ensure_upcoming_partitions()}
+
+
+# Never retried: a second attempt would insert the rows that did commit again
+@task(max_attempts=1)
+def import_engine_data(path):
+    """ Ingest an uploaded engine data file from storage, then delete it """
+    iter_rows = UPLOAD_ROW_ITERATORS[os.path.splitext(path)[1].lower()]
+    size = default_storage.size(path) or 1
+    try:
+        with default_storage.open(path, "rb") as upload:
+            def progress(report):
+                report_progress(upload.tell() * 100 / size, f"{report.accepted} rows imported")
+
+            report = ingest_engine_data(iter_rows(upload), on_batch=progress)
+    finally:
+        default_storage.delete(path)
+    return report.as_dict()
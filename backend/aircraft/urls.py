@@ -0,0 +1,8 @@
+from django.urls import path
+from .api_views import FlightEngineDataImportView, FlightEngineDataListView, FlightListView
+
+urlpatterns = [
+    path("flights/", FlightListView.as_view(), name="flight_list"),
+    path("engine-data/", FlightEngineDataListView.as_view(), name="engine_data_list"),
+    path("engine-data/import/", FlightEngineDataImportView.as_view(), name="engine_data_import"),
+]
@@ -1,3 +1,39 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import OperatorScopedAdmin
+from .models import EngineAlert, EngineBaseline, EngineTrendStore
+
+
+@admin.register(EngineTrendStore)
+class EngineTrendStoreAdmin(OperatorScopedAdmin):
+    model = EngineTrendStore
+    operator_lookup = "aircraft__operator_id"
+
+    list_display = ("aircraft", "row_count", "last_engine_data_id", "is_stale", "updated_at")
+    list_filter = ("is_stale",)
+    search_fields = ("aircraft__registration",)
+    readonly_fields = ("aircraft", "row_count", "last_engine_data_id", "is_stale", "updated_at")
+    list_select_related = ("aircraft",)
+
+
+@admin.register(EngineBaseline)
+class EngineBaselineAdmin(admin.ModelAdmin):
+    model = EngineBaseline
+
+    list_display = ("engine_model", "parameter", "sample_count", "residual_std", "fitted_at")
+    list_filter = ("parameter",)
+    search_fields = ("engine_model",)
+    readonly_fields = ("engine_model", "parameter", "coefficients", "residual_std", "sample_count", "fitted_at")
+
+
+@admin.register(EngineAlert)
+class EngineAlertAdmin(admin.ModelAdmin):
+    model = EngineAlert
+
+    list_display = ("flight_date", "engine", "parameter", "kind", "value", "expected", "score")
+    list_filter = ("kind", "parameter")
+    search_fields = ("engine__serial",)
+    readonly_fields = (
+        "engine", "engine_data", "flight_date", "parameter", "kind", "value", "expected", "score", "created_at",
+    )
+    list_select_related = ("engine",)
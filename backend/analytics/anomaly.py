@@ -0,0 +1,299 @@
+"""
+Streaming anomaly detection on engine snapshots.
+
+Every engine keeps, for each monitored parameter, an exponentially weighted
+mean and variance and a two-sided CUSUM, packed into Engine.anomaly_state.
+A new snapshot is scored against that state and folded into it in constant
+time, without reading the engine's history:
+
+- a reading more than Z_LIMIT standard deviations from the running mean is
+  an exceedance, and is kept out of the mean;
+- a sustained drift that pushes either CUSUM past CUSUM_LIMIT is a shift,
+  reported in place of an exceedance of the same reading.
+
+A shift, or RUN_LIMIT exceedances in a row, means the parameter has moved
+to a new level. Its mean and variance then start again from the reading
+that confirmed it and are relearned over a fresh warm-up, so the new level
+is not reported as exceedances indefinitely.
+
+ITT, N2 and fuel flow are corrected to ISA conditions first (see ectm), so
+that a change of altitude or temperature is not taken for a change of the
+engine. Each snapshot is scored once, under a lock on its engine, by the
+transaction that inserts it, and flagged as scored; snapshots of one
+engine inserted together are scored in id order. rescore_engines replays
+the whole history in id order, which gives the same state and alerts
+except where concurrent inserts committed out of id order. Edits and
+deletions of snapshots do not rewind the state; rescore the engine
+afterwards.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from aircraft.models import FlightEngineData
+from core.events import publish
+from engines.models import Engine
+from .ectm import correct_snapshots
+from .models import AlertKind, AlertParameter, EngineAlert
+
+
+PARAMETERS = tuple(AlertParameter.values)
+
+# Smallest standard deviation a parameter is scored against, so that a
+# very steady engine does not alert on measurement noise
+MIN_STD = np.array([
+    {"InterstageTT": 2.0, "SpeedN2": 0.2, "EngineFF": 5.0, "EngineVib": 0.05, "OilPress": 1.0, "OilTemp": 1.0}[name]
+    for name in PARAMETERS
+])
+
+ALPHA = 0.05
+WARMUP = 20
+Z_LIMIT = 4.0
+CUSUM_SLACK = 0.5
+CUSUM_LIMIT = 8.0
+RUN_LIMIT = 5
+
+# Per parameter: mean, variance, upper CUSUM, lower CUSUM, readings seen
+# since the level was last set, exceedances in a row
+MEAN, VARIANCE, HIGH, LOW, COUNT, RUN = range(6)
+STATE_SHAPE = (len(PARAMETERS), 6)
+
+RAW_COLUMNS = (
+    "press_altitude", "outside_air_temp", "mach_number", "SpeedN1", "SpeedN2",
+    "InterstageTT", "EngineFF", "EngineVib", "OilPress", "OilTemp",
+)
+CHUNK_SIZE = 200000
+ENGINE_BATCH = 200
+
+
+# ============================
+# STATE
+# ============================
+
+def load_state(payload):
+    if not payload:
+        return np.zeros(STATE_SHAPE)
+    values = np.frombuffer(bytes(payload), dtype="<f8")
+    state = np.zeros(STATE_SHAPE)
+    # States saved before RUN was added have no run count yet
+    columns = len(values) // len(PARAMETERS)
+    state[:, :columns] = values.reshape(len(PARAMETERS), columns)
+    return state
+
+
+def dump_state(state):
+    return state.astype("<f8").tobytes()
+
+
+def step(state, values):
+    """
+    Score one reading per engine and fold it into the state, in place.
+
+    ``state`` has a STATE_SHAPE block per engine and ``values`` a row of
+    readings per engine, NaN where missing. Returns the alert kind (or None),
+    score and expected value of every reading.
+    """
+    mean, variance, high, low, count, run = (state[..., index] for index in (MEAN, VARIANCE, HIGH, LOW, COUNT, RUN))
+    present = np.isfinite(values)
+    warm = present & (count >= WARMUP)
+    deviation = np.where(present, values - mean, 0.0)
+    z = np.where(warm, deviation / np.maximum(np.sqrt(variance), MIN_STD), 0.0)
+
+    exceedance = warm & (np.abs(z) > Z_LIMIT)
+    # Outliers count towards a shift only as far as the exceedance limit
+    drift = np.clip(z, -Z_LIMIT, Z_LIMIT)
+    new_high = np.where(warm, np.maximum(high + drift - CUSUM_SLACK, 0.0), high)
+    new_low = np.where(warm, np.maximum(low - drift - CUSUM_SLACK, 0.0), low)
+    shift_up = new_high > CUSUM_LIMIT
+    shift_down = new_low > CUSUM_LIMIT
+    new_run = np.where(exceedance, run + 1, np.where(present, 0, run))
+    rebase = shift_up | shift_down | (new_run >= RUN_LIMIT)
+
+    kinds = np.full(values.shape, None, dtype=object)
+    kinds[exceedance] = AlertKind.EXCEEDANCE
+    kinds[shift_down] = AlertKind.SHIFT_DOWN
+    kinds[shift_up] = AlertKind.SHIFT_UP
+    scores = np.where(shift_up, new_high, np.where(shift_down, -new_low, z))
+    expected = mean.copy()
+
+    # An equal-weight running mean until warmed up, exponential after
+    learn = present & ~exceedance
+    alpha = np.where(learn, np.maximum(ALPHA, 1.0 / (count + 1)), 0.0)
+    mean += alpha * deviation
+    variance[:] = np.where(learn, (1 - alpha) * (variance + alpha * deviation ** 2), variance)
+    high[:] = np.where(rebase, 0.0, new_high)
+    low[:] = np.where(rebase, 0.0, new_low)
+    count += present
+    run[:] = np.where(rebase, 0, new_run)
+
+    # A new level: start again from this reading, as if it were the first
+    mean[:] = np.where(rebase, values, mean)
+    variance[:] = np.where(rebase, 0.0, variance)
+    count[:] = np.where(rebase, 1, count)
+    return kinds, scores, expected
+
+
+# ============================
+# SCORING
+# ============================
+
+def _load_snapshots(queryset, limit=None):
+    """ Monitored readings of the queryset's first ``limit`` snapshots by id, as arrays """
+    rows = list(
+        queryset.filter(engine__isnull=False).order_by("id").values_list(
+            "id", "engine_id", "operator_id", "flight_date", "flight__aircraft__fuel_flow_unit",
+            *(Cast(name, FloatField()) for name in RAW_COLUMNS),
+        )[:limit]
+    )
+    if not rows:
+        return None
+    ids, engine_ids, operator_ids, dates, ff_units, *values = zip(*rows)
+    chunk = {name: np.array(column, dtype=np.float64) for name, column in zip(RAW_COLUMNS, values)}
+    chunk["ff_unit"] = np.array(ff_units, dtype=object)
+    corrected = correct_snapshots(chunk)
+    readings = np.column_stack([
+        corrected[name] if name in corrected else chunk[name] for name in PARAMETERS
+    ])
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "engine_id": np.array(engine_ids, dtype=np.int64),
+        "operator_id": np.array(operator_ids, dtype=object),
+        "flight_date": np.array(dates, dtype=object),
+        "readings": readings,
+    }
+
+
+def _replay(states, positions, snapshots):
+    """
+    Fold snapshots into the states of their engines in id order, returning
+    the alerts raised.
+
+    Each round takes the next snapshot of every engine at once, so the work
+    is vectorized across engines and parameters.
+    """
+    # Rank of each snapshot among its engine's; a stable sort keeps id order
+    by_engine = np.argsort(positions, kind="stable")
+    sorted_positions = positions[by_engine]
+    starts = np.flatnonzero(np.r_[True, sorted_positions[1:] != sorted_positions[:-1]])
+    rank = np.empty(len(positions), dtype=np.int64)
+    rank[by_engine] = np.arange(len(positions)) - np.repeat(starts, np.diff(np.r_[starts, len(positions)]))
+
+    alerts = []
+    order = np.argsort(rank, kind="stable")
+    bounds = np.searchsorted(rank[order], np.arange(rank.max() + 2))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        rows = order[start:end]
+        block = states[positions[rows]]
+        kinds, scores, expected = step(block, snapshots["readings"][rows])
+        states[positions[rows]] = block
+        for row, column in zip(*np.nonzero(kinds != None)):  # noqa: E711
+            snapshot = rows[row]
+            alerts.append(EngineAlert(
+                operator_id=snapshots["operator_id"][snapshot],
+                engine_id=int(snapshots["engine_id"][snapshot]),
+                engine_data_id=int(snapshots["id"][snapshot]),
+                flight_date=snapshots["flight_date"][snapshot],
+                parameter=PARAMETERS[column],
+                kind=kinds[row, column],
+                value=float(snapshots["readings"][snapshot, column]),
+                expected=float(expected[row, column]),
+                score=float(scores[row, column]),
+            ))
+    return alerts
+
+
+def score_snapshots(engine_data_ids):
+    """
+    Score newly inserted snapshots against their engines' running state.
+
+    Takes a lock on the engines involved before reading the snapshots, so
+    concurrent inserts for one engine are folded in one after the other
+    whatever order their ids were handed out in. Snapshots already flagged
+    as scored (e.g. by a rescore) are skipped. Returns the alerts raised.
+    """
+    with transaction.atomic():
+        rows = FlightEngineData.objects.unscoped().filter(pk__in=engine_data_ids)
+        engines = list(
+            Engine.objects.select_for_update()
+            .filter(pk__in=rows.values("engine_id"))
+            .order_by("pk")
+            .values_list("pk", "anomaly_state")
+        )
+        snapshots = _load_snapshots(rows.filter(anomaly_scored=False))
+        if snapshots is None:
+            return []
+        index = {pk: position for position, (pk, _) in enumerate(engines)}
+        positions = np.array([index[pk] for pk in snapshots["engine_id"].tolist()], dtype=np.int64)
+
+        states = np.stack([load_state(payload) for _, payload in engines])
+        alerts = _replay(states, positions, snapshots)
+        Engine.objects.bulk_update(
+            [
+                Engine(pk=engines[position][0], anomaly_state=dump_state(states[position]))
+                for position in set(positions.tolist())
+            ],
+            ["anomaly_state"],
+        )
+        FlightEngineData.objects.unscoped().filter(pk__in=snapshots["id"].tolist()).update(anomaly_scored=True)
+        EngineAlert.objects.bulk_create(alerts, batch_size=5000)
+        _publish_exceedances(alerts)
+    return alerts
+
+
+def _publish_exceedances(alerts):
+    """ Push the exceedances among new alerts to live dashboards (see core.events) """
+    exceedances = [alert for alert in alerts if alert.kind == AlertKind.EXCEEDANCE]
+    if not exceedances:
+        return
+    serials = dict(Engine.objects.filter(pk__in={alert.engine_id for alert in exceedances}).values_list("pk", "serial"))
+    for alert in exceedances:
+        publish("alert", alert.operator_id, {
+            "id": alert.pk,
+            "engine": alert.engine_id,
+            "serial": serials.get(alert.engine_id),
+            "engine_data": alert.engine_data_id,
+            "flight_date": alert.flight_date,
+            "parameter": alert.parameter,
+            "value": alert.value,
+            "expected": alert.expected,
+            "score": alert.score,
+        })
+
+
+def rescore_engines(engine_ids=None, log=None):
+    """
+    Rebuild the anomaly state and alerts of the given engines (all engines
+    when None) from their whole history, ENGINE_BATCH engines at a time.
+    Returns the number of snapshots replayed.
+    """
+    log = log or (lambda message: None)
+    engine_ids = sorted(engine_ids if engine_ids is not None else Engine.objects.values_list("pk", flat=True))
+    total = 0
+    for offset in range(0, len(engine_ids), ENGINE_BATCH):
+        batch = engine_ids[offset:offset + ENGINE_BATCH]
+        with transaction.atomic():
+            locked = list(Engine.objects.select_for_update().filter(pk__in=batch).order_by("pk").values_list("pk", flat=True))
+            index = {pk: position for position, pk in enumerate(locked)}
+            states = np.zeros((len(locked), *STATE_SHAPE))
+            EngineAlert.objects.unscoped().filter(engine_id__in=locked).delete()
+
+            queryset = FlightEngineData.objects.unscoped().filter(engine_id__in=locked)
+            last_id = 0
+            while True:
+                snapshots = _load_snapshots(queryset.filter(id__gt=last_id), CHUNK_SIZE)
+                if snapshots is None:
+                    break
+                positions = np.array([index[pk] for pk in snapshots["engine_id"].tolist()], dtype=np.int64)
+                EngineAlert.objects.bulk_create(_replay(states, positions, snapshots), batch_size=5000)
+                last_id = int(snapshots["id"][-1])
+                total += len(positions)
+
+            Engine.objects.bulk_update(
+                [Engine(pk=pk, anomaly_state=dump_state(states[index[pk]])) for pk in locked],
+                ["anomaly_state"],
+                batch_size=1000,
+            )
+            queryset.filter(anomaly_scored=False).update(anomaly_scored=True)
+        log(f"Engines {offset + 1}-{offset + len(batch)} of {len(engine_ids)}: {total} snapshots")
+    return total
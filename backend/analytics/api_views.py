@@ -0,0 +1,180 @@
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from aircraft.models import Aircraft
+from core.async_api import AsyncAPIView, gather_queries, issue_stream_ticket
+from core.cache import versioned_response
+from core.events import event_stream
+from core.pagination import KeysetPagination
+from core.routers import replica_reads
+from core.tenancy import current_operator_id
+from core.views import FlightFilterMixin
+from .dashboard import dashboard_queries
+from .ectm import DEVIATION_FIELDS
+from .models import AlertKind, AlertParameter, EngineAlert, EngineDeviation
+from .serializers import EngineAlertSerializer
+from .trends import TREND_PARAMETERS, get_trend_columns, series_to_json
+
+
+def _parse_date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"'{name}' must be a date in YYYY-MM-DD format.")
+    return parsed
+
+
+class EngineTrendView(APIView):
+    """ Engine trend series for one aircraft, sliced from its columnar store """
+    permission_classes = [IsAuthenticated]
+
+    @versioned_response()
+    def get(self, request, aircraft_id):
+        aircraft = get_object_or_404(Aircraft, pk=aircraft_id)
+
+        requested = request.query_params.get("parameters")
+        parameters = requested.split(",") if requested else list(TREND_PARAMETERS)
+        unknown = [name for name in parameters if name not in TREND_PARAMETERS]
+        if unknown:
+            return Response(
+                {"detail": f"Unknown parameters: {', '.join(unknown)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            start = _parse_date_param(request, "start")
+            end = _parse_date_param(request, "end")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = get_trend_columns(aircraft.pk).between(start, end)
+        return Response({
+            "aircraft": aircraft.pk,
+            "dates": columns.dates.astype(str).tolist(),
+            "series": {name: series_to_json(columns.columns[name]) for name in parameters},
+        })
+
+
+class EngineDeviationView(APIView):
+    """ ECTM deviation-from-baseline series for one aircraft """
+    permission_classes = [IsAuthenticated]
+
+    @versioned_response()
+    def get(self, request, aircraft_id):
+        aircraft = get_object_or_404(Aircraft, pk=aircraft_id)
+        try:
+            start = _parse_date_param(request, "start")
+            end = _parse_date_param(request, "end")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        deviations = EngineDeviation.objects.filter(engine_data__flight__aircraft=aircraft)
+        if start:
+            deviations = deviations.filter(engine_data__flight_date__gte=start)
+        if end:
+            deviations = deviations.filter(engine_data__flight_date__lte=end)
+        fields = list(DEVIATION_FIELDS.values())
+        rows = list(
+            deviations
+            .order_by("engine_data__flight_date", "engine_data_id")
+            .values_list("engine_data__flight_date", *fields)
+        )
+        dates, *series = zip(*rows) if rows else ((),) * (len(fields) + 1)
+        return Response({
+            "aircraft": aircraft.pk,
+            "dates": [date.isoformat() for date in dates],
+            "series": {field: list(values) for field, values in zip(fields, series)},
+        })
+
+
+class EngineAlertListView(FlightFilterMixin, generics.ListAPIView):
+    """
+    Engine anomaly alerts newest first, paged by keyset cursor. Filters by
+    ``aircraft``, ``start`` and ``end`` like the other lists, and by
+    ``engine``, ``parameter`` and ``kind``.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = EngineAlertSerializer
+    queryset = EngineAlert.objects.all()
+    aircraft_lookup = "engine_data__flight__aircraft_id"
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        engine = self.request.query_params.get("engine")
+        if engine:
+            if not engine.isdecimal():
+                raise ValidationError({"engine": "Must be an engine id."})
+            queryset = queryset.filter(engine_id=int(engine))
+        for name, choices in (("parameter", AlertParameter), ("kind", AlertKind)):
+            value = self.request.query_params.get(name)
+            if value:
+                if value not in choices.values:
+                    raise ValidationError({name: f"Must be one of: {', '.join(choices.values)}."})
+                queryset = queryset.filter(**{name: value})
+        return queryset
+
+
+class FleetDashboardView(AsyncAPIView):
+    """
+    Utilization, route, expense, fuel and engine aggregates for the dashboard.
+
+    Served asynchronously: the aggregates are independent, so they run
+    concurrently on separate connections and the worker is free to serve
+    other requests while they do.
+    """
+
+    async def get(self, request):
+        aircraft = request.GET.get("aircraft", "")
+        if aircraft and not aircraft.isdecimal():
+            return JsonResponse({"detail": "'aircraft' must be an aircraft id."}, status=400)
+        dates = {}
+        for name in ("start", "end"):
+            value = request.GET.get(name)
+            try:
+                dates[name] = parse_date(value) if value else None
+            except ValueError:
+                dates[name] = None
+            if value and dates[name] is None:
+                return JsonResponse({"detail": f"'{name}' must be a date in YYYY-MM-DD format."}, status=400)
+
+        aircraft_id = int(aircraft) if aircraft else None
+        with replica_reads():
+            results = await gather_queries(**dashboard_queries(aircraft_id, dates["start"], dates["end"]))
+        return JsonResponse({"aircraft": aircraft_id, **results})
+
+
+class FleetEventTicketView(APIView):
+    """ A single-use ticket that opens one event stream as the caller (see core.async_api) """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({"ticket": issue_stream_ticket(request.auth)}, status=status.HTTP_201_CREATED)
+
+
+class FleetEventStreamView(AsyncAPIView):
+    """
+    Live ``flight``, ``alert`` and ``expense`` events of the user's operator
+    as Server-Sent Events (see core.events). EventSource cannot send an
+    Authorization header, so a ticket from FleetEventTicketView may be
+    passed as ``ticket``. The stream ends when the ticket's access token
+    expires; reconnect with a new ticket.
+    """
+    ticket_query_param = "ticket"
+
+    async def get(self, request):
+        response = StreamingHttpResponse(
+            event_stream(current_operator_id(), request.auth["exp"]),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
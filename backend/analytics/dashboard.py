@@ -0,0 +1,79 @@
+"""
+Independent aggregates behind the fleet dashboard.
+
+Each entry of dashboard_queries() is a callable running one query, so the
+async dashboard view can run them all at once.
+"""
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from aircraft.models import Flight
+from core.tenancy import operator_filter
+from engines.models import Engine
+from finance.models import FlightExpense, FuelPaid
+
+
+TOP_ROUTES = 5
+
+
+def _flight_filters(aircraft_id, start, end, aircraft_lookup):
+    filters = Q()
+    if aircraft_id is not None:
+        filters &= Q(**{aircraft_lookup: aircraft_id})
+    if start:
+        filters &= Q(flight_date__gte=start)
+    if end:
+        filters &= Q(flight_date__lte=end)
+    return filters
+
+
+def dashboard_queries(aircraft_id=None, start=None, end=None):
+    """ Callables for each dashboard aggregate, filtered by aircraft and flight date """
+    flights = Flight.objects.filter(_flight_filters(aircraft_id, start, end, "aircraft_id")).order_by()
+    finance_filters = _flight_filters(aircraft_id, start, end, "flight__aircraft_id")
+    # Engines carry no operator of their own; they belong to their aircraft's
+    engines = Engine.objects.filter(operator_filter("aircraft__operator_id"), aircraft__isnull=False)
+    if aircraft_id is not None:
+        engines = engines.filter(aircraft_id=aircraft_id)
+
+    return {
+        "utilization": lambda: flights.aggregate(
+            flights=Count("id"),
+            hours=Sum("hours_flown"),
+            first_flight=Min("flight_date"),
+            last_flight=Max("flight_date"),
+        ),
+        "monthly": lambda: list(
+            flights
+            .annotate(month=TruncMonth("flight_date"))
+            .values("month")
+            .annotate(flights=Count("id"), hours=Sum("hours_flown"))
+            .order_by("month")
+        ),
+        "routes": lambda: list(
+            flights
+            .values("departure_airport", "arrival_airport")
+            .annotate(flights=Count("id"))
+            .order_by("-flights", "departure_airport", "arrival_airport")[:TOP_ROUTES]
+        ),
+        "expenses": lambda: list(
+            FlightExpense.objects.filter(finance_filters).order_by()
+            .values("expense_type")
+            .annotate(total=Sum("expense_amount"), entries=Count("id"))
+            .order_by("-total")
+        ),
+        "fuel": lambda: FuelPaid.objects.filter(finance_filters).aggregate(
+            uplifts=Count("id"),
+            total_kg=Sum("fuel_quantity_kg"),
+            total_paid=Sum("amount_paid"),
+        ),
+        "engines": lambda: list(
+            engines
+            .values(
+                "id", "serial", "model", "aircraft_id", "position",
+                "time_since_new", "cycles_since_new", "time_since_overhaul", "time_between_overhauls",
+            )
+            .annotate(hours_remaining=F("time_between_overhauls") - F("time_since_overhaul"))
+            .order_by("aircraft_id", "position")
+        ),
+    }
@@ -0,0 +1,239 @@
+"""
+Engine condition trend monitoring (ECTM).
+
+Cruise snapshots are corrected to ISA sea-level conditions, a
+baseline is fitted per engine model by least squares, and every snapshot's
+deviation from that baseline is computed in one vectorized pass.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from aircraft.models import FlightEngineData
+from core.cache import bump_all_data_versions
+from .models import EngineBaseline, EngineDeviation
+
+
+CHUNK_SIZE = 200000
+MIN_BASELINE_SAMPLES = 20
+
+TROPOPAUSE_FT = 36089.0
+KELVIN = 273.15
+ISA_SEA_LEVEL_K = 288.15
+POUNDS_TO_KG = 0.45359237
+
+# Corrected parameter -> regressors of its baseline (an intercept is implied)
+BASELINE_FEATURES = {
+    "SpeedN1": ("mach", "delta"),
+    "SpeedN2": ("mach", "delta", "SpeedN1"),
+    "InterstageTT": ("mach", "delta", "SpeedN1"),
+    "EngineFF": ("mach", "delta", "SpeedN1"),
+}
+
+DEVIATION_FIELDS = {
+    "SpeedN1": "n1_deviation",
+    "SpeedN2": "n2_deviation",
+    "InterstageTT": "itt_deviation",
+    "EngineFF": "ff_deviation",
+}
+
+SNAPSHOT_COLUMNS = (
+    "press_altitude",
+    "outside_air_temp",
+    "mach_number",
+    "SpeedN1",
+    "SpeedN2",
+    "InterstageTT",
+    "EngineFF",
+)
+
+
+# ============================
+# LOADING
+# ============================
+
+def _engine_model_lookup():
+    # Snapshots without a linked engine fall back to the airframe model
+    return Coalesce(NullIf("engine__model", Value("")), "flight__aircraft__model")
+
+
+def iter_snapshot_chunks(queryset=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield snapshot columns as float64 arrays, chunk_size rows at a time, by id.
+
+    Without a queryset every operator's snapshots are read: baselines are
+    per engine model, and a fleet-wide sample makes them better for everyone.
+    """
+    queryset = (queryset if queryset is not None else FlightEngineData.objects.unscoped()).order_by("id")
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).values_list(
+                "id",
+                _engine_model_lookup(),
+                "flight__aircraft__fuel_flow_unit",
+                *(Cast(name, FloatField()) for name in SNAPSHOT_COLUMNS),
+            )[:chunk_size]
+        )
+        if not rows:
+            return
+        ids, models, ff_units, *values = zip(*rows)
+        chunk = {name: np.array(column, dtype=np.float64) for name, column in zip(SNAPSHOT_COLUMNS, values)}
+        chunk["id"] = np.array(ids, dtype=np.int64)
+        chunk["engine_model"] = np.array(models, dtype=object)
+        chunk["ff_unit"] = np.array(ff_units, dtype=object)
+        yield chunk
+        last_id = ids[-1]
+
+
+# ============================
+# CORRECTIONS
+# ============================
+
+def isa_ratios(press_altitude, outside_air_temp, mach_number):
+    """ Total-pressure (delta) and total-temperature (theta) ratios to ISA sea level """
+    altitude = press_altitude
+    delta_static = np.where(
+        altitude <= TROPOPAUSE_FT,
+        (1 - 6.8755856e-6 * np.minimum(altitude, TROPOPAUSE_FT)) ** 5.2558797,
+        0.2233609 * np.exp(-4.806346e-5 * (altitude - TROPOPAUSE_FT)),
+    )
+    theta_static = (outside_air_temp + KELVIN) / ISA_SEA_LEVEL_K
+    ram = 1 + 0.2 * np.nan_to_num(mach_number) ** 2
+    return delta_static * ram ** 3.5, theta_static * ram
+
+
+def correct_snapshots(chunk):
+    """ Return corrected N1, N2, ITT and fuel flow plus the baseline regressors """
+    delta, theta = isa_ratios(chunk["press_altitude"], chunk["outside_air_temp"], chunk["mach_number"])
+    sqrt_theta = np.sqrt(theta)
+    fuel_flow = np.where(chunk["ff_unit"] == "LPH", chunk["EngineFF"] * POUNDS_TO_KG, chunk["EngineFF"])
+    return {
+        "mach": np.nan_to_num(chunk["mach_number"]),
+        "delta": delta,
+        "SpeedN1": chunk["SpeedN1"] / sqrt_theta,
+        "SpeedN2": chunk["SpeedN2"] / sqrt_theta,
+        "InterstageTT": (chunk["InterstageTT"] + KELVIN) / theta - KELVIN,
+        "EngineFF": fuel_flow / (delta * sqrt_theta),
+    }
+
+
+def _design_matrix(corrected, parameter):
+    features = [corrected[name] for name in BASELINE_FEATURES[parameter]]
+    return np.column_stack([np.ones_like(features[0])] + features)
+
+
+# ============================
+# BASELINES
+# ============================
+
+def fit_baselines(queryset=None):
+    """
+    Fit one least-squares baseline per (engine model, parameter).
+
+    Normal equations are accumulated chunk by chunk, so memory stays bounded
+    by CHUNK_SIZE regardless of fleet history length.
+    """
+    sums = {}
+    for chunk in iter_snapshot_chunks(queryset):
+        corrected = correct_snapshots(chunk)
+        models, inverse = np.unique(chunk["engine_model"], return_inverse=True)
+        for parameter in BASELINE_FEATURES:
+            X = _design_matrix(corrected, parameter)
+            y = corrected[parameter]
+            valid = np.isfinite(y) & np.isfinite(X).all(axis=1)
+            for index, engine_model in enumerate(models):
+                rows = valid & (inverse == index)
+                if not rows.any():
+                    continue
+                Xm, ym = X[rows], y[rows]
+                xtx, xty, yty, count = sums.get((engine_model, parameter), (0, 0, 0.0, 0))
+                sums[(engine_model, parameter)] = (
+                    xtx + Xm.T @ Xm, xty + Xm.T @ ym, yty + ym @ ym, count + len(ym)
+                )
+
+    baselines = []
+    for (engine_model, parameter), (xtx, xty, yty, count) in sums.items():
+        if count < MIN_BASELINE_SAMPLES:
+            continue
+        coefficients = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+        sse = max(yty - 2 * coefficients @ xty + coefficients @ xtx @ coefficients, 0.0)
+        baselines.append(EngineBaseline(
+            engine_model=engine_model,
+            parameter=parameter,
+            coefficients=coefficients.tolist(),
+            residual_std=float(np.sqrt(sse / max(count - len(coefficients), 1))),
+            sample_count=count,
+            fitted_at=timezone.now(),
+        ))
+
+    with transaction.atomic():
+        EngineBaseline.objects.all().delete()
+        EngineBaseline.objects.bulk_create(baselines)
+    return baselines
+
+
+def _baseline_table():
+    table = {}
+    for baseline in EngineBaseline.objects.all():
+        table[(baseline.engine_model, baseline.parameter)] = np.array(baseline.coefficients)
+    return table
+
+
+# ============================
+# DEVIATIONS
+# ============================
+
+def compute_deviations(chunk, baselines):
+    """ Deviation of each corrected parameter from its model baseline (NaN without one) """
+    corrected = correct_snapshots(chunk)
+    models, inverse = np.unique(chunk["engine_model"], return_inverse=True)
+    deviations = {}
+    for parameter in BASELINE_FEATURES:
+        # Coefficient matrix with one row per snapshot, NaN where no baseline exists
+        width = len(BASELINE_FEATURES[parameter]) + 1
+        per_model = np.full((len(models), width), np.nan)
+        for index, engine_model in enumerate(models):
+            coefficients = baselines.get((engine_model, parameter))
+            if coefficients is not None:
+                per_model[index] = coefficients
+        expected = np.einsum("ij,ij->i", _design_matrix(corrected, parameter), per_model[inverse])
+        deviations[parameter] = corrected[parameter] - expected
+    return deviations
+
+
+def recompute_deviations(queryset=None, refit=False):
+    """ Recompute and upsert EngineDeviation rows for every snapshot in the queryset """
+    if refit or not EngineBaseline.objects.exists():
+        fit_baselines()
+    baselines = _baseline_table()
+
+    total = 0
+    computed_at = timezone.now()
+    for chunk in iter_snapshot_chunks(queryset):
+        deviations = compute_deviations(chunk, baselines)
+        columns = {
+            field: [None if np.isnan(value) else value for value in deviations[parameter].tolist()]
+            for parameter, field in DEVIATION_FIELDS.items()
+        }
+        rows = [
+            EngineDeviation(
+                engine_data_id=engine_data_id,
+                computed_at=computed_at,
+                **{field: values[index] for field, values in columns.items()},
+            )
+            for index, engine_data_id in enumerate(chunk["id"].tolist())
+        ]
+        with transaction.atomic():
+            EngineDeviation.objects.bulk_create(
+                rows,
+                batch_size=5000,
+                update_conflicts=True,
+                unique_fields=["engine_data"],
+                update_fields=[*DEVIATION_FIELDS.values(), "computed_at"],
+            )
+        total += len(rows)
+    bump_all_data_versions()
+    return total
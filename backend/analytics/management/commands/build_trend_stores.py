@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from aircraft.models import Aircraft
+from analytics.trends import refresh_trend_store
+
+
+class Command(BaseCommand):
+    help = "Build or refresh the columnar engine trend store of every aircraft"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--aircraft", type=int, action="append", help="Aircraft id (repeatable)")
+        parser.add_argument("--rebuild", action="store_true", help="Rebuild from scratch instead of appending")
+
+    def handle(self, *args, **options):
+        aircraft_ids = options["aircraft"] or Aircraft.objects.values_list("pk", flat=True)
+        for aircraft_id in aircraft_ids:
+            columns = refresh_trend_store(aircraft_id, rebuild=options["rebuild"])
+            self.stdout.write(f"Aircraft {aircraft_id}: {len(columns)} snapshots")
+        self.stdout.write(self.style.SUCCESS("Trend stores up to date."))
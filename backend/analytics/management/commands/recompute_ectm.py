@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.ectm import recompute_deviations
+
+
+class Command(BaseCommand):
+    help = "Recompute ECTM deviation-from-baseline values for every engine snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--refit", action="store_true", help="Refit the per-model baselines first")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = recompute_deviations(refit=options["refit"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {total} snapshots in {elapsed:.1f}s."))
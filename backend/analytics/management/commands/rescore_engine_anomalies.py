@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.anomaly import rescore_engines
+
+
+class Command(BaseCommand):
+    help = "Rebuild engine anomaly state and alerts by replaying every engine snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--engine", type=int, nargs="+", help="Engine ids (default: every engine)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rescore_engines(
+            options["engine"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Replayed {total} snapshots in {elapsed:.1f}s."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('aircraft', '0007_aircraft_fuel_flow_unit_flightenginedata_engineff_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngineTrendStore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_engine_data_id', models.BigIntegerField(default=0, help_text='Highest FlightEngineData id folded into the payload')),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=False, help_text='Set when existing rows change and the payload must be rebuilt')),
+                ('payload', models.BinaryField(default=b'')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('aircraft', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trend_store', to='aircraft.aircraft', verbose_name='Aircraft')),
+            ],
+            options={
+                'verbose_name': 'Engine Trend Store',
+                'verbose_name_plural': 'Engine Trend Stores',
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0007_aircraft_fuel_flow_unit_flightenginedata_engineff_and_more'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngineDeviation',
+            fields=[
+                ('engine_data', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='deviation', serialize=False, to='aircraft.flightenginedata', verbose_name='Flight Engine Data')),
+                ('n1_deviation', models.FloatField(blank=True, null=True, verbose_name='N1 Deviation (%)')),
+                ('n2_deviation', models.FloatField(blank=True, null=True, verbose_name='N2 Deviation (%)')),
+                ('itt_deviation', models.FloatField(blank=True, null=True, verbose_name='ITT Deviation (°C)')),
+                ('ff_deviation', models.FloatField(blank=True, null=True, verbose_name='Fuel Flow Deviation (kg/h)')),
+                ('computed_at', models.DateTimeField(verbose_name='Computed At')),
+            ],
+            options={
+                'verbose_name': 'Engine Deviation',
+                'verbose_name_plural': 'Engine Deviations',
+            },
+        ),
+        migrations.CreateModel(
+            name='EngineBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('engine_model', models.CharField(max_length=255)),
+                ('parameter', models.CharField(choices=[('SpeedN1', 'N1'), ('SpeedN2', 'N2'), ('InterstageTT', 'ITT'), ('EngineFF', 'Fuel Flow')], max_length=20)),
+                ('coefficients', models.JSONField(help_text='Least-squares coefficients, intercept first')),
+                ('residual_std', models.FloatField(verbose_name='Residual Std. Dev.')),
+                ('sample_count', models.PositiveIntegerField()),
+                ('fitted_at', models.DateTimeField(verbose_name='Fitted At')),
+            ],
+            options={
+                'verbose_name': 'Engine Baseline',
+                'verbose_name_plural': 'Engine Baselines',
+                'constraints': [models.UniqueConstraint(fields=('engine_model', 'parameter'), name='unique_engine_baseline')],
+            },
+        ),
+    ]
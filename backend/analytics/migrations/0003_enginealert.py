@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('aircraft', '0013_operator_required'),
+        ('analytics', '0002_enginedeviation_enginebaseline'),
+        ('engines', '0004_anomaly_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngineAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flight_date', models.DateField(verbose_name='Flight Date')),
+                ('parameter', models.CharField(choices=[('InterstageTT', 'ITT (corrected)'), ('SpeedN2', 'N2 (corrected)'), ('EngineFF', 'Fuel Flow (corrected)'), ('EngineVib', 'Vibration'), ('OilPress', 'Oil Pressure'), ('OilTemp', 'Oil Temperature')], max_length=20)),
+                ('kind', models.CharField(choices=[('exceedance', 'Exceedance'), ('shift_up', 'Upward Shift'), ('shift_down', 'Downward Shift')], max_length=20)),
+                ('value', models.FloatField(help_text='The reading, corrected where the parameter is')),
+                ('expected', models.FloatField(help_text="The engine's running mean before the reading")),
+                ('score', models.FloatField(help_text='Standard deviations from the mean for exceedances, the CUSUM for shifts')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('engine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='engines.engine', verbose_name='Engine')),
+                ('engine_data', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='aircraft.flightenginedata', verbose_name='Flight Engine Data')),
+                ('operator', models.ForeignKey(db_index=False, editable=False, help_text="Copy of the snapshot's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator')),
+            ],
+            options={
+                'verbose_name': 'Engine Alert',
+                'verbose_name_plural': 'Engine Alerts',
+                'ordering': ['-flight_date', '-id'],
+                'indexes': [models.Index(fields=['operator', 'flight_date', 'id'], name='engine_alert_operator_date_idx'), models.Index(fields=['engine', 'flight_date', 'id'], name='engine_alert_engine_date_idx')],
+            },
+        ),
+    ]
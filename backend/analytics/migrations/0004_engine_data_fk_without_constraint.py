@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0014_flight_fk_without_constraint'),
+        ('analytics', '0003_enginealert'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enginealert',
+            name='engine_data',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='aircraft.flightenginedata', verbose_name='Flight Engine Data'),
+        ),
+        migrations.AlterField(
+            model_name='enginedeviation',
+            name='engine_data',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='deviation', serialize=False, to='aircraft.flightenginedata', verbose_name='Flight Engine Data'),
+        ),
+    ]
@@ -1,3 +1,219 @@
 from django.db import models
+from aircraft.models import Aircraft, FlightEngineData
+from core.tenancy import OperatorManager
 
-# Create your models here.
+
+# ============================
+# ENGINE TREND STORE MODEL
+# ============================
+
+class EngineTrendStore(models.Model):
+    """ A compact, column-oriented copy of an aircraft's engine trend data """
+
+    aircraft = models.OneToOneField(
+        Aircraft,
+        on_delete=models.CASCADE,
+        related_name="trend_store",
+        verbose_name="Aircraft",
+    )
+    last_engine_data_id = models.BigIntegerField(
+        default=0,
+        help_text="Highest FlightEngineData id folded into the payload",
+    )
+    row_count = models.PositiveIntegerField(
+        default=0,
+    )
+    is_stale = models.BooleanField(
+        default=False,
+        help_text="Set when existing rows change and the payload must be rebuilt",
+    )
+    payload = models.BinaryField(
+        default=b"",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At"
+    )
+
+    class Meta:
+        verbose_name = "Engine Trend Store"
+        verbose_name_plural = "Engine Trend Stores"
+
+    def __str__(self):
+        return f"{self.aircraft.registration} ({self.row_count} snapshots)"
+
+
+# ============================
+# ECTM MODELS
+# ============================
+
+class EngineBaseline(models.Model):
+    """ A fitted baseline for one corrected engine parameter of one engine model """
+
+    PARAMETER_CHOICES = [
+        ("SpeedN1", "N1"),
+        ("SpeedN2", "N2"),
+        ("InterstageTT", "ITT"),
+        ("EngineFF", "Fuel Flow"),
+    ]
+
+    engine_model = models.CharField(
+        max_length=255,
+    )
+    parameter = models.CharField(
+        max_length=20,
+        choices=PARAMETER_CHOICES,
+    )
+    coefficients = models.JSONField(
+        help_text="Least-squares coefficients, intercept first",
+    )
+    residual_std = models.FloatField(
+        verbose_name="Residual Std. Dev.",
+    )
+    sample_count = models.PositiveIntegerField()
+    fitted_at = models.DateTimeField(
+        verbose_name="Fitted At",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["engine_model", "parameter"],
+                name="unique_engine_baseline"
+            )
+        ]
+        verbose_name = "Engine Baseline"
+        verbose_name_plural = "Engine Baselines"
+
+    def __str__(self):
+        return f"{self.engine_model} {self.get_parameter_display()}"
+
+
+class EngineDeviation(models.Model):
+    """ Deviation of a cruise snapshot's corrected parameters from its baseline """
+
+    engine_data = models.OneToOneField(
+        FlightEngineData,
+        on_delete=models.CASCADE,
+        # Snapshots are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
+        primary_key=True,
+        related_name="deviation",
+        verbose_name="Flight Engine Data",
+    )
+    n1_deviation = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="N1 Deviation (%)",
+    )
+    n2_deviation = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="N2 Deviation (%)",
+    )
+    itt_deviation = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="ITT Deviation (°C)",
+    )
+    ff_deviation = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Fuel Flow Deviation (kg/h)",
+    )
+    computed_at = models.DateTimeField(
+        verbose_name="Computed At",
+    )
+
+    class Meta:
+        verbose_name = "Engine Deviation"
+        verbose_name_plural = "Engine Deviations"
+
+    def __str__(self):
+        return f"Deviation for snapshot {self.engine_data_id}"
+
+
+# ============================
+# ANOMALY ALERT MODEL
+# ============================
+
+class AlertParameter(models.TextChoices):
+    ITT = "InterstageTT", "ITT (corrected)"
+    N2 = "SpeedN2", "N2 (corrected)"
+    FUEL_FLOW = "EngineFF", "Fuel Flow (corrected)"
+    VIBRATION = "EngineVib", "Vibration"
+    OIL_PRESSURE = "OilPress", "Oil Pressure"
+    OIL_TEMPERATURE = "OilTemp", "Oil Temperature"
+
+
+class AlertKind(models.TextChoices):
+    EXCEEDANCE = "exceedance", "Exceedance"
+    SHIFT_UP = "shift_up", "Upward Shift"
+    SHIFT_DOWN = "shift_down", "Downward Shift"
+
+
+class EngineAlert(models.Model):
+    """ A snapshot parameter that broke from its engine's running trend """
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the snapshot's operator",
+    )
+    engine = models.ForeignKey(
+        "engines.Engine",
+        on_delete=models.CASCADE,
+        related_name="alerts",
+        verbose_name="Engine",
+    )
+    engine_data = models.ForeignKey(
+        FlightEngineData,
+        on_delete=models.CASCADE,
+        # Snapshots are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
+        related_name="alerts",
+        verbose_name="Flight Engine Data",
+    )
+    flight_date = models.DateField(
+        verbose_name="Flight Date",
+    )
+    parameter = models.CharField(
+        max_length=20,
+        choices=AlertParameter.choices,
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=AlertKind.choices,
+    )
+    value = models.FloatField(
+        help_text="The reading, corrected where the parameter is",
+    )
+    expected = models.FloatField(
+        help_text="The engine's running mean before the reading",
+    )
+    score = models.FloatField(
+        help_text="Standard deviations from the mean for exceedances, the CUSUM for shifts",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+
+    objects = OperatorManager()
+
+    class Meta:
+        ordering = ["-flight_date", "-id"]
+        indexes = [
+            models.Index(fields=["operator", "flight_date", "id"], name="engine_alert_operator_date_idx"),
+            models.Index(fields=["engine", "flight_date", "id"], name="engine_alert_engine_date_idx"),
+        ]
+        verbose_name = "Engine Alert"
+        verbose_name_plural = "Engine Alerts"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} of {self.get_parameter_display()} on {self.flight_date}"
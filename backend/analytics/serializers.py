@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+from .models import EngineAlert
+
+
+class EngineAlertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EngineAlert
+        exclude = ["operator"]
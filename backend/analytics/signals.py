@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from aircraft.models import Flight, FlightEngineData
+from .anomaly import score_snapshots
+from .trends import flag_trend_stores_behind, mark_trend_stores_stale
+
+
+@receiver(post_save, sender=FlightEngineData)
+def flag_trend_store_on_engine_data_change(sender, instance, created, **kwargs):
+    # New rows are folded in incrementally on the next read
+    if created:
+        flag_trend_stores_behind(Flight.objects.filter(pk=instance.flight_id).values("aircraft_id"), instance.pk)
+    else:
+        mark_trend_stores_stale(Flight.objects.filter(pk=instance.flight_id).values("aircraft_id"))
+
+
+@receiver(post_save, sender=FlightEngineData)
+def score_new_engine_data(sender, instance, created, **kwargs):
+    if created and instance.engine_id is not None:
+        score_snapshots([instance.pk])
+
+
+@receiver(post_delete, sender=FlightEngineData)
+def flag_trend_store_on_engine_data_delete(sender, instance, **kwargs):
+    mark_trend_stores_stale(Flight.objects.filter(pk=instance.flight_id).values("aircraft_id"))
+
+
+@receiver(post_save, sender=Flight)
+def flag_trend_store_on_flight_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None:
+        return
+    if previous["aircraft_id"] != instance.aircraft_id or previous["flight_date"] != instance.flight_date:
+        mark_trend_stores_stale([previous["aircraft_id"], instance.aircraft_id])
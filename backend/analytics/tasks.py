@@ -0,0 +1,25 @@
+from aircraft.models import Aircraft
+from jobs.registry import report_progress, task
+from .anomaly import rescore_engines
+from .ectm import recompute_deviations
+from .trends import refresh_trend_store
+
+
+@task()
+def recompute_ectm(refit=False):
+    return {"snapshots": recompute_deviations(refit=refit)}
+
+
+@task()
+def rescore_engine_anomalies(engine_ids=None):
+    return {"snapshots": rescore_engines(engine_ids)}
+
+
+@task()
+def build_trend_stores(aircraft_ids=None, rebuild=False):
+    aircraft_ids = aircraft_ids or list(Aircraft.objects.values_list("pk", flat=True))
+    snapshots = {}
+    for done, aircraft_id in enumerate(aircraft_ids, start=1):
+        snapshots[aircraft_id] = len(refresh_trend_store(aircraft_id, rebuild=rebuild))
+        report_progress(done * 100 / len(aircraft_ids), f"Aircraft {aircraft_id}")
+    return {"snapshots": snapshots}
@@ -1,3 +1,60 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .anomaly import MEAN, PARAMETERS, STATE_SHAPE, WARMUP, dump_state, load_state, step
+from .models import AlertKind
+
+
+ITT = PARAMETERS.index("InterstageTT")
+
+
+def score_itt(readings, state=None):
+    """ Kinds raised for a sequence of ITT readings of one engine, and the final state """
+    state = np.zeros((1, *STATE_SHAPE)) if state is None else state
+    kinds = []
+    for reading in readings:
+        values = np.full((1, len(PARAMETERS)), np.nan)
+        values[0, ITT] = reading
+        kinds.append(step(state, values)[0][0, ITT])
+    return kinds, state
+
+
+class StepChangeTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.baseline = 750 + rng.normal(0, 3, 100)
+        self.stepped = 790 + rng.normal(0, 3, 200)
+
+    def test_step_change_is_reported_as_one_shift(self):
+        kinds, state = score_itt(np.r_[self.baseline, self.stepped])
+        after = kinds[len(self.baseline):]
+        self.assertNotIn(AlertKind.SHIFT_UP, kinds[:len(self.baseline)])
+        self.assertEqual(after.count(AlertKind.SHIFT_UP), 1)
+        self.assertLess(after.index(AlertKind.SHIFT_UP), 5)
+        # The new level is learned rather than reported on every snapshot
+        self.assertLessEqual(after.count(AlertKind.EXCEEDANCE), 4)
+        self.assertEqual([kind for kind in after[10:] if kind is not None], [])
+        self.assertAlmostEqual(state[0, ITT, MEAN], 790, delta=2)
+
+    def test_shift_is_not_hidden_under_an_exceedance(self):
+        kinds, _ = score_itt(np.r_[self.baseline, self.stepped[:10]])
+        first_shift = kinds.index(AlertKind.SHIFT_UP)
+        # Readings that confirm the shift are also far out, but report the shift
+        self.assertGreater(abs(self.stepped[first_shift - len(self.baseline)] - 750), 12)
+
+    def test_erratic_readings_rebase_after_a_run_of_exceedances(self):
+        erratic = np.r_[self.baseline, [800, 700] * 50]
+        kinds, _ = score_itt(erratic)
+        self.assertLess(kinds[len(self.baseline):].count(AlertKind.EXCEEDANCE), 20)
+
+    def test_single_outlier_does_not_move_the_mean(self):
+        kinds, state = score_itt(np.r_[self.baseline, [900], self.baseline[:WARMUP]])
+        self.assertEqual(kinds[len(self.baseline)], AlertKind.EXCEEDANCE)
+        self.assertAlmostEqual(state[0, ITT, MEAN], 750, delta=2)
+
+    def test_states_saved_without_run_count_load(self):
+        _, state = score_itt(self.baseline)
+        legacy = state[0, :, :5].astype("<f8").tobytes()
+        loaded = load_state(legacy)
+        np.testing.assert_array_equal(loaded[:, :5], state[0, :, :5])
+        self.assertEqual(load_state(dump_state(state[0])).tolist(), state[0].tolist())
@@ -0,0 +1,231 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from aircraft.models import FlightEngineData
+from .models import EngineTrendStore
+
+
+TREND_PARAMETERS = (
+    "SpeedN1",
+    "SpeedN2",
+    "EnginePR",
+    "InterstageTT",
+    "EngineFF",
+    "OilPress",
+    "OilTemp",
+    "EngineVib",
+)
+
+# Decoded stores kept per process
+DECODED_STORE_CACHE_SIZE = 64
+
+
+class DecodedStoreCache:
+    """
+    The most recently used decoded stores, keyed by aircraft id. Each entry
+    carries the store's updated_at, so a rebuild in another process is
+    picked up on the next read.
+    """
+
+    def __init__(self, max_entries=DECODED_STORE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, aircraft_id, updated_at):
+        with self._lock:
+            entry = self._entries.get(aircraft_id)
+            if entry is None or entry[0] != updated_at:
+                return None
+            self._entries.move_to_end(aircraft_id)
+            return entry[1]
+
+    def put(self, aircraft_id, updated_at, columns):
+        with self._lock:
+            self._entries[aircraft_id] = (updated_at, columns)
+            self._entries.move_to_end(aircraft_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_decoded_stores = DecodedStoreCache()
+
+
+# ============================
+# COLUMNAR CONTAINER
+# ============================
+
+class TrendColumns:
+    """ Engine trend parameters as date-sorted float32 arrays (NaN for missing) """
+
+    def __init__(self, ids, dates, columns):
+        self.ids = ids
+        self.dates = dates
+        self.columns = columns
+
+    @classmethod
+    def empty(cls, parameters=TREND_PARAMETERS, dtype=np.float32):
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype="datetime64[D]"),
+            {name: np.empty(0, dtype=dtype) for name in parameters},
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def merge(self, other):
+        """ Return a new container holding both sets of rows ordered by (date, id) """
+        ids = np.concatenate((self.ids, other.ids))
+        dates = np.concatenate((self.dates, other.dates))
+        order = np.lexsort((ids, dates))
+        columns = {
+            name: np.concatenate((values, other.columns[name]))[order]
+            for name, values in self.columns.items()
+        }
+        return TrendColumns(ids[order], dates[order], columns)
+
+    def between(self, start=None, end=None):
+        """ Slice rows with start <= date <= end; the arrays returned are views """
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        return TrendColumns(
+            self.ids[lo:hi],
+            self.dates[lo:hi],
+            {name: values[lo:hi] for name, values in self.columns.items()},
+        )
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, ids=self.ids, dates=self.dates, **self.columns)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload, parameters=TREND_PARAMETERS):
+        if not payload:
+            return cls.empty(parameters)
+        with np.load(io.BytesIO(bytes(payload)), allow_pickle=False) as data:
+            return cls(data["ids"], data["dates"], {name: data[name] for name in parameters})
+
+
+def load_columns(queryset, parameters=TREND_PARAMETERS, date_field="flight_date", dtype=np.float32):
+    """
+    Read the given numeric columns of a FlightEngineData queryset into arrays.
+
+    Values are cast to float in SQL, so no Decimal or model instances are
+    ever built on the Python side.
+    """
+    rows = list(
+        queryset.order_by().values_list(
+            "id", date_field, *(Cast(name, FloatField()) for name in parameters)
+        )
+    )
+    if not rows:
+        return TrendColumns.empty(parameters, dtype)
+    ids, dates, *values = zip(*rows)
+    ids = np.array(ids, dtype=np.int64)
+    dates = np.array(dates, dtype="datetime64[D]")
+    order = np.lexsort((ids, dates))
+    return TrendColumns(
+        ids[order],
+        dates[order],
+        {name: np.array(column, dtype=dtype)[order] for name, column in zip(parameters, values)},
+    )
+
+
+def series_to_json(values, decimals=3):
+    """ Convert a float array to a JSON-friendly list, mapping NaN to None """
+    return [None if value != value else value for value in np.round(values.astype(np.float64), decimals).tolist()]
+
+
+# ============================
+# STORE MAINTENANCE
+# ============================
+
+def refresh_trend_store(aircraft_id, rebuild=False):
+    """
+    Fold new FlightEngineData rows into an aircraft's store and persist it.
+
+    Only rows above the store's high-water mark are read unless the store was
+    flagged stale (an existing row changed, or a row committed below the mark,
+    see flag_trend_stores_behind) or a rebuild is requested.
+    """
+    with transaction.atomic():
+        EngineTrendStore.objects.get_or_create(aircraft_id=aircraft_id)
+        store = EngineTrendStore.objects.select_for_update().get(aircraft_id=aircraft_id)
+        rows = FlightEngineData.objects.filter(flight__aircraft_id=aircraft_id)
+
+        if rebuild or store.is_stale:
+            columns = load_columns(rows)
+        else:
+            columns = TrendColumns.from_bytes(store.payload).merge(
+                load_columns(rows.filter(id__gt=store.last_engine_data_id))
+            )
+
+        store.payload = columns.to_bytes()
+        store.last_engine_data_id = int(columns.ids.max()) if len(columns) else 0
+        store.row_count = len(columns)
+        store.is_stale = False
+        store.save()
+
+    _decoded_stores.put(aircraft_id, store.updated_at, columns)
+    return columns
+
+
+def get_trend_columns(aircraft_id):
+    """ Return the up-to-date trend columns for an aircraft """
+    store = (
+        EngineTrendStore.objects
+        .filter(aircraft_id=aircraft_id)
+        .only("id", "last_engine_data_id", "is_stale", "updated_at")
+        .first()
+    )
+    if store is None or store.is_stale:
+        return refresh_trend_store(aircraft_id)
+
+    has_new_rows = FlightEngineData.objects.filter(
+        flight__aircraft_id=aircraft_id, id__gt=store.last_engine_data_id
+    ).exists()
+    if has_new_rows:
+        return refresh_trend_store(aircraft_id)
+
+    columns = _decoded_stores.get(aircraft_id, store.updated_at)
+    if columns is not None:
+        return columns
+
+    payload = EngineTrendStore.objects.values_list("payload", flat=True).get(pk=store.pk)
+    columns = TrendColumns.from_bytes(payload)
+    _decoded_stores.put(aircraft_id, store.updated_at, columns)
+    return columns
+
+
+def mark_trend_stores_stale(aircraft_ids):
+    EngineTrendStore.objects.filter(aircraft_id__in=aircraft_ids).update(is_stale=True)
+
+
+def flag_trend_stores_behind(aircraft_ids, first_id):
+    """
+    Once the current transaction commits, flag the stores of ``aircraft_ids``
+    whose high-water mark already passed ``first_id``, the lowest id it
+    inserted. Ids are handed out before commit, so a transaction may commit
+    a row below the id of one that was folded in before it; the next read
+    then rebuilds the store instead of skipping that row forever.
+
+    A refresh that read the rows before this commit still holds the store
+    row, so the update waits for it and sees the mark it left.
+    """
+    transaction.on_commit(
+        lambda: EngineTrendStore.objects.filter(
+            aircraft_id__in=aircraft_ids, last_engine_data_id__gt=first_id
+        ).update(is_stale=True)
+    )
@@ -0,0 +1,14 @@
+from django.urls import path
+from .api_views import (
+    EngineAlertListView, EngineDeviationView, EngineTrendView, FleetDashboardView, FleetEventStreamView,
+    FleetEventTicketView,
+)
+
+urlpatterns = [
+    path("dashboard/", FleetDashboardView.as_view(), name="fleet_dashboard"),
+    path("aircraft/<int:aircraft_id>/trends/", EngineTrendView.as_view(), name="engine_trends"),
+    path("aircraft/<int:aircraft_id>/deviations/", EngineDeviationView.as_view(), name="engine_deviations"),
+    path("alerts/", EngineAlertListView.as_view(), name="engine_alerts"),
+    path("events/", FleetEventStreamView.as_view(), name="fleet_events"),
+    path("events/ticket/", FleetEventTicketView.as_view(), name="fleet_event_ticket"),
+]
@@ -1,3 +1,23 @@
 from django.contrib import admin
 
-# Register your models here.
+from .tenancy import current_operator_id, operator_filter
+
+
+class OperatorScopedAdmin(admin.ModelAdmin):
+    """
+    An admin limited to the active operator's rows (see core.tenancy), for
+    models whose manager is not scoped by itself. ``operator_lookup`` leads
+    from the model to its operator's id. Operator choices in forms are
+    limited the same way.
+    """
+
+    operator_lookup = "operator_id"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(operator_filter(self.operator_lookup))
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        operator_id = current_operator_id()
+        if db_field.name == "operator" and operator_id is not None:
+            kwargs["queryset"] = db_field.remote_field.model.objects.filter(pk=operator_id)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
@@ -0,0 +1,131 @@
+"""
+Building blocks for async JSON endpoints.
+
+DRF views are synchronous, so async endpoints are plain Django views that
+authenticate with the same JWT settings as the rest of the API.
+
+Browser APIs that cannot send headers, such as EventSource, authenticate
+with a stream ticket instead: an opaque, single-use key valid for
+STREAM_TICKET_TTL seconds, issued for the caller's access token by an
+authenticated POST. Only the ticket appears in the URL, so the access
+token stays out of proxy logs and browser history.
+"""
+import asyncio
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+
+from .tenancy import activate_operator, operator_id_for_user
+
+
+# Threads (and so database connections) per process available to gather_queries
+_query_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ASYNC_QUERY_THREADS", 16),
+    thread_name_prefix="async-query",
+)
+
+
+def _stream_ticket_key(ticket):
+    return f"stream-ticket:{ticket}"
+
+
+def issue_stream_ticket(access_token):
+    """ A new ticket standing for ``access_token`` (the encoded token) """
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_stream_ticket_key(ticket), str(access_token), timeout=getattr(settings, "STREAM_TICKET_TTL", 30))
+    return ticket
+
+
+def redeem_stream_ticket(ticket):
+    """ The access token a ticket stands for, or None if it is unknown, expired or used """
+    key = _stream_ticket_key(ticket)
+    access_token = cache.get(key)
+    # Of concurrent redeemers only one deletes the key
+    if access_token is None or not cache.delete(key):
+        return None
+    return access_token
+
+
+def _authenticate(request):
+    """ (user, validated token), or (None, None) without credentials """
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result:
+            return result
+    return None, None
+
+
+def _run_query(function):
+    try:
+        return function()
+    finally:
+        # Each executor thread holds its own connection; release it the
+        # way the end of a request would (honouring CONN_MAX_AGE)
+        close_old_connections()
+
+
+async def gather_queries(**queries):
+    """
+    Run independent ORM callables concurrently and return their results by name.
+
+    Django's async ORM runs every query on the single thread-sensitive
+    executor, one after another. Each callable here instead gets a thread and
+    database connection of its own, so the total wait is close to that of the
+    slowest query.
+    """
+    names = list(queries)
+    results = await asyncio.gather(
+        *(
+            sync_to_async(_run_query, thread_sensitive=False, executor=_query_executor)(queries[name])
+            for name in names
+        )
+    )
+    return dict(zip(names, results))
+
+
+class AsyncAPIView(View):
+    """
+    An async class-based view that requires a valid JWT access token.
+
+    Views for browser APIs that cannot send headers, such as EventSource,
+    set ``ticket_query_param`` to also accept a stream ticket in the query
+    string. The request is then authenticated as by the ticket's token.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    ticket_query_param = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        ticket = request.GET.get(self.ticket_query_param) if self.ticket_query_param else None
+        if ticket and "HTTP_AUTHORIZATION" not in request.META:
+            access_token = await sync_to_async(redeem_stream_ticket)(ticket)
+            if access_token is None:
+                return JsonResponse(
+                    {"detail": "Stream ticket is invalid, expired or already used."},
+                    status=401,
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            request.META["HTTP_AUTHORIZATION"] = f"Bearer {access_token}"
+        try:
+            user, request.auth = await sync_to_async(_authenticate)(request)
+        except AuthenticationFailed as exc:
+            detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return JsonResponse(detail, status=exc.status_code, headers={"WWW-Authenticate": "Bearer"})
+        if user is None or not user.is_active:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        request.user = user
+        # The queries run in copies of this context, so they inherit the scope
+        activate_operator(operator_id_for_user(user))
+        return await super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,161 @@
+"""
+Benchmark cases for the admin changelists, the read API and the analytics
+aggregations, run against whatever data is in the database (see the
+generate_fleet command).
+"""
+import statistics
+import time
+
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import CustomUser
+from aircraft.models import Aircraft, Flight, FlightEngineData
+from analytics.ectm import fit_baselines
+from analytics.trends import refresh_trend_store
+from core.pagination import KeysetPagination
+from engines.rollups import reconcile_engine_counters
+from finance.models import FlightExpense, FuelPaid
+from finance.rollups import rebuild_summaries
+
+
+BENCHMARK_USER_EMAIL = "benchmark@jetbench.invalid"
+OPERATOR_USER_EMAIL = "benchmark-operator@jetbench.invalid"
+
+# Tables whose sizes are recorded with every run
+MEASURED_MODELS = (Aircraft, Flight, FlightEngineData, FlightExpense, FuelPaid)
+
+
+class BenchmarkContext:
+    """ Clients and sample keys shared by every case of one run """
+
+    def __init__(self):
+        user, _ = CustomUser.objects.get_or_create(
+            email=BENCHMARK_USER_EMAIL,
+            defaults={"role": "admin", "is_staff": True, "is_superuser": True},
+        )
+        self.admin = Client()
+        self.admin.force_login(user)
+        self.api = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        # The aircraft with the most flights, so per-aircraft cases see the worst case
+        busiest = (
+            Flight.objects.order_by().values("aircraft_id")
+            .annotate(flights=Count("id")).order_by("-flights").first()
+        )
+        self.aircraft_id = busiest["aircraft_id"] if busiest else None
+        # A user of the busiest aircraft's operator, whose requests are scoped to it
+        operator_id = Aircraft.objects.filter(pk=self.aircraft_id).values_list("operator_id", flat=True).first()
+        operator_user, _ = CustomUser.objects.update_or_create(
+            email=OPERATOR_USER_EMAIL, defaults={"role": "owner", "operator_id": operator_id},
+        )
+        self.operator_api = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(operator_user)}")
+        self.flight_cursor = self._deep_cursor(Flight.objects.all())
+        self.engine_data_cursor = self._deep_cursor(FlightEngineData.objects.all())
+
+    @staticmethod
+    def _deep_cursor(queryset):
+        """ A cursor pointing 90% of the way through the table, newest first """
+        total = queryset.count()
+        row = queryset.order_by("-flight_date", "-id").only("id", "flight_date")[total * 9 // 10:][:1].first()
+        return KeysetPagination().encode_cursor(row) if row else ""
+
+
+def _get(client_name, path):
+    def case(context):
+        url = path.format(context=context)
+        response = getattr(context, client_name).get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        # Streaming or not, make sure the body is fully produced
+        response.getvalue()
+    return case
+
+
+def _call(function, *args, **kwargs):
+    def case(context):
+        function(*[arg(context) if callable(arg) else arg for arg in args], **kwargs)
+    return case
+
+
+CASES = {
+    "admin.flights": _get("admin", "/admin/aircraft/flight/"),
+    "admin.engine_data": _get("admin", "/admin/aircraft/flightenginedata/"),
+    "admin.engine_data_filtered": _get(
+        "admin",
+        "/admin/aircraft/flightenginedata/?flight__aircraft__id__exact={context.aircraft_id}"
+        "&altitude_band=fl300_fl400",
+    ),
+    "admin.expenses": _get("admin", "/admin/finance/flightexpense/"),
+    "admin.fuel": _get("admin", "/admin/finance/fuelpaid/"),
+    "api.flights": _get("api", "/api/aircraft/flights/"),
+    "api.flights_deep_page": _get("api", "/api/aircraft/flights/?cursor={context.flight_cursor}"),
+    "api.engine_data": _get("api", "/api/aircraft/engine-data/?aircraft={context.aircraft_id}"),
+    "api.engine_data_deep_page": _get("api", "/api/aircraft/engine-data/?cursor={context.engine_data_cursor}"),
+    "api.expenses": _get("api", "/api/finance/expenses/"),
+    "api.fuel": _get("api", "/api/finance/fuel/"),
+    "api.expense_export_csv": _get("api", "/api/finance/expenses/export/csv/"),
+    "api.fuel_export_xlsx": _get("api", "/api/finance/fuel/export/xlsx/"),
+    "api.finance_summary": _get("api", "/api/finance/summary/"),
+    "api.fuel_prices": _get("api", "/api/finance/fuel-prices/"),
+    "api.engine_trends": _get("api", "/api/analytics/aircraft/{context.aircraft_id}/trends/"),
+    "api.operator_flights": _get("operator_api", "/api/aircraft/flights/"),
+    "api.operator_expenses": _get("operator_api", "/api/finance/expenses/"),
+    "api.operator_finance_summary": _get("operator_api", "/api/finance/summary/"),
+    "api.engine_deviations": _get("api", "/api/analytics/aircraft/{context.aircraft_id}/deviations/"),
+    "analytics.trend_store_rebuild": _call(refresh_trend_store, lambda context: context.aircraft_id, rebuild=True),
+    "analytics.ectm_baseline_fit": _call(fit_baselines),
+    "analytics.finance_summary_rebuild": _call(rebuild_summaries),
+    "analytics.engine_counter_reconcile": _call(reconcile_engine_counters),
+}
+
+
+def table_sizes():
+    return {model._meta.label: model.objects.count() for model in MEASURED_MODELS}
+
+
+def run_case(case, context, repeat=5, warmup=1):
+    """ Time one case, returning its timings in milliseconds and its query count """
+    for _ in range(warmup):
+        case(context)
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            case(context)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(timings[0], 2),
+        "max_ms": round(timings[-1], 2),
+        "queries": len(queries),
+    }
+
+
+def find_regressions(results, baseline, tolerance=0.25, floor_ms=5.0):
+    """
+    Compare the medians of a run against a stored baseline run.
+
+    A case regresses when its median exceeds the baseline median by more than
+    ``tolerance`` (a fraction) and by more than ``floor_ms``, so that noise on
+    very fast cases is not reported, or when it issues more queries.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        slower = result["median_ms"] - previous["median_ms"]
+        if slower > floor_ms and result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: median {result['median_ms']} ms vs baseline {previous['median_ms']} ms"
+            )
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries vs baseline {previous['queries']}"
+            )
+    return regressions
@@ -0,0 +1,137 @@
+"""
+Per-aircraft data versions for cached responses.
+
+Every change to an aircraft's flights, engine data or finance rows bumps that
+aircraft's version, so responses cached under the old version are simply never
+read again; other aircraft keep their cache. Fleet-wide responses use the
+version of the operator's fleet, bumped alongside any of its aircraft (and an
+all-operators version for unscoped staff requests), so one operator's writes
+leave other operators' caches alone. Bulk jobs that rewrite derived data for
+everyone bump a global epoch that is part of every version.
+"""
+import hashlib
+import time
+from functools import partial, wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .tenancy import current_operator_id
+
+
+EPOCH_KEY = "data-version:epoch"
+
+
+def _aircraft_key(aircraft_id):
+    return f"data-version:aircraft:{aircraft_id}"
+
+
+def _fleet_key(operator_id):
+    return f"data-version:fleet:{'all' if operator_id is None else operator_id}"
+
+
+def _incr(key):
+    # Counters start from the clock, so a counter lost to eviction never
+    # restarts at a value that old cache entries were stored under
+    cache.add(key, time.time_ns(), timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def data_version(aircraft_id=None, operator_id=None):
+    """
+    Current version of one aircraft's data, or when aircraft_id is None of
+    an operator's fleet (of every operator's when operator_id is None too)
+    """
+    key = _fleet_key(operator_id) if aircraft_id is None else _aircraft_key(aircraft_id)
+    values = cache.get_many([EPOCH_KEY, key])
+    if key not in values or EPOCH_KEY not in values:
+        cache.add(EPOCH_KEY, time.time_ns(), timeout=None)
+        cache.add(key, time.time_ns(), timeout=None)
+        values = cache.get_many([EPOCH_KEY, key])
+    return f"{values.get(EPOCH_KEY, 0)}.{values.get(key, 0)}"
+
+
+def _bump(keys, aircraft_ids=()):
+    if aircraft_ids:
+        from aircraft.models import Aircraft
+
+        operator_ids = Aircraft.objects.unscoped().filter(pk__in=aircraft_ids).values_list("operator_id", flat=True)
+        keys = keys + [_fleet_key(operator_id) for operator_id in set(operator_ids)]
+    for key in keys:
+        _incr(key)
+
+
+def bump_data_version(*aircraft_ids, operator_ids=None):
+    """
+    Invalidate cached responses for the given aircraft and for their
+    operators' fleets once the current transaction commits, so that no
+    request can cache pre-commit data under the new version.
+
+    Pass the aircraft's ``operator_ids`` when they are at hand; otherwise
+    they are looked up after the commit.
+    """
+    aircraft_ids = {aircraft_id for aircraft_id in aircraft_ids if aircraft_id is not None}
+    keys = [_aircraft_key(aircraft_id) for aircraft_id in aircraft_ids] + [_fleet_key(None)]
+    if operator_ids is None:
+        transaction.on_commit(partial(_bump, keys, aircraft_ids))
+        return
+    keys += [_fleet_key(operator_id) for operator_id in set(operator_ids) if operator_id is not None]
+    transaction.on_commit(partial(_bump, keys))
+
+
+def bump_all_data_versions():
+    """ Invalidate every cached response, after bulk jobs that bypass signals """
+    transaction.on_commit(partial(_bump, [EPOCH_KEY]))
+
+
+def _response_aircraft(request, kwargs):
+    if "aircraft_id" in kwargs:
+        return kwargs["aircraft_id"]
+    aircraft = request.query_params.get("aircraft", "")
+    return int(aircraft) if aircraft.isdecimal() else None
+
+
+def versioned_response(per_aircraft=True, timeout=60 * 60):
+    """
+    Cache a view's successful GET responses under the data version of the
+    aircraft they describe (the ``aircraft_id`` URL argument or ``aircraft``
+    query parameter), or of the operator's fleet when there is none or when
+    per_aircraft is False.
+
+    Responses carry an ETag derived from the version, the operator and the
+    request, so a client revalidating with If-None-Match gets a 304 without
+    the view or the database being touched, and no operator is ever served
+    a response cached for another.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            operator_id = current_operator_id()
+            version = data_version(_response_aircraft(request, kwargs) if per_aircraft else None, operator_id)
+            query = sorted(request.query_params.lists())
+            digest = hashlib.sha1(f"{operator_id}|{request.path}|{query}|{version}".encode()).hexdigest()
+            etag = f'"{digest}"'
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            key = f"response:{digest}"
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, headers=headers)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout)
+                for name, value in headers.items():
+                    response[name] = value
+            return response
+        return wrapper
+    return decorator
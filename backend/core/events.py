@@ -0,0 +1,178 @@
+"""
+Live fleet events, pushed to open dashboards over Server-Sent Events.
+
+New flights, engine exceedances and expenses are published as they are
+written. On PostgreSQL an event is a NOTIFY on EVENTS_CHANNEL, which the
+database delivers only when (and if) the writing transaction commits. Each
+web process runs one thread LISTENing on a connection of its own, and hands
+every event to the queues of the streams open in that process, so a process
+serves any number of streams with a single database connection. On other
+databases events are handed over on commit and only reach the streams of
+the process that wrote them, which is enough for development.
+
+Events carry ids and a few display fields only: a notification is capped at
+8000 bytes. Bulk writes announce their newest BULK_EVENT_LIMIT rows, so that
+a large import does not push every open stream past QUEUE_SIZE. Events published while a stream is not connected are not
+replayed; the dashboard reloads what it shows when it reconnects.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "fleet_events"
+
+# Events a stream may fall behind by before it is closed; the client
+# reconnects and starts over
+QUEUE_SIZE = 100
+
+# Rows of one bulk write that are announced, the newest ones
+BULK_EVENT_LIMIT = QUEUE_SIZE // 2
+
+LISTEN_TIMEOUT_SECONDS = 5
+RECONNECT_SECONDS = 5
+
+# A comment line is sent this often so that proxies keep idle streams open
+KEEPALIVE_SECONDS = 15
+
+# How long a browser waits before reconnecting a dropped stream
+RETRY_MILLISECONDS = 3000
+
+
+def _message(kind, operator_id, data):
+    return json.dumps({"kind": kind, "operator": operator_id, "data": data}, cls=DjangoJSONEncoder)
+
+
+def publish(kind, operator_id, data):
+    """ Send an event to the streams of ``operator_id`` once the current transaction commits """
+    message = _message(kind, operator_id, data)
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [EVENTS_CHANNEL, message])
+    else:
+        transaction.on_commit(lambda: hub.dispatch(message))
+
+
+def publish_many(kind, events):
+    """
+    publish() the (operator id, data) events of rows written in bulk, in one
+    round trip. Only the last BULK_EVENT_LIMIT events are sent.
+    """
+    messages = [_message(kind, operator_id, data) for operator_id, data in list(events)[-BULK_EVENT_LIMIT:]]
+    if not messages:
+        return
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, message) FROM unnest(%s::text[]) WITH ORDINALITY AS m(message, n) ORDER BY n",
+                [EVENTS_CHANNEL, messages],
+            )
+    else:
+        transaction.on_commit(lambda: [hub.dispatch(message) for message in messages])
+
+
+def _offer(queue, frame):
+    """ Queue an event for a stream; runs on the stream's event loop """
+    try:
+        queue.put_nowait(frame)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+
+class EventHub:
+    """ The streams open in this process and the listener that feeds them """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._listener = None
+
+    def subscribe(self, operator_id):
+        """
+        A queue of the formatted events of ``operator_id`` (of every
+        operator when None), for the running event loop. A None in the queue
+        means the stream fell too far behind and must end.
+        """
+        queue = asyncio.Queue(QUEUE_SIZE)
+        with self._lock:
+            self._streams[queue] = (asyncio.get_running_loop(), operator_id)
+            if connection.vendor == "postgresql" and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="fleet-events", daemon=True)
+                self._listener.start()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._streams.pop(queue, None)
+
+    def dispatch(self, message):
+        """ Hand a published message to every stream allowed to see it; safe from any thread """
+        event = json.loads(message)
+        operator_id = event["operator"]
+        # Formatted once, however many streams it goes to
+        frame = f"event: {event['kind']}\ndata: {json.dumps(event['data'])}\n\n"
+        with self._lock:
+            targets = [
+                (queue, loop) for queue, (loop, scope) in self._streams.items()
+                if scope is None or scope == operator_id
+            ]
+        for queue, loop in targets:
+            loop.call_soon_threadsafe(_offer, queue, frame)
+
+    def _listen(self):
+        """ LISTEN for events for the life of the process, reconnecting after failures """
+        while True:
+            database = connections.create_connection(DEFAULT_DB_ALIAS)
+            listener = None
+            try:
+                listener = database.get_new_connection(database.get_connection_params())
+                listener.autocommit = True
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+                while True:
+                    if select.select([listener], [], [], LISTEN_TIMEOUT_SECONDS) == ([], [], []):
+                        continue
+                    listener.poll()
+                    while listener.notifies:
+                        self.dispatch(listener.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Fleet event listener failed; reconnecting in %ss", RECONNECT_SECONDS)
+                time.sleep(RECONNECT_SECONDS)
+            finally:
+                if listener is not None and not listener.closed:
+                    listener.close()
+
+
+hub = EventHub()
+
+
+async def event_stream(operator_id, until):
+    """
+    Server-Sent Events of the events of ``operator_id`` (None: every
+    operator) until the Unix time ``until``, or until the stream falls
+    too far behind.
+    """
+    queue = hub.subscribe(operator_id)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while (remaining := until - time.time()) > 0:
+            try:
+                frame = await asyncio.wait_for(queue.get(), min(KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        hub.unsubscribe(queue)
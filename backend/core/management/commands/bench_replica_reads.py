@@ -0,0 +1,127 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections, transaction
+
+from accounts.models import Operator
+from aircraft.ledger import compact_ledger, record_flight_delta
+from aircraft.models import Aircraft
+from analytics.dashboard import dashboard_queries
+from core.routers import replica_configured, replica_reads
+
+
+HOURS = Decimal("1.5")
+
+
+def _end_request_closing():
+    # What the end of a request does with CONN_MAX_AGE=0
+    connections.close_all()
+
+
+def _end_request_persistent():
+    # What it does with persistent connections: keep them unless expired or broken
+    close_old_connections()
+
+
+CONNECTION_MODES = {
+    "connect": _end_request_closing,
+    "persistent": _end_request_persistent,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure dashboard read and flight-logging write throughput with the reads on the "
+        "primary versus the replica, opening a connection per request versus keeping it open. "
+        "Run against a fleet made with generate_fleet."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, nargs="+", default=[4, 16])
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+        parser.add_argument(
+            "--hold-ms", type=float, default=5.0,
+            help="Time each write transaction stays open, standing in for the rest of the request",
+        )
+
+    def handle(self, *args, **options):
+        targets = ["primary", "replica"] if replica_configured() else ["primary"]
+        if not replica_configured():
+            self.stdout.write(self.style.WARNING("No replica configured (DB_REPLICA_HOST); measuring the primary only."))
+        operator = Operator.objects.create(name=f"Benchmark {time.time_ns()}")
+        aircraft = Aircraft.objects.create(
+            operator=operator, model="BENCHMARK", serial=f"BENCH-{time.time_ns()}", registration="NBENCH"
+        )
+        try:
+            self.stdout.write(f"{'reads on':<10}{'connections':<13}{'readers':>9}{'reads/s':>10}{'writes/s':>10}")
+            for readers in options["readers"]:
+                for target in targets:
+                    for connection_mode, end_request in CONNECTION_MODES.items():
+                        reads, writes = self._run(
+                            target == "replica", end_request, aircraft.pk, readers, options["writers"],
+                            options["seconds"], options["hold_ms"] / 1000,
+                        )
+                        self.stdout.write(f"{target:<10}{connection_mode:<13}{readers:>9}{reads:>10.1f}{writes:>10.1f}")
+        finally:
+            compact_ledger()
+            aircraft.delete()
+            operator.delete()
+
+    def _run(self, use_replica, end_request, aircraft_id, readers, writers, seconds, hold):
+        barrier = threading.Barrier(readers + writers + 1)
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0}
+        lock = threading.Lock()
+
+        def read():
+            queries = dashboard_queries()
+            for query in queries.values():
+                query()
+
+        def reader():
+            done = 0
+            barrier.wait()
+            try:
+                while not stop.is_set():
+                    if use_replica:
+                        with replica_reads():
+                            read()
+                    else:
+                        read()
+                    end_request()
+                    done += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    counts["reads"] += done
+
+        def writer():
+            done = 0
+            barrier.wait()
+            try:
+                while not stop.is_set():
+                    with transaction.atomic():
+                        record_flight_delta(aircraft_id, None, HOURS, 1)
+                        time.sleep(hold)
+                    end_request()
+                    done += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    counts["writes"] += done
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return counts["reads"] / elapsed, counts["writes"] / elapsed
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.synthetic import clear_fleet, generate_fleet
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic fleet with flight, engine trend and expense history for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=10000,
+            help="Approximate number of rows to write across all fleet tables (e.g. 10000, 1000000, 10000000)",
+        )
+        parser.add_argument("--years", type=int, default=3, help="Length of the generated flight history")
+        parser.add_argument(
+            "--operators", type=int, default=1, help="Number of synthetic operators sharing the aircraft",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable datasets")
+        parser.add_argument("--clear", action="store_true", help="Delete previously generated data first")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted = clear_fleet()
+            self.stdout.write(f"Deleted {deleted} synthetic rows.")
+        started = time.perf_counter()
+        counts = generate_fleet(
+            options["rows"],
+            years=options["years"],
+            seed=options["seed"],
+            operators=options["operators"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        elapsed = time.perf_counter() - started
+        for model, count in counts.items():
+            self.stdout.write(f"{model.__name__:<20}{count:>12}")
+        self.stdout.write(self.style.SUCCESS(f"Generated {sum(counts.values())} rows in {elapsed:.1f}s."))
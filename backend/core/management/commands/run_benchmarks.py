@@ -0,0 +1,88 @@
+import json
+import math
+import platform
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmarks import CASES, BenchmarkContext, find_regressions, run_case, table_sizes
+
+
+def scale_label(rows):
+    """ The nearest of the standard benchmark scales to a total row count """
+    scales = {"10k": 10 ** 4, "1m": 10 ** 6, "10m": 10 ** 7}
+    return min(scales, key=lambda name: abs(math.log10(max(rows, 1)) - math.log10(scales[name])))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the admin changelists, API endpoints and analytics aggregations against the "
+        "current database, write the results as JSON and fail on regressions against a baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument("--baseline", help="Results file of an earlier run to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown as a fraction")
+        parser.add_argument("--floor-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--only", nargs="+", default=[], help="Run only cases whose name starts with these")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read baseline: {exc}")
+
+        sizes = table_sizes()
+        scale = scale_label(sum(sizes.values()))
+        if baseline and baseline["meta"]["scale"] != scale:
+            raise CommandError(
+                f"Baseline was recorded at the {baseline['meta']['scale']} scale, "
+                f"this database is at the {scale} scale."
+            )
+
+        names = [name for name in CASES if not options["only"] or name.startswith(tuple(options["only"]))]
+        # The test client needs the test environment for its host name
+        setup_test_environment()
+        try:
+            context = BenchmarkContext()
+            results = {}
+            self.stdout.write(f"{'case':<36}{'median ms':>12}{'min ms':>10}{'queries':>9}")
+            for name in names:
+                result = run_case(CASES[name], context, repeat=options["repeat"], warmup=options["warmup"])
+                results[name] = result
+                self.stdout.write(
+                    f"{name:<36}{result['median_ms']:>12.1f}{result['min_ms']:>10.1f}{result['queries']:>9}"
+                )
+        finally:
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "recorded_at": timezone.now().isoformat(),
+                "scale": scale,
+                "rows": sizes,
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "repeat": options["repeat"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        if baseline:
+            regressions = find_regressions(
+                results, baseline["results"], options["tolerance"], options["floor_ms"]
+            )
+            if regressions:
+                raise CommandError("Regressions against baseline:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
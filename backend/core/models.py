@@ -1,3 +1,41 @@
 from django.db import models
 
-# Create your models here.
+
+class TrackedFieldsMixin:
+    """
+    Remembers the values of TRACKED_FIELDS across saves.
+
+    During save() the values the row held before the save are available to
+    signal receivers as ``_previous_values`` (None for a new row).
+    """
+
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_values", {})
+        if self.pk is None:
+            previous = None
+        elif all(name in loaded for name in self.TRACKED_FIELDS):
+            previous = {name: loaded[name] for name in self.TRACKED_FIELDS}
+        else:
+            previous = type(self)._default_manager.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+        self._previous_values = previous
+
+        super().save(*args, **kwargs)
+
+        self._loaded_values = self.tracked_values()
+
+    def tracked_values(self):
+        """ Current values of TRACKED_FIELDS, normalised to their Python types """
+        return {
+            name: self._meta.get_field(name).to_python(getattr(self, name))
+            for name in self.TRACKED_FIELDS
+        }
@@ -0,0 +1,86 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first pagination on (date_field, id) with an opaque cursor.
+
+    Each page is a range scan from the previous page's last row, so the cost
+    of a page does not grow with its depth the way OFFSET does. Querysets
+    should be backed by a (date_field, id) index.
+    """
+
+    date_field = "flight_date"
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(f"-{self.date_field}", "-id")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            last_date, last_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f"{self.date_field}__lt": last_date})
+                | Q(**{self.date_field: last_date, "id__lt": last_id}),
+                **{f"{self.date_field}__lte": last_date},
+            )
+
+        # One extra row tells whether another page follows
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, row):
+        payload = json.dumps([getattr(row, self.date_field).isoformat(), row.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            last_date, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            last_date = parse_date(last_date)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            last_date = None
+        if last_date is None:
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+        return last_date, last_id
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
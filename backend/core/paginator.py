@@ -0,0 +1,61 @@
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that reads the row count from PostgreSQL's planner statistics
+    instead of running COUNT(*) over a large table.
+
+    Unfiltered querysets use the table's pg_class.reltuples, summed over the
+    partitions of a partitioned table; filtered ones use the planner's row
+    estimate for the query. Estimates below EXACT_COUNT_THRESHOLD are
+    replaced by an exact count, which is cheap at that size. Other database
+    backends always count exactly.
+    """
+
+    EXACT_COUNT_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = None
+        if hasattr(queryset, "query") and connections[queryset.db].vendor == "postgresql":
+            if queryset.query.where:
+                estimate = self._planner_estimate(queryset)
+            else:
+                estimate = self._table_estimate(queryset)
+        if estimate is None or estimate < self.EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+    @staticmethod
+    def _table_estimate(queryset):
+        # A partitioned table has no statistics of its own (autovacuum never
+        # analyzes it), so its partitions' are summed instead
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT sum(greatest(reltuples, 0))::bigint, max(reltuples)
+                FROM pg_class
+                WHERE (oid = %s::regclass AND relkind <> 'p')
+                   OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)
+                """,
+                [queryset.model._meta.db_table] * 2,
+            )
+            total, analyzed = cursor.fetchone()
+        # reltuples is -1 until a table has been vacuumed or analyzed
+        return total if analyzed is not None and analyzed >= 0 else None
+
+    @staticmethod
+    def _planner_estimate(queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
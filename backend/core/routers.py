@@ -0,0 +1,133 @@
+"""
+Routing of dashboard and export reads to a read replica.
+
+When a ``replica`` database is configured, code inside ``replica_reads``
+reads from it; everything else, and every write, uses the primary. A user
+who has just written reads from the primary for DB_REPLICA_STICKY_SECONDS
+afterwards, long enough for the replica to catch up, so nobody misses their
+own changes. Writes are noticed by the router and remembered per user in the
+cache by ReplicaRoutingMiddleware.
+
+Responses cached under a data version (core.cache) are computed on the
+primary: a replica that lags would cache old data under the new version.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+REPLICA_ALIAS = "replica"
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _sticky_key(user_id):
+    return f"db-sticky:{user_id}"
+
+
+class _RoutingState:
+    """ What the router needs to know about the current request """
+
+    def __init__(self, request=None):
+        self.request = request
+        self.replica = False
+        self.wrote = False
+        self._pinned = None
+
+    @property
+    def user_id(self):
+        user = getattr(self.request, "user", None)
+        return user.pk if getattr(user, "is_authenticated", False) else None
+
+    def pinned(self):
+        """ Whether this request must read from the primary; looked up once """
+        if self.wrote:
+            return True
+        if self._pinned is None:
+            user_id = self.user_id
+            self._pinned = user_id is not None and cache.get(_sticky_key(user_id)) is not None
+        return self._pinned
+
+
+@contextmanager
+def replica_reads():
+    """ Read from the replica inside the block, unless the user wrote recently """
+    state = _routing.get()
+    token = None
+    if state is None:
+        state = _RoutingState()
+        token = _routing.set(state)
+    previous = state.replica
+    state.replica = True
+    try:
+        yield
+    finally:
+        state.replica = previous
+        if token is not None:
+            _routing.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.replica or not replica_configured() or state.pinned():
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """ Track the writes of each request and pin its user to the primary after one """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = _RoutingState(request)
+        token = _routing.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            self._remember(state)
+            _routing.reset(token)
+
+    async def __acall__(self, request):
+        state = _RoutingState(request)
+        token = _routing.set(state)
+        try:
+            return await self.get_response(request)
+        finally:
+            self._remember(state)
+            _routing.reset(token)
+
+    @staticmethod
+    def _remember(state):
+        if state.wrote and replica_configured() and state.user_id is not None:
+            cache.set(_sticky_key(state.user_id), True, settings.DB_REPLICA_STICKY_SECONDS)
@@ -0,0 +1,371 @@
+"""
+Synthetic fleet data for benchmarking.
+
+Generates operators owning aircraft with installed engines, a flight
+history, cruise engine snapshots, trip expenses and fuel uplifts. Rows are
+written with bulk inserts (COPY on PostgreSQL), so signals do not run; the
+derived data they would maintain (denormalized dates, canonical fuel values,
+aircraft and engine counters, monthly summaries, anomaly state, overhaul
+forecasts) is filled in directly or rebuilt at the end.
+"""
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Operator
+from aircraft.models import Aircraft, Flight, FlightEngineData
+from aircraft.partitions import ensure_partitions
+from core.cache import bump_all_data_versions
+from analytics.anomaly import rescore_engines
+from analytics.models import EngineAlert, EngineDeviation
+from engines.models import Engine
+from engines.forecast import refresh_forecasts
+from engines.rollups import reconcile_engine_counters
+from finance.models import (
+    KG_PER_POUND, ExpenseType, FlightExpense, FuelPaid, FuelType, FuelUnits, PaymentMethod, kg_per_unit,
+)
+from finance.rollups import rebuild_summaries
+from telemetry.models import TelemetryChunk, TelemetryRecording
+
+
+SERIAL_PREFIX = "SYN-"
+OPERATOR_PREFIX = "Synthetic operator "
+BATCH_SIZE = 5000
+
+# Approximate rows written per flight: the flight, one snapshot per engine
+# (1.7 on average over the catalogue), ~1.5 expenses and ~0.9 fuel uplifts
+ROWS_PER_FLIGHT = 5.1
+FLIGHTS_PER_AIRCRAFT_YEAR = 350
+
+FLEET_CATALOGUE = (
+    {
+        "manufacturer": "PL", "aircraft_type": "ST", "model": "PC-12 NGX", "fuel_flow_unit": "LPH",
+        "engines": 1, "engine_manufacturer": "pw", "engine_type": "tp", "engine_model": "PT6E-67XP",
+        "altitude": (18000, 28000), "mach": (0.4, 0.5), "ias": (170, 200),
+        "n1": 96.0, "n2": None, "itt": 720.0, "fuel_flow": 420.0, "hours": (0.8, 3.5),
+    },
+    {
+        "manufacturer": "BC", "aircraft_type": "TT", "model": "KING AIR 350", "fuel_flow_unit": "LPH",
+        "engines": 2, "engine_manufacturer": "pw", "engine_type": "tp", "engine_model": "PT6A-60A",
+        "altitude": (20000, 35000), "mach": (0.4, 0.5), "ias": (180, 220),
+        "n1": 95.0, "n2": None, "itt": 740.0, "fuel_flow": 360.0, "hours": (0.8, 3.0),
+    },
+    {
+        "manufacturer": "CS", "aircraft_type": "TJ", "model": "CITATION CJ3+", "fuel_flow_unit": "LPH",
+        "engines": 2, "engine_manufacturer": "wl", "engine_type": "tf", "engine_model": "FJ44-3A",
+        "altitude": (33000, 45000), "mach": (0.6, 0.7), "ias": (230, 260),
+        "n1": 92.0, "n2": 96.0, "itt": 780.0, "fuel_flow": 500.0, "hours": (0.7, 3.0),
+    },
+    {
+        "manufacturer": "BD", "aircraft_type": "TJ", "model": "CHALLENGER 350", "fuel_flow_unit": "KPH",
+        "engines": 2, "engine_manufacturer": "hw", "engine_type": "tf", "engine_model": "HTF7350",
+        "altitude": (37000, 45000), "mach": (0.7, 0.8), "ias": (250, 280),
+        "n1": 90.0, "n2": 95.0, "itt": 800.0, "fuel_flow": 480.0, "hours": (1.0, 6.0),
+    },
+    {
+        "manufacturer": "DS", "aircraft_type": "JJ", "model": "FALCON 900LX", "fuel_flow_unit": "KPH",
+        "engines": 3, "engine_manufacturer": "hw", "engine_type": "tf", "engine_model": "TFE731-60",
+        "altitude": (39000, 47000), "mach": (0.7, 0.8), "ias": (250, 280),
+        "n1": 91.0, "n2": 96.0, "itt": 830.0, "fuel_flow": 420.0, "hours": (1.0, 7.0),
+    },
+)
+
+AIRPORTS = (
+    "KTEB", "KHPN", "KVNY", "KPBI", "KMDW", "KDAL", "KAPA", "KBED", "KOPF", "KLAS",
+    "CYYZ", "MMTO", "TNCM", "LFPB", "EGGW", "LSGG", "LIML", "EDDM", "LEMD", "OMDW",
+)
+
+# Expense type -> (relative frequency, median amount in USD)
+EXPENSE_PROFILE = {
+    ExpenseType.FBO: (0.30, 450.0),
+    ExpenseType.HOTEL: (0.15, 320.0),
+    ExpenseType.MEAL: (0.20, 85.0),
+    ExpenseType.TAXI: (0.12, 60.0),
+    ExpenseType.PARKING: (0.10, 150.0),
+    ExpenseType.MAINTENANCE: (0.05, 2500.0),
+    ExpenseType.OTHER: (0.08, 120.0),
+}
+PAYMENT_METHODS = (PaymentMethod.CREDIT_CARD, PaymentMethod.DEBIT_CARD, PaymentMethod.TRANSFER, PaymentMethod.CASH)
+FUEL_UNITS = (FuelUnits.GALLONS, FuelUnits.LITERS, FuelUnits.POUNDS, FuelUnits.KILOGRAMS)
+
+
+# ============================
+# BULK WRITES
+# ============================
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def insert_rows(model, fields, rows):
+    """
+    Insert tuples of field values without building model instances on
+    PostgreSQL (COPY), falling back to bulk_create elsewhere.
+    """
+    if not rows:
+        return 0
+    if connection.vendor == "postgresql":
+        columns = ", ".join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN", buffer
+            )
+    else:
+        model.objects.bulk_create(
+            (model(**dict(zip(fields, row))) for row in rows), batch_size=BATCH_SIZE
+        )
+    return len(rows)
+
+
+# ============================
+# GENERATION
+# ============================
+
+def _decimal_strings(values, places):
+    return [f"{value:.{places}f}" for value in values.tolist()]
+
+
+def _flight_dates(rng, count, start, days):
+    offsets = np.sort(rng.integers(0, days, size=count))
+    return [start + timedelta(days=offset) for offset in offsets.tolist()]
+
+
+def _route(rng, count):
+    # Each leg departs from where the previous one arrived
+    stops = [AIRPORTS[index] for index in rng.integers(0, len(AIRPORTS), size=count + 1).tolist()]
+    for index in range(1, len(stops)):
+        if stops[index] == stops[index - 1]:
+            stops[index] = AIRPORTS[(AIRPORTS.index(stops[index]) + 1) % len(AIRPORTS)]
+    return stops[:-1], stops[1:]
+
+
+def _snapshot_rows(rng, profile, flights, hours, engine_ids, now):
+    """ One cruise snapshot per flight and engine, with slow ITT and fuel flow drift """
+    rows = []
+    count = len(flights)
+    cumulative_hours = np.cumsum(hours)
+    for engine_id in engine_ids:
+        altitude = rng.integers(*profile["altitude"], size=count) // 500 * 500
+        isa_temp = np.maximum(15.0 - 1.98 * altitude / 1000.0, -56.5)
+        oat = np.clip(isa_temp + rng.normal(0, 5, count), -99.9, 99.9)
+        mach = rng.uniform(*profile["mach"], size=count)
+        ias = rng.integers(*profile["ias"], size=count)
+        n1 = np.clip(profile["n1"] + rng.normal(0, 1.2, count), 0, 110)
+        n2 = np.clip(profile["n2"] + rng.normal(0, 0.8, count), 0, 110) if profile["n2"] else None
+        itt = profile["itt"] + 2.5 * (oat - isa_temp) + 0.004 * cumulative_hours + rng.normal(0, 6, count)
+        fuel_flow = profile["fuel_flow"] * (1 + 0.00001 * cumulative_hours) + rng.normal(0, 10, count)
+        if profile["fuel_flow_unit"] == "LPH":
+            fuel_flow = fuel_flow / float(KG_PER_POUND)
+        epr = 1.3 + (n1 - 80) * 0.01 + rng.normal(0, 0.01, count) if profile["engine_type"] == "tf" else None
+        oil_press = rng.integers(80, 110, size=count)
+        oil_temp = rng.integers(60, 95, size=count)
+        vibration = np.clip(rng.gamma(4, 0.1, count), 0, 9.99)
+
+        columns = (
+            altitude.tolist(),
+            _decimal_strings(oat, 1),
+            ias.tolist(),
+            _decimal_strings(mach, 1),
+            _decimal_strings(n1, 1),
+            _decimal_strings(n2, 1) if n2 is not None else [None] * count,
+            _decimal_strings(np.clip(epr, 0, 9.99), 2) if epr is not None else [None] * count,
+            _decimal_strings(itt, 1),
+            np.maximum(fuel_flow, 0).astype(int).tolist(),
+            oil_press.tolist(),
+            oil_temp.tolist(),
+            _decimal_strings(vibration, 2),
+        )
+        for (flight_id, flight_date, operator_id), *values in zip(flights, *columns):
+            # Scored by the rescore that follows generation
+            rows.append((flight_id, flight_date, operator_id, engine_id, *values, True, now, now))
+    return rows
+
+
+SNAPSHOT_FIELDS = (
+    "flight_id", "flight_date", "operator_id", "engine_id", "press_altitude", "outside_air_temp", "indicated_air_speed",
+    "mach_number", "SpeedN1", "SpeedN2", "EnginePR", "InterstageTT", "EngineFF", "OilPress", "OilTemp",
+    "EngineVib", "anomaly_scored", "created_at", "updated_at",
+)
+EXPENSE_FIELDS = (
+    "flight_id", "flight_date", "operator_id", "expense_type", "payment_method", "expense_amount", "merchant",
+    "notes", "created_at", "updated_at",
+)
+FUEL_FIELDS = (
+    "flight_id", "flight_date", "operator_id", "fuel_type", "fuel_units", "fuel_quantity", "amount_paid",
+    "fuel_quantity_kg", "price_per_kg", "created_at", "updated_at",
+)
+
+
+def _expense_rows(rng, flights, now):
+    types = list(EXPENSE_PROFILE)
+    weights = np.array([EXPENSE_PROFILE[name][0] for name in types])
+    counts = rng.poisson(1.5, size=len(flights))
+    total = int(counts.sum())
+    kinds = rng.choice(len(types), size=total, p=weights / weights.sum())
+    medians = np.array([EXPENSE_PROFILE[name][1] for name in types])[kinds]
+    amounts = np.clip(medians * rng.lognormal(0, 0.4, total), 5, 99999.99)
+    methods = rng.integers(0, len(PAYMENT_METHODS), size=total)
+    owners = np.repeat(np.arange(len(flights)), counts)
+    return [
+        (*flights[owner], types[kind], PAYMENT_METHODS[method], amount, "", "", now, now)
+        for owner, kind, method, amount in zip(
+            owners.tolist(), kinds.tolist(), methods.tolist(), _decimal_strings(amounts, 2)
+        )
+    ]
+
+
+def _fuel_rows(rng, profile, flights, departures, hours, now):
+    rows = []
+    uplifted = rng.random(len(flights)) < 0.9
+    burn_kg = profile["fuel_flow"] * profile["engines"] * hours * rng.uniform(1.0, 1.3, len(flights))
+    price_per_kg = rng.uniform(0.9, 1.7, len(flights))
+    units = rng.integers(0, len(FUEL_UNITS), size=len(flights))
+    for flight, departure, take, kg, price, unit in zip(
+        flights, departures, uplifted.tolist(), burn_kg.tolist(), price_per_kg.tolist(), units.tolist()
+    ):
+        if not take:
+            continue
+        # Jet A is the North American grade
+        fuel_type = FuelType.JET_A if departure[0] in "KC" else FuelType.JET_A1
+        fuel_units = FUEL_UNITS[unit]
+        # Canonical values are computed exactly as FuelPaid.set_canonical_values does
+        quantity = (Decimal(kg) / kg_per_unit(fuel_type, fuel_units)).quantize(Decimal("0.1"))
+        amount = Decimal(kg * price).quantize(Decimal("0.01"))
+        quantity_kg = quantity * kg_per_unit(fuel_type, fuel_units)
+        price_kg = (amount / quantity_kg).quantize(Decimal("0.0001")) if quantity_kg else None
+        rows.append((
+            *flight, fuel_type, fuel_units, quantity, amount,
+            quantity_kg.quantize(Decimal("0.1")), price_kg, now, now,
+        ))
+    return rows
+
+
+def generate_fleet(rows, years=3, seed=0, operators=1, log=None):
+    """
+    Generate roughly ``rows`` rows across all fleet tables and return the
+    number of rows written per model. The aircraft are dealt out in turn to
+    ``operators`` synthetic operators.
+    """
+    rng = np.random.default_rng(seed)
+    log = log or (lambda message: None)
+    flights_total = max(1, int(rows / ROWS_PER_FLIGHT))
+    aircraft_count = max(1, round(flights_total / (FLIGHTS_PER_AIRCRAFT_YEAR * years)))
+    flights_per_aircraft = max(1, flights_total // aircraft_count)
+    days = 365 * years
+    start = timezone.localdate() - timedelta(days=days)
+    now = timezone.now()
+    counts = dict.fromkeys((Aircraft, Engine, Flight, FlightEngineData, FlightExpense, FuelPaid), 0)
+
+    operator_ids = [
+        Operator.objects.get_or_create(name=f"{OPERATOR_PREFIX}{number}")[0].pk
+        for number in range(1, max(1, operators) + 1)
+    ]
+    # Otherwise the history would all land in the default partitions
+    ensure_partitions(start, timezone.localdate())
+    existing = Aircraft.objects.unscoped().filter(serial__startswith=SERIAL_PREFIX).count()
+    for number in range(existing, existing + aircraft_count):
+        profile = FLEET_CATALOGUE[number % len(FLEET_CATALOGUE)]
+        operator_id = operator_ids[number % len(operator_ids)]
+        hours = np.round(rng.uniform(*profile["hours"], size=flights_per_aircraft), 1)
+        with transaction.atomic():
+            aircraft = Aircraft.objects.create(
+                operator_id=operator_id,
+                manufacturer=profile["manufacturer"],
+                aircraft_type=profile["aircraft_type"],
+                model=profile["model"],
+                serial=f"{SERIAL_PREFIX}{number:06d}",
+                registration=f"N{number + 100:d}SY",
+                fuel_flow_unit=profile["fuel_flow_unit"],
+                total_time=Decimal(f"{hours.sum():.1f}"),
+                total_cycles=flights_per_aircraft,
+            )
+            engines = Engine.objects.bulk_create(
+                Engine(
+                    manufacturer=profile["engine_manufacturer"],
+                    engine_type=profile["engine_type"],
+                    model=profile["engine_model"],
+                    serial=f"{SERIAL_PREFIX}{number:06d}-{position}",
+                    aircraft=aircraft,
+                    position=position,
+                    installed_on=start,
+                )
+                for position in range(1, profile["engines"] + 1)
+            )
+            engine_ids = [engine.pk for engine in engines]
+
+            dates = _flight_dates(rng, flights_per_aircraft, start, days)
+            departures, arrivals = _route(rng, flights_per_aircraft)
+            flights = []
+            for offset in range(0, flights_per_aircraft, BATCH_SIZE):
+                created = Flight.objects.bulk_create(
+                    Flight(
+                        aircraft=aircraft,
+                        operator_id=operator_id,
+                        flight_date=dates[index],
+                        departure_airport=departures[index],
+                        arrival_airport=arrivals[index],
+                        hours_flown=f"{hours[index]:.1f}",
+                    )
+                    for index in range(offset, min(offset + BATCH_SIZE, flights_per_aircraft))
+                )
+                flights.extend((flight.pk, flight.flight_date, operator_id) for flight in created)
+
+            counts[Aircraft] += 1
+            counts[Engine] += len(engines)
+            counts[Flight] += len(flights)
+            counts[FlightEngineData] += insert_rows(
+                FlightEngineData, SNAPSHOT_FIELDS, _snapshot_rows(rng, profile, flights, hours, engine_ids, now)
+            )
+            counts[FlightExpense] += insert_rows(FlightExpense, EXPENSE_FIELDS, _expense_rows(rng, flights, now))
+            counts[FuelPaid] += insert_rows(FuelPaid, FUEL_FIELDS, _fuel_rows(rng, profile, flights, departures, hours, now))
+        log(f"Aircraft {aircraft.registration}: {len(flights)} flights")
+
+    log("Reconciling engine counters, rebuilding finance summaries, scoring engine anomalies and forecasting overhauls")
+    reconcile_engine_counters()
+    rebuild_summaries()
+    synthetic_engines = Engine.objects.filter(serial__startswith=SERIAL_PREFIX).values_list("pk", flat=True)
+    rescore_engines(synthetic_engines)
+    refresh_forecasts(engine_ids=list(synthetic_engines))
+    bump_all_data_versions()
+    return counts
+
+
+def clear_fleet():
+    """
+    Delete every synthetic aircraft and engine along with their history, and
+    the synthetic operators left without aircraft or users.
+
+    The per-flight tables are deleted with plain DELETE statements: a regular
+    delete() would load every row to send its post_delete signal, and the
+    summaries those signals maintain go away with the aircraft anyway.
+    """
+    aircraft = Aircraft.objects.unscoped().filter(serial__startswith=SERIAL_PREFIX)
+    flights = Flight.objects.unscoped().filter(aircraft__in=aircraft)
+    with transaction.atomic():
+        EngineDeviation.objects.filter(engine_data__flight__in=flights)._raw_delete(connection.alias)
+        EngineAlert.objects.unscoped().filter(engine_data__flight__in=flights)._raw_delete(connection.alias)
+        TelemetryChunk.objects.filter(recording__flight__in=flights)._raw_delete(connection.alias)
+        TelemetryRecording.objects.unscoped().filter(flight__in=flights)._raw_delete(connection.alias)
+        for model in (FlightEngineData, FlightExpense, FuelPaid):
+            model.objects.unscoped().filter(flight__in=flights)._raw_delete(connection.alias)
+        flights._raw_delete(connection.alias)
+        Engine.objects.filter(serial__startswith=SERIAL_PREFIX).delete()
+        deleted, _ = aircraft.delete()
+        Operator.objects.filter(
+            name__startswith=OPERATOR_PREFIX, aircraft__isnull=True, users__isnull=True,
+        ).delete()
+        bump_all_data_versions()
+    return deleted
@@ -0,0 +1,152 @@
+"""
+Per-request operator (tenant) scoping.
+
+Fleet models carry an ``operator`` key and use OperatorManager, whose
+querysets are filtered to the current operator whenever one is active. An
+operator becomes active when a request authenticates, by JWT (see
+accounts.authentication) or by session (SessionOperatorMiddleware, for the
+admin), and is cleared by OperatorScopeMiddleware once the response is
+done, so queries of one operator only ever touch that operator's index
+range. Code outside a request - management commands, job workers, the admin
+of platform staff - is unscoped unless it enters ``operator_scope``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import models
+from django.db.models import Q
+
+
+# Operator ids start at 1, so this scope matches no rows at all
+NO_OPERATOR = 0
+
+_current_operator = ContextVar("current_operator", default=None)
+
+
+def current_operator_id():
+    """ The id of the active operator, or None when queries are unscoped """
+    return _current_operator.get()
+
+
+def operator_id_for_user(user):
+    """
+    The scope a user's requests run in: their operator, unscoped for staff
+    without one, and no rows for anyone else.
+    """
+    operator_id = getattr(user, "operator_id", None)
+    if operator_id is not None:
+        return operator_id
+    return None if getattr(user, "is_staff", False) else NO_OPERATOR
+
+
+def activate_operator(operator_id):
+    """ Scope the rest of the current request (or context) to one operator """
+    _current_operator.set(operator_id)
+
+
+@contextmanager
+def operator_scope(operator_id):
+    """ Run a block scoped to ``operator_id``, or unscoped when it is None """
+    token = _current_operator.set(operator_id)
+    try:
+        yield
+    finally:
+        _current_operator.reset(token)
+
+
+def operator_filter(lookup="operator_id"):
+    """ A Q restricting ``lookup`` to the active operator; empty when unscoped """
+    operator_id = current_operator_id()
+    return Q() if operator_id is None else Q(**{lookup: operator_id})
+
+
+class OperatorQuerySet(models.QuerySet):
+    """
+    A queryset that scopes itself to the active operator when it is derived.
+
+    Querysets built once at import time, such as a view's ``queryset``
+    attribute, are scoped when a request derives its own copy from them.
+    """
+
+    _operator_scoped = False
+
+    def _chain(self):
+        clone = super()._chain()
+        if not clone._operator_scoped:
+            operator_id = current_operator_id()
+            if operator_id is not None:
+                clone.query.add_q(Q(operator_id=operator_id))
+                clone._operator_scoped = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._operator_scoped = self._operator_scoped
+        return clone
+
+
+class OperatorManager(models.Manager.from_queryset(OperatorQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset()._chain()
+
+    def unscoped(self):
+        """ Every operator's rows, whatever the active scope """
+        queryset = super().get_queryset()
+        queryset._operator_scoped = True
+        return queryset
+
+    def for_operator(self, operator_id):
+        """ One operator's rows, whatever the active scope """
+        return self.unscoped().filter(operator_id=operator_id)
+
+
+class OperatorScopeMiddleware:
+    """ Clear the operator scope around every request, so none survives into the next """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with operator_scope(None):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with operator_scope(None):
+            return await self.get_response(request)
+
+
+class SessionOperatorMiddleware:
+    """
+    Scope requests of session-authenticated users, such as the admin, to
+    their operator. Goes after AuthenticationMiddleware; API requests are
+    scoped by their JWT authentication instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.user.is_authenticated:
+            activate_operator(operator_id_for_user(request.user))
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        user = await request.auser()
+        if user.is_authenticated:
+            activate_operator(operator_id_for_user(user))
+        return await self.get_response(request)
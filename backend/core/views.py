@@ -1,3 +1,42 @@
-from django.shortcuts import render
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
 
-# Create your views here.
+
+class FlightFilterMixin:
+    """
+    Filters a list view's queryset by ``aircraft``, ``start`` and ``end``
+    query parameters. Set aircraft_lookup for models not linked directly
+    to an aircraft.
+    """
+
+    aircraft_lookup = "aircraft_id"
+    date_field = "flight_date"
+
+    def _date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            # Well formed but not a real date, e.g. 2024-02-30
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Must be a date in YYYY-MM-DD format."})
+        return parsed
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        filters = {}
+        aircraft = self.request.query_params.get("aircraft")
+        if aircraft:
+            if not aircraft.isdecimal():
+                raise ValidationError({"aircraft": "Must be an aircraft id."})
+            filters[self.aircraft_lookup] = int(aircraft)
+        start = self._date_param("start")
+        end = self._date_param("end")
+        if start:
+            filters[f"{self.date_field}__gte"] = start
+        if end:
+            filters[f"{self.date_field}__lte"] = end
+        return queryset.filter(**filters)
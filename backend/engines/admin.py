@@ -1,26 +1,49 @@
 from django.contrib import admin
-from .models import Engine
+
+from core.admin import OperatorScopedAdmin
+from .models import Engine, EngineOverhaulForecast
 
 
 @admin.register(Engine)
-class EngineAdmin(admin.ModelAdmin):
+class EngineAdmin(OperatorScopedAdmin):
     model = Engine
+    operator_lookup = "aircraft__operator_id"
 
     # Edit form
     fieldsets = (
         ("Engine Info", {"fields": ("manufacturer", "engine_type", "model", "serial")}),
+        ("Installation", {"fields": ("aircraft", "position", "installed_on")}),
         ("Time Tracking", {"fields": ("time_since_new", "cycles_since_new", "time_since_overhaul", "cycles_since_overhaul")}),
-        ("Maintenance", {"fields": ("time_between_overhauls",)}),
+        ("Maintenance", {"fields": ("time_between_overhauls", "cycles_between_overhauls")}),
     )
 
     # Add form
     add_fieldsets = (
         ("Engine Info", {"fields": ("manufacturer", "engine_type", "model", "serial")}),
+        ("Installation", {"fields": ("aircraft", "position", "installed_on")}),
         ("Time Tracking", {"fields": ("time_since_new", "cycles_since_new", "time_since_overhaul", "cycles_since_overhaul")}),
-        ("Maintenance", {"fields": ("time_between_overhauls",)}),
+        ("Maintenance", {"fields": ("time_between_overhauls", "cycles_between_overhauls")}),
     )
 
-    list_display = ("manufacturer", "engine_type", "model", "serial", "time_since_new", "cycles_since_new", "time_since_overhaul", "cycles_since_overhaul")
+    list_display = ("manufacturer", "engine_type", "model", "serial", "aircraft", "position", "time_since_new", "cycles_since_new", "time_since_overhaul", "cycles_since_overhaul")
     list_filter = ("manufacturer", "engine_type")
     search_fields = ("manufacturer", "model", "serial")
-    ordering = ("manufacturer", "model", "serial")
\ No newline at end of file
+    ordering = ("manufacturer", "model", "serial")
+    list_select_related = ("aircraft",)
+
+
+@admin.register(EngineOverhaulForecast)
+class EngineOverhaulForecastAdmin(admin.ModelAdmin):
+    """ Read-only: forecasts are computed from the flight log (see engines.forecast) """
+
+    list_display = ("engine", "aircraft", "operator", "due_on", "hours_due_on", "cycles_due_on", "hours_per_day", "cycles_per_day", "computed_at")
+    list_filter = ("operator",)
+    search_fields = ("engine__serial", "aircraft__registration")
+    ordering = ("due_on",)
+    list_select_related = ("engine", "aircraft", "operator")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
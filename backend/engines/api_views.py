@@ -0,0 +1,38 @@
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+
+from .forecast import due_forecasts
+from .serializers import EngineOverhaulForecastSerializer
+
+
+DEFAULT_DUE_DAYS = 180
+MAX_DUE_DAYS = 3650
+
+
+class EngineOverhaulDueView(generics.ListAPIView):
+    """
+    Installed engines due for overhaul within ``days`` (default 180),
+    soonest first, overdue engines included. Optionally filtered by
+    ``aircraft``.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = EngineOverhaulForecastSerializer
+
+    def _int_param(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        if not value.isdecimal():
+            raise ValidationError({name: "Must be a whole number."})
+        return int(value)
+
+    def get_queryset(self):
+        days = self._int_param("days", DEFAULT_DUE_DAYS)
+        if days > MAX_DUE_DAYS:
+            raise ValidationError({"days": f"Must be at most {MAX_DUE_DAYS}."})
+        queryset = due_forecasts(days).select_related("engine", "aircraft")
+        aircraft = self._int_param("aircraft")
+        if aircraft is not None:
+            queryset = queryset.filter(aircraft_id=aircraft)
+        return queryset
@@ -0,0 +1,149 @@
+"""
+Overhaul forecasts for installed engines.
+
+Each aircraft's utilization is its hours and cycles per day over the last
+UTILIZATION_WINDOW_DAYS. Every engine's remaining hours and cycles to its
+overhaul limits are projected at its aircraft's rate in one vectorized
+computation across the fleet, and stored in EngineOverhaulForecast. The
+due list is then a range scan on the due date index.
+
+Logging a flight refreshes the forecasts of that aircraft's engines, and
+saving an engine refreshes its own. Utilization also changes as days pass
+without flights, so the whole fleet is refreshed daily as well.
+"""
+from datetime import timedelta
+from functools import partial
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from aircraft.models import Flight
+from .models import Engine, EngineOverhaulForecast
+
+
+UTILIZATION_WINDOW_DAYS = 90
+
+# Projections further out than this are not useful as dates
+MAX_FORECAST_DAYS = 365 * 30
+
+
+def utilization(aircraft_ids=None, today=None):
+    """ Map aircraft id to (hours per day, cycles per day) over the utilization window """
+    today = today or timezone.localdate()
+    flights = Flight.objects.unscoped().filter(
+        flight_date__gt=today - timedelta(days=UTILIZATION_WINDOW_DAYS), flight_date__lte=today,
+    )
+    if aircraft_ids is not None:
+        flights = flights.filter(aircraft_id__in=aircraft_ids)
+    rows = flights.order_by().values("aircraft_id").annotate(hours=Sum("hours_flown"), cycles=Count("id"))
+    return {
+        row["aircraft_id"]: (float(row["hours"] or 0) / UTILIZATION_WINDOW_DAYS, row["cycles"] / UTILIZATION_WINDOW_DAYS)
+        for row in rows
+    }
+
+
+def _due_dates(today, remaining, per_day):
+    """ Dates the remaining amounts run out at the daily rates; None where they never do """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(remaining <= 0, 0.0, np.ceil(remaining / per_day))
+    projected = np.isfinite(days) & (days <= MAX_FORECAST_DAYS)
+    return [today + timedelta(days=int(value)) if ok else None for value, ok in zip(days.tolist(), projected.tolist())]
+
+
+def project(engines, rates, today):
+    """
+    Forecast rows for ``engines``, a list of (engine id, aircraft id,
+    operator id, TSO, TBO hours, CSO, TBO cycles) tuples, at the per-aircraft
+    daily ``rates``.
+    """
+    if not engines:
+        return []
+    engine_ids, aircraft_ids, operator_ids, tso, tbo, cso, cbo = zip(*engines)
+    hours_per_day = np.array([rates.get(pk, (0.0, 0.0))[0] for pk in aircraft_ids])
+    cycles_per_day = np.array([rates.get(pk, (0.0, 0.0))[1] for pk in aircraft_ids])
+
+    hours_remaining = np.array(tbo, dtype=np.float64) - np.array(tso, dtype=np.float64)
+    has_cycle_limit = np.array([limit is not None for limit in cbo])
+    cycles_remaining = np.array([limit or 0 for limit in cbo], dtype=np.float64) - np.array(cso, dtype=np.float64)
+    cycles_remaining = np.where(has_cycle_limit, cycles_remaining, np.inf)
+
+    hours_due = _due_dates(today, hours_remaining, hours_per_day)
+    cycles_due = _due_dates(today, cycles_remaining, cycles_per_day)
+    computed_at = timezone.now()
+    return [
+        EngineOverhaulForecast(
+            engine_id=engine_id,
+            aircraft_id=aircraft_id,
+            operator_id=operator_id,
+            hours_per_day=hours_per_day[index],
+            cycles_per_day=cycles_per_day[index],
+            hours_remaining=tbo[index] - tso[index],
+            cycles_remaining=cbo[index] - cso[index] if cbo[index] is not None else None,
+            hours_due_on=hours_due[index],
+            cycles_due_on=cycles_due[index],
+            due_on=min((due for due in (hours_due[index], cycles_due[index]) if due), default=None),
+            computed_at=computed_at,
+        )
+        for index, (engine_id, aircraft_id, operator_id) in enumerate(zip(engine_ids, aircraft_ids, operator_ids))
+    ]
+
+
+def refresh_forecasts(aircraft_ids=None, engine_ids=None):
+    """
+    Recompute the forecasts of the engines installed on the given aircraft
+    or with the given ids (of every installed engine when both are None),
+    and drop those of engines no longer installed there. Returns the number
+    of forecasts written.
+    """
+    today = timezone.localdate()
+    scope = Q()
+    if aircraft_ids is not None:
+        scope &= Q(aircraft_id__in=aircraft_ids)
+    if engine_ids is not None:
+        scope &= Q(pk__in=engine_ids)
+    engines = list(
+        Engine.objects.filter(scope, aircraft__isnull=False).values_list(
+            "pk", "aircraft_id", "aircraft__operator_id", "time_since_overhaul", "time_between_overhauls",
+            "cycles_since_overhaul", "cycles_between_overhauls",
+        )
+    )
+    rates = utilization({engine[1] for engine in engines} if aircraft_ids or engine_ids else None, today)
+    forecasts = project(engines, rates, today)
+
+    stale = EngineOverhaulForecast.objects.unscoped().filter(
+        Q(engine__aircraft__isnull=True) | ~Q(engine__aircraft_id=F("aircraft_id"))
+    )
+    if aircraft_ids is not None:
+        stale = stale.filter(aircraft_id__in=aircraft_ids)
+    if engine_ids is not None:
+        stale = stale.filter(engine_id__in=engine_ids)
+    with transaction.atomic():
+        stale.delete()
+        EngineOverhaulForecast.objects.bulk_create(
+            forecasts,
+            batch_size=2000,
+            update_conflicts=True,
+            unique_fields=["engine"],
+            update_fields=[
+                "aircraft", "operator", "hours_per_day", "cycles_per_day", "hours_remaining", "cycles_remaining",
+                "hours_due_on", "cycles_due_on", "due_on", "computed_at",
+            ],
+        )
+    return len(forecasts)
+
+
+def refresh_forecasts_on_commit(aircraft_ids=None, engine_ids=None):
+    """ Refresh once the current transaction commits, after the engine counters have moved """
+    transaction.on_commit(partial(refresh_forecasts, aircraft_ids=aircraft_ids, engine_ids=engine_ids))
+
+
+def due_forecasts(within_days, today=None):
+    """ Forecasts of engines due within ``within_days``, soonest first, overdue ones included """
+    today = today or timezone.localdate()
+    return (
+        EngineOverhaulForecast.objects
+        .filter(due_on__lte=today + timedelta(days=within_days))
+        .order_by("due_on", "engine_id")
+    )
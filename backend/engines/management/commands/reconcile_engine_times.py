@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from engines.rollups import reconcile_engine_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute TSN/CSN/TSO/CSO of every installed engine from the flight history"
+
+    def handle(self, *args, **options):
+        updated = reconcile_engine_counters()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {updated} installed engines."))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from engines.forecast import UTILIZATION_WINDOW_DAYS, refresh_forecasts
+
+
+class Command(BaseCommand):
+    help = (
+        f"Project the overhaul due dates of every installed engine from its aircraft's "
+        f"utilization over the last {UTILIZATION_WINDOW_DAYS} days"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--aircraft", type=int, nargs="+", help="Aircraft ids (default: every aircraft)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = refresh_forecasts(aircraft_ids=options["aircraft"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} engine forecasts in {elapsed:.2f}s."))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0008_flightenginedata_engine'),
+        ('engines', '0002_rename_type_engine_engine_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='engine',
+            name='aircraft',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='engines', to='aircraft.aircraft', verbose_name='Installed On Aircraft'),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='csn_at_install',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='cso_at_install',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='installed_on',
+            field=models.DateField(blank=True, help_text='Flights on or after this date count towards the engine', null=True, verbose_name='Installation Date'),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='position',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Engine 1'), (2, 'Engine 2'), (3, 'Engine 3'), (4, 'Engine 4')], null=True),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='tsn_at_install',
+            field=models.DecimalField(decimal_places=1, default=Decimal('0.0'), editable=False, max_digits=7),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='tso_at_install',
+            field=models.DecimalField(decimal_places=1, default=Decimal('0.0'), editable=False, max_digits=6),
+        ),
+        migrations.AddConstraint(
+            model_name='engine',
+            constraint=models.UniqueConstraint(condition=models.Q(('aircraft__isnull', False)), fields=('aircraft', 'position'), name='unique_engine_position'),
+        ),
+    ]
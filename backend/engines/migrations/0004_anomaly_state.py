@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engines', '0003_engine_aircraft_engine_csn_at_install_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='engine',
+            name='anomaly_scored_through',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Highest FlightEngineData id folded into the anomaly state'),
+        ),
+        migrations.AddField(
+            model_name='engine',
+            name='anomaly_state',
+            field=models.BinaryField(default=b'', help_text='Running EWMA and CUSUM state of the monitored parameters (see analytics.anomaly)'),
+        ),
+    ]
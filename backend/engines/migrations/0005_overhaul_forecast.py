@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:55
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('aircraft', '0013_operator_required'),
+        ('engines', '0004_anomaly_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='engine',
+            name='cycles_between_overhauls',
+            field=models.PositiveIntegerField(blank=True, help_text='Cycle limit between overhauls, if the engine has one', null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100000)], verbose_name='TBO (cycles)'),
+        ),
+        migrations.CreateModel(
+            name='EngineOverhaulForecast',
+            fields=[
+                ('engine', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='overhaul_forecast', serialize=False, to='engines.engine')),
+                ('hours_per_day', models.FloatField(verbose_name='Hours per Day')),
+                ('cycles_per_day', models.FloatField(verbose_name='Cycles per Day')),
+                ('hours_remaining', models.DecimalField(decimal_places=1, max_digits=7, verbose_name='Hours Remaining')),
+                ('cycles_remaining', models.IntegerField(blank=True, null=True, verbose_name='Cycles Remaining')),
+                ('hours_due_on', models.DateField(blank=True, null=True, verbose_name='TBO (hours) Due')),
+                ('cycles_due_on', models.DateField(blank=True, null=True, verbose_name='TBO (cycles) Due')),
+                ('due_on', models.DateField(blank=True, help_text='The earlier of the two limits; empty when the aircraft has not flown lately', null=True, verbose_name='Due')),
+                ('computed_at', models.DateTimeField(verbose_name='Computed At')),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='overhaul_forecasts', to='aircraft.aircraft')),
+                ('operator', models.ForeignKey(db_index=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.operator')),
+            ],
+            options={
+                'verbose_name': 'Engine Overhaul Forecast',
+                'verbose_name_plural': 'Engine Overhaul Forecasts',
+                'indexes': [models.Index(fields=['operator', 'due_on', 'engine'], name='overhaul_operator_due_idx'), models.Index(fields=['due_on', 'engine'], name='overhaul_due_idx')],
+            },
+        ),
+    ]
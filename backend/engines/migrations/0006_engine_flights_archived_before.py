@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engines', '0005_overhaul_forecast'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='engine',
+            name='flights_archived_before',
+            field=models.DateField(blank=True, editable=False, help_text='Flights before this date were archived; the installation baseline includes them', null=True),
+        ),
+    ]
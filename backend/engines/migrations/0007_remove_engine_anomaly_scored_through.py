@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0016_flightenginedata_anomaly_scored'),
+        ('engines', '0006_engine_flights_archived_before'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='engine',
+            name='anomaly_scored_through',
+        ),
+    ]
@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from decimal import Decimal
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from core.models import TrackedFieldsMixin
+from core.tenancy import OperatorManager
 
 class EngineManufacturer(models.TextChoices):
     HW = "hw", "Honeywell"
@@ -17,7 +20,21 @@ class EngineType(models.TextChoices):
     TS = "ts", "Turboshaft"
     OT = "ot", "Other"
 
-class Engine(models.Model):
+class EnginePosition(models.IntegerChoices):
+    ONE = 1, "Engine 1"
+    TWO = 2, "Engine 2"
+    THREE = 3, "Engine 3"
+    FOUR = 4, "Engine 4"
+
+class Engine(TrackedFieldsMixin, models.Model):
+    COUNTER_FIELDS = ("time_since_new", "cycles_since_new", "time_since_overhaul", "cycles_since_overhaul")
+    TRACKED_FIELDS = ("aircraft_id", *COUNTER_FIELDS)
+    # Written by flight logging, archiving and anomaly scoring with queries of their own
+    MAINTAINED_FIELDS = (
+        "tsn_at_install", "csn_at_install", "tso_at_install", "cso_at_install",
+        "flights_archived_before", "anomaly_state",
+    )
+
     manufacturer = models.CharField(
         max_length=255, 
         blank=True,
@@ -80,7 +97,200 @@ class Engine(models.Model):
         validators=[MinValueValidator(Decimal("0.0")), MaxValueValidator(Decimal("9999.9"))],
         verbose_name="TBO (hours)",
     )
+    cycles_between_overhauls = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(1), MaxValueValidator(100000)],
+        verbose_name="TBO (cycles)",
+        help_text="Cycle limit between overhauls, if the engine has one",
+    )
+    aircraft = models.ForeignKey(
+        "aircraft.Aircraft",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="engines",
+        verbose_name="Installed On Aircraft",
+    )
+    position = models.PositiveSmallIntegerField(
+        choices=EnginePosition.choices,
+        null=True,
+        blank=True,
+    )
+    installed_on = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Installation Date",
+        help_text="Flights on or after this date count towards the engine",
+    )
+    tsn_at_install = models.DecimalField(
+        max_digits=7,
+        decimal_places=1,
+        default=Decimal("0.0"),
+        editable=False,
+    )
+    csn_at_install = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+    tso_at_install = models.DecimalField(
+        max_digits=6,
+        decimal_places=1,
+        default=Decimal("0.0"),
+        editable=False,
+    )
+    cso_at_install = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+    flights_archived_before = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Flights before this date were archived; the installation baseline includes them",
+    )
+    anomaly_state = models.BinaryField(
+        default=b"",
+        editable=False,
+        help_text="Running EWMA and CUSUM state of the monitored parameters (see analytics.anomaly)",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["aircraft", "position"],
+                condition=models.Q(aircraft__isnull=False),
+                name="unique_engine_position"
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_values", {})
+        with transaction.atomic():
+            edits = self._reload_maintained_fields(loaded)
+
+            if self.aircraft_id and self.aircraft_id != loaded.get("aircraft_id"):
+                # Newly installed: counters accumulate from here on
+                if self.installed_on is None:
+                    self.installed_on = timezone.localdate()
+                self.tsn_at_install = self.time_since_new
+                self.csn_at_install = self.cycles_since_new
+                self.tso_at_install = self.time_since_overhaul
+                self.cso_at_install = self.cycles_since_overhaul
+                self.flights_archived_before = None
+            elif self.aircraft_id and edits is not None:
+                # Hand corrections while installed shift the installation baseline
+                self.tsn_at_install += edits["time_since_new"]
+                self.csn_at_install += edits["cycles_since_new"]
+                self.tso_at_install += edits["time_since_overhaul"]
+                self.cso_at_install += edits["cycles_since_overhaul"]
+            elif not self.aircraft_id:
+                self.position = None
+                self.installed_on = None
+
+            super().save(*args, **kwargs)
+
+    def _reload_maintained_fields(self, loaded):
+        """
+        Lock the row and take the counters and MAINTAINED_FIELDS as they are
+        now, so that a save never writes back values read before a flight was
+        logged. The counters keep the changes made to this instance since it
+        was loaded, which are returned; None for a new or partly loaded row.
+        """
+        if self._state.adding or not all(name in loaded for name in self.COUNTER_FIELDS):
+            return None
+        current = (
+            type(self)._base_manager.select_for_update()
+            .filter(pk=self.pk)
+            .values(*self.COUNTER_FIELDS, *self.MAINTAINED_FIELDS)
+            .first()
+        )
+        if current is None:
+            return None
+        values = self.tracked_values()
+        edits = {}
+        for name in self.COUNTER_FIELDS:
+            edits[name] = values[name] - loaded[name]
+            setattr(self, name, current[name] + edits[name])
+        for name in self.MAINTAINED_FIELDS:
+            setattr(self, name, current[name])
+        return edits
 
     def __str__(self):
         return f"{self.manufacturer} {self.model} {self.serial}"
 
+
+
+# ============================
+# OVERHAUL FORECAST MODEL
+# ============================
+
+class EngineOverhaulForecast(models.Model):
+    """ When an installed engine reaches its overhaul limits at its aircraft's recent utilization """
+
+    engine = models.OneToOneField(
+        Engine,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="overhaul_forecast",
+    )
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+        help_text="Copy of the aircraft's operator",
+    )
+    aircraft = models.ForeignKey(
+        "aircraft.Aircraft",
+        on_delete=models.CASCADE,
+        related_name="overhaul_forecasts",
+    )
+    hours_per_day = models.FloatField(
+        verbose_name="Hours per Day",
+    )
+    cycles_per_day = models.FloatField(
+        verbose_name="Cycles per Day",
+    )
+    hours_remaining = models.DecimalField(
+        max_digits=7,
+        decimal_places=1,
+        verbose_name="Hours Remaining",
+    )
+    cycles_remaining = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Cycles Remaining",
+    )
+    hours_due_on = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="TBO (hours) Due",
+    )
+    cycles_due_on = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="TBO (cycles) Due",
+    )
+    due_on = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Due",
+        help_text="The earlier of the two limits; empty when the aircraft has not flown lately",
+    )
+    computed_at = models.DateTimeField(
+        verbose_name="Computed At",
+    )
+
+    objects = OperatorManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["operator", "due_on", "engine"], name="overhaul_operator_due_idx"),
+            models.Index(fields=["due_on", "engine"], name="overhaul_due_idx"),
+        ]
+        verbose_name = "Engine Overhaul Forecast"
+        verbose_name_plural = "Engine Overhaul Forecasts"
+
+    def __str__(self):
+        return f"{self.engine} due {self.due_on or 'not projected'}"
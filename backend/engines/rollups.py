@@ -0,0 +1,111 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from aircraft.models import Flight
+from .models import Engine
+
+
+def apply_flight_to_engines(aircraft_id, flight_date, hours, cycles):
+    """
+    Add (or with negative values, remove) one flight's hours and cycles to the
+    engines installed on the aircraft at the flight date, in one UPDATE.
+    """
+    if not hours and not cycles:
+        return 0
+    hours = Decimal(hours)
+    engines = Engine.objects.filter(aircraft_id=aircraft_id).filter(
+        Q(installed_on__isnull=True) | Q(installed_on__lte=flight_date)
+    )
+    zero_hours = Value(Decimal("0.0"))
+    return engines.update(
+        time_since_new=Greatest(F("time_since_new") + hours, zero_hours),
+        cycles_since_new=Greatest(F("cycles_since_new") + cycles, Value(0)),
+        time_since_overhaul=Greatest(F("time_since_overhaul") + hours, zero_hours),
+        cycles_since_overhaul=Greatest(F("cycles_since_overhaul") + cycles, Value(0)),
+    )
+
+
+def apply_flights_to_engines(aircraft_id, flights):
+    """
+    Add many new flights of one aircraft, as (flight date, hours) pairs, to
+    the engines installed at each flight date, in one UPDATE per engine.
+    """
+    updated = 0
+    for engine_id, installed_on in Engine.objects.filter(aircraft_id=aircraft_id).values_list("pk", "installed_on"):
+        counted = [Decimal(hours) for flight_date, hours in flights if installed_on is None or installed_on <= flight_date]
+        if not counted:
+            continue
+        hours, cycles = sum(counted), len(counted)
+        updated += Engine.objects.filter(pk=engine_id).update(
+            time_since_new=F("time_since_new") + hours,
+            cycles_since_new=F("cycles_since_new") + cycles,
+            time_since_overhaul=F("time_since_overhaul") + hours,
+            cycles_since_overhaul=F("cycles_since_overhaul") + cycles,
+        )
+    return updated
+
+
+def _flown_since_baseline(before=None):
+    """
+    Hours and cycles logged on an engine's aircraft since its installation
+    and since its archived flights (and before ``before``, if given), as
+    expressions over the engine row.
+    """
+    flown = Flight.objects.unscoped().filter(
+        aircraft=OuterRef("aircraft"),
+        flight_date__gte=Greatest(
+            Coalesce(OuterRef("installed_on"), Value(date.min)),
+            Coalesce(OuterRef("flights_archived_before"), Value(date.min)),
+        ),
+    )
+    if before is not None:
+        flown = flown.filter(flight_date__lt=before)
+    flown = flown.order_by().values("aircraft")
+    hours = Coalesce(
+        Subquery(flown.annotate(total=Sum("hours_flown")).values("total")),
+        Value(Decimal("0.0")),
+        output_field=DecimalField(max_digits=7, decimal_places=1),
+    )
+    cycles = Coalesce(
+        Subquery(flown.annotate(total=Count("id")).values("total")),
+        Value(0),
+        output_field=IntegerField(),
+    )
+    return hours, cycles
+
+
+def reconcile_engine_counters():
+    """
+    Recompute the counters of every installed engine from its installation
+    baseline plus all flights logged on its aircraft since installation.
+    Runs as a single set-based UPDATE.
+    """
+    hours, cycles = _flown_since_baseline()
+    return Engine.objects.filter(aircraft__isnull=False).update(
+        time_since_new=F("tsn_at_install") + hours,
+        cycles_since_new=F("csn_at_install") + cycles,
+        time_since_overhaul=F("tso_at_install") + hours,
+        cycles_since_overhaul=F("cso_at_install") + cycles,
+    )
+
+
+def fold_flights_into_baselines(before):
+    """
+    Add the flights logged before ``before`` to the installation baselines of
+    the engines they count towards, so reconcile_engine_counters gives the
+    same counters once those flights are archived. One UPDATE.
+    """
+    hours, cycles = _flown_since_baseline(before)
+    return Engine.objects.filter(
+        Q(flights_archived_before__isnull=True) | Q(flights_archived_before__lt=before),
+        aircraft__isnull=False,
+    ).update(
+        tsn_at_install=F("tsn_at_install") + hours,
+        csn_at_install=F("csn_at_install") + cycles,
+        tso_at_install=F("tso_at_install") + hours,
+        cso_at_install=F("cso_at_install") + cycles,
+        flights_archived_before=before,
+    )
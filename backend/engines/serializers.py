@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import EngineOverhaulForecast
+
+
+class EngineOverhaulForecastSerializer(serializers.ModelSerializer):
+    serial = serializers.CharField(source="engine.serial", read_only=True)
+    registration = serializers.CharField(source="aircraft.registration", read_only=True)
+
+    class Meta:
+        model = EngineOverhaulForecast
+        exclude = ["operator"]
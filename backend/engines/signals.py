@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from aircraft.models import Flight
+from .forecast import refresh_forecasts_on_commit
+from .models import Engine
+from .rollups import apply_flight_to_engines
+
+
+@receiver(post_save, sender=Flight)
+def roll_flight_into_engines(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    current = instance.tracked_values()
+    if not created and previous is not None:
+        if previous == current:
+            return
+        apply_flight_to_engines(previous["aircraft_id"], previous["flight_date"], -previous["hours_flown"], -1)
+    apply_flight_to_engines(current["aircraft_id"], current["flight_date"], current["hours_flown"], 1)
+
+
+@receiver(post_delete, sender=Flight)
+def roll_flight_out_of_engines(sender, instance, **kwargs):
+    current = instance.tracked_values()
+    apply_flight_to_engines(current["aircraft_id"], current["flight_date"], -current["hours_flown"], -1)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def refresh_aircraft_forecasts(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_values", None) or {}
+    aircraft_ids = {instance.aircraft_id, previous.get("aircraft_id")} - {None}
+    refresh_forecasts_on_commit(aircraft_ids=aircraft_ids)
+
+
+@receiver(post_save, sender=Engine)
+def refresh_engine_forecast(sender, instance, **kwargs):
+    refresh_forecasts_on_commit(engine_ids=[instance.pk])
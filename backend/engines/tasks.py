@@ -0,0 +1,13 @@
+from jobs.registry import task
+from .forecast import refresh_forecasts
+from .rollups import reconcile_engine_counters as reconcile
+
+
+@task()
+def reconcile_engine_counters():
+    return {"engines": reconcile()}
+
+
+@task()
+def refresh_overhaul_forecasts():
+    return {"forecasts": refresh_forecasts()}
@@ -0,0 +1,6 @@
+from django.urls import path
+from .api_views import EngineOverhaulDueView
+
+urlpatterns = [
+    path("overhauls/due/", EngineOverhaulDueView.as_view(), name="engine_overhauls_due"),
+]
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import FlightExpense, FuelPaid
+from core.paginator import EstimatedCountPaginator
+from .models import FlightExpense, FuelPaid, MonthlyExpenseSummary, MonthlyFuelSummary
 
 
 @admin.register(FlightExpense)
@@ -11,22 +12,24 @@ class FlightExpenseAdmin(admin.ModelAdmin):
             "fields": ("flight",)
         }),
         ("Expense Details", {
-            "fields": ("expense_type", "expense_amount", "payment_method")
+            "fields": ("expense_type", "expense_amount", "payment_method", "merchant")
         }),
         ("Additional Information", {
             "fields": ("notes",),
             "classes": ("collapse",)
         }),
         ("System Information", {
-            "fields": ("created_at", "updated_at"),
+            "fields": ("fingerprint", "created_at", "updated_at"),
             "classes": ("collapse",)
         }),
     )
 
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("fingerprint", "created_at", "updated_at")
+    raw_id_fields = ("flight",)
 
     list_display = (
         "flight",
+        "flight_date",
         "get_expense_type_display",
         "expense_amount",
         "get_payment_method_display",
@@ -35,17 +38,20 @@ class FlightExpenseAdmin(admin.ModelAdmin):
     list_filter = (
         "expense_type",
         "payment_method",
-        "flight__aircraft__registration",
-        "flight__flight_date",
+        "flight__aircraft",
+        "flight_date",
     )
+    list_select_related = ("flight__aircraft",)
     search_fields = (
         "flight__aircraft__registration",
         "flight__aircraft__model",
         "flight__aircraft__serial",
+        "merchant",
         "notes",
     )
-    date_hierarchy = "flight__flight_date"
-    ordering = ("-flight__flight_date",)
+    ordering = ("-flight_date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_expense_type_display(self, obj):
         return obj.get_expense_type_display()
@@ -63,32 +69,62 @@ class FuelPaidAdmin(admin.ModelAdmin):
     fieldsets = (
         ("Flight Information", {"fields": ("flight",)}),
         ("Fuel Details", {"fields": ("fuel_type", "fuel_units", "fuel_quantity", "amount_paid")}),
+        ("Canonical Values", {"fields": ("fuel_quantity_kg", "price_per_kg")}),
         ("System Information", {
             "fields": ("created_at", "updated_at"),
             "classes": ("collapse",),
         }),
     )
 
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("fuel_quantity_kg", "price_per_kg", "created_at", "updated_at")
+    raw_id_fields = ("flight",)
 
     list_display = (
         "flight",
+        "flight_date",
         "fuel_type",
         "fuel_units",
         "fuel_quantity",
         "amount_paid",
+        "price_per_kg",
         "created_at",
     )
     list_filter = (
         "fuel_type",
         "fuel_units",
-        "flight__aircraft__registration",
-        "flight__flight_date",
+        "flight__aircraft",
+        "flight_date",
     )
+    list_select_related = ("flight__aircraft",)
     search_fields = (
         "flight__aircraft__registration",
         "flight__departure_airport",
         "flight__arrival_airport",
     )
-    date_hierarchy = "flight__flight_date"
-    ordering = ("-flight__flight_date",)
+    ordering = ("-flight_date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(MonthlyExpenseSummary)
+class MonthlyExpenseSummaryAdmin(admin.ModelAdmin):
+    model = MonthlyExpenseSummary
+
+    list_display = ("aircraft", "month", "expense_type", "total_amount", "entry_count")
+    list_filter = ("expense_type", "aircraft")
+    date_hierarchy = "month"
+    ordering = ("-month",)
+    list_select_related = ("aircraft",)
+    readonly_fields = ("aircraft", "month", "expense_type", "total_amount", "entry_count")
+
+
+@admin.register(MonthlyFuelSummary)
+class MonthlyFuelSummaryAdmin(admin.ModelAdmin):
+    model = MonthlyFuelSummary
+
+    list_display = ("aircraft", "month", "fuel_type", "total_amount", "entry_count")
+    list_filter = ("fuel_type", "aircraft")
+    date_hierarchy = "month"
+    ordering = ("-month",)
+    list_select_related = ("aircraft",)
+    readonly_fields = ("aircraft", "month", "fuel_type", "total_amount", "entry_count")
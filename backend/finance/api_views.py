@@ -0,0 +1,249 @@
+from django.db.models import Count, F, Max, Min, Sum
+from django.utils.dateparse import parse_date
+from rest_framework import generics, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.models import Operator
+from aircraft.parsers import iter_csv_rows
+from core.cache import versioned_response
+from core.exports import EXPORT_FORMATS, Column, export_response
+from core.pagination import KeysetPagination
+from core.routers import replica_reads
+from core.tenancy import current_operator_id, operator_scope
+from core.views import FlightFilterMixin
+from .models import (
+    ExpenseType, FlightExpense, FuelPaid, FuelType, FuelUnits, MonthlyExpenseSummary, MonthlyFuelSummary,
+    PaymentMethod,
+)
+from .serializers import FlightExpenseSerializer, FuelPaidSerializer
+from .statements import import_statement
+
+
+def _parse_date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"'{name}' must be a date in YYYY-MM-DD format.")
+    return parsed
+
+
+def _parse_month_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(f"{value}-01")
+    if parsed is None:
+        raise ValueError(f"'{name}' must be a month in YYYY-MM format.")
+    return parsed
+
+
+def _parse_aircraft_param(request):
+    value = request.query_params.get("aircraft")
+    if not value:
+        return None
+    if not value.isdecimal():
+        raise ValueError("'aircraft' must be an aircraft id.")
+    return int(value)
+
+
+class FinanceSummaryView(APIView):
+    """ Monthly spend per aircraft by expense type and fuel type, read from the summary tables """
+    permission_classes = [IsAuthenticated]
+
+    @versioned_response()
+    def get(self, request):
+        try:
+            aircraft_id = _parse_aircraft_param(request)
+            start = _parse_month_param(request, "start")
+            end = _parse_month_param(request, "end")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {}
+        if aircraft_id is not None:
+            filters["aircraft_id"] = aircraft_id
+        if start:
+            filters["month__gte"] = start
+        if end:
+            filters["month__lte"] = end
+
+        fields = ("aircraft_id", "month", "total_amount", "entry_count")
+        expenses = MonthlyExpenseSummary.objects.filter(**filters).values(*fields, "expense_type")
+        fuel = MonthlyFuelSummary.objects.filter(**filters).values(*fields, "fuel_type")
+        return Response({
+            "expenses": list(expenses.order_by("month", "aircraft_id", "expense_type")),
+            "fuel": list(fuel.order_by("month", "aircraft_id", "fuel_type")),
+        })
+
+
+class FuelPriceView(APIView):
+    """ Fuel price statistics per departure airport or fuel type, aggregated in SQL """
+    permission_classes = [IsAuthenticated]
+
+    GROUPINGS = {
+        "airport": F("flight__departure_airport"),
+        "fuel_type": F("fuel_type"),
+    }
+
+    @versioned_response(per_aircraft=False)
+    def get(self, request):
+        group = request.query_params.get("group", "airport")
+        if group not in self.GROUPINGS:
+            return Response(
+                {"detail": f"'group' must be one of: {', '.join(self.GROUPINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            start = _parse_date_param(request, "start")
+            end = _parse_date_param(request, "end")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        uplifts = FuelPaid.objects.filter(price_per_kg__isnull=False)
+        if request.query_params.get("fuel_type"):
+            uplifts = uplifts.filter(fuel_type=request.query_params["fuel_type"])
+        if start:
+            uplifts = uplifts.filter(flight_date__gte=start)
+        if end:
+            uplifts = uplifts.filter(flight_date__lte=end)
+
+        rows = (
+            uplifts
+            .order_by()
+            .values(key=self.GROUPINGS[group])
+            .annotate(
+                uplifts=Count("id"),
+                total_kg=Sum("fuel_quantity_kg"),
+                total_paid=Sum("amount_paid"),
+                min_price_per_kg=Min("price_per_kg"),
+                max_price_per_kg=Max("price_per_kg"),
+            )
+            .order_by("key")
+        )
+        return Response({
+            "group": group,
+            "results": [
+                {**row, "avg_price_per_kg": row["total_paid"] / row["total_kg"] if row["total_kg"] else None}
+                for row in rows
+            ],
+        })
+
+
+class FlightExpenseListView(FlightFilterMixin, generics.ListAPIView):
+    """ Flight expenses newest first, paged by keyset cursor """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = FlightExpenseSerializer
+    queryset = FlightExpense.objects.select_related("flight")
+    aircraft_lookup = "flight__aircraft_id"
+
+
+class FuelPaidListView(FlightFilterMixin, generics.ListAPIView):
+    """ Fuel uplifts newest first, paged by keyset cursor """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = FuelPaidSerializer
+    queryset = FuelPaid.objects.select_related("flight")
+    aircraft_lookup = "flight__aircraft_id"
+
+
+class StatementImportView(APIView):
+    """
+    Import a card statement CSV as flight expenses.
+
+    Multipart upload of a ``file`` with ``date``, ``amount`` and ``merchant``
+    columns (optionally ``aircraft``, ``category`` and ``description``), plus
+    the ``payment_method`` of the card (default CREDIT_CARD) and an optional
+    ``aircraft`` registration for statements of a single aircraft. Staff
+    without an operator must name the ``operator`` (id) the statement is
+    for. Lines imported before are skipped and counted as duplicates.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "No file uploaded."}, status=status.HTTP_400_BAD_REQUEST)
+        payment_method = request.data.get("payment_method") or PaymentMethod.CREDIT_CARD
+        if payment_method not in PaymentMethod.values:
+            return Response(
+                {"detail": f"'payment_method' must be one of: {', '.join(PaymentMethod.values)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        operator_id = current_operator_id()
+        if operator_id is None:
+            operator_id = request.data.get("operator", "")
+            if not operator_id.isdecimal() or not Operator.objects.filter(pk=int(operator_id)).exists():
+                return Response(
+                    {"detail": "'operator' must be the id of the operator the statement is for."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        with operator_scope(int(operator_id)):
+            report = import_statement(iter_csv_rows(upload), payment_method, request.data.get("aircraft"))
+        return Response(report.as_dict())
+
+
+class ExportView(FlightFilterMixin, generics.GenericAPIView):
+    """
+    Streams every matching row, oldest first, as CSV or XLSX, in constant
+    memory. Filters by ``aircraft``, ``start`` and ``end`` like the list views.
+    """
+    permission_classes = [IsAuthenticated]
+    aircraft_lookup = "flight__aircraft_id"
+    columns = ()
+    filename = "export"
+    title = "Export"
+
+    def get(self, request, file_format):
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"Export format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        # Walks the (flight_date, id) index, so rows start flowing at once
+        queryset = self.filter_queryset(self.get_queryset()).order_by("flight_date", "id")
+        with replica_reads():
+            # Bound now, since the rows are only read once the response streams
+            queryset = queryset.using(queryset.db)
+        return export_response(request, queryset, self.columns, file_format, self.filename, self.title)
+
+
+class FlightExpenseExportView(ExportView):
+    queryset = FlightExpense.objects.all()
+    filename = "flight-expenses"
+    title = "Flight Expenses"
+    columns = (
+        Column("ID", "id"),
+        Column("Date", "flight_date"),
+        Column("Aircraft", "flight__aircraft__registration"),
+        Column("From", "flight__departure_airport"),
+        Column("To", "flight__arrival_airport"),
+        Column("Expense Type", "expense_type", ExpenseType.choices),
+        Column("Payment Method", "payment_method", PaymentMethod.choices),
+        Column("Amount (USD)", "expense_amount"),
+        Column("Notes", "notes"),
+    )
+
+
+class FuelPaidExportView(ExportView):
+    queryset = FuelPaid.objects.all()
+    filename = "fuel-paid"
+    title = "Fuel Paid"
+    columns = (
+        Column("ID", "id"),
+        Column("Date", "flight_date"),
+        Column("Aircraft", "flight__aircraft__registration"),
+        Column("Airport", "flight__departure_airport"),
+        Column("Fuel Type", "fuel_type", FuelType.choices),
+        Column("Quantity", "fuel_quantity"),
+        Column("Units", "fuel_units", FuelUnits.choices),
+        Column("Quantity (kg)", "fuel_quantity_kg"),
+        Column("Amount Paid (USD)", "amount_paid"),
+        Column("Price (USD/kg)", "price_per_kg"),
+    )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Max, Min, Value, When
+from django.db.models.functions import NullIf, Round
+
+from core.cache import bump_all_data_versions
+from finance.models import FuelPaid, FuelType, FuelUnits, kg_per_unit
+
+
+def _kg_factor():
+    """ SQL expression giving kilograms per entered unit for each (type, units) pair """
+    return Case(
+        *(
+            When(fuel_type=fuel_type, fuel_units=fuel_units, then=Value(kg_per_unit(fuel_type, fuel_units)))
+            for fuel_type in FuelType.values
+            for fuel_units in FuelUnits.values
+        ),
+        output_field=DecimalField(max_digits=12, decimal_places=9),
+    )
+
+
+class Command(BaseCommand):
+    help = "Backfill canonical fuel quantity (kg) and price per kg on existing FuelPaid rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Primary key range per UPDATE")
+        parser.add_argument("--all", action="store_true", help="Recompute rows that already have values")
+
+    def handle(self, *args, **options):
+        rows = FuelPaid.objects.all()
+        if not options["all"]:
+            rows = rows.filter(fuel_quantity_kg__isnull=True)
+        bounds = rows.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            self.stdout.write(self.style.SUCCESS("Nothing to backfill."))
+            return
+
+        quantity_kg = F("fuel_quantity") * _kg_factor()
+        updated = 0
+        for start in range(bounds["low"], bounds["high"] + 1, options["batch_size"]):
+            with transaction.atomic():
+                updated += rows.filter(pk__gte=start, pk__lt=start + options["batch_size"]).update(
+                    fuel_quantity_kg=Round(quantity_kg, 1),
+                    price_per_kg=Round(F("amount_paid") / NullIf(quantity_kg, Value(0)), 4),
+                )
+            self.stdout.write(f"Backfilled {updated} rows", ending="\r")
+        bump_all_data_versions()
+        self.stdout.write(self.style.SUCCESS(f"\nBackfilled {updated} fuel uplifts."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Operator
+from aircraft.parsers import iter_csv_rows
+from core.tenancy import operator_scope
+from finance.models import PaymentMethod
+from finance.statements import import_statement
+
+
+class Command(BaseCommand):
+    help = "Import a card statement CSV as flight expenses, skipping lines imported before"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Statement CSV with date, amount and merchant columns")
+        parser.add_argument(
+            "--payment-method", choices=PaymentMethod.values, default=PaymentMethod.CREDIT_CARD,
+            help="Payment method of the card",
+        )
+        parser.add_argument("--aircraft", help="Registration for lines without an aircraft column")
+        parser.add_argument(
+            "--operator", required=True,
+            help="Name or id of the operator whose aircraft the statement is for",
+        )
+
+    def handle(self, *args, **options):
+        operator = Operator.objects.filter(name=options["operator"]).first()
+        if operator is None and options["operator"].isdecimal():
+            operator = Operator.objects.filter(pk=options["operator"]).first()
+        if operator is None:
+            raise CommandError(f"No operator '{options['operator']}'.")
+        try:
+            with open(options["path"], "rb") as statement, operator_scope(operator.pk):
+                report = import_statement(iter_csv_rows(statement), options["payment_method"], options["aircraft"])
+        except OSError as exc:
+            raise CommandError(exc)
+        for rejection in report.rejections:
+            self.stdout.write(f"Line {rejection['row']}: {rejection['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.accepted} expenses; {report.duplicates} already imported, {report.rejected} rejected."
+        ))
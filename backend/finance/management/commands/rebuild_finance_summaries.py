@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from finance.rollups import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly expense and fuel summary tables from scratch"
+
+    def handle(self, *args, **options):
+        for summary_model, count in rebuild_summaries().items():
+            self.stdout.write(f"{summary_model._meta.verbose_name_plural}: {count} rows")
+        self.stdout.write(self.style.SUCCESS("Finance summaries rebuilt."))
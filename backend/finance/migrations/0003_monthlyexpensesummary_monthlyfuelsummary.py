@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0009_aircraftutilizationdelta'),
+        ('finance', '0002_fuelpaid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyExpenseSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('expense_type', models.CharField(choices=[('FBO', 'FBO'), ('FUEL', 'Fuel'), ('HOTEL', 'Hotel'), ('MAINTENANCE', 'Maintenance'), ('MEAL', 'Meal'), ('PARKING', 'Parking'), ('TAXI', 'Taxi'), ('OTHER', 'Other')], max_length=20)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Amount (USD)')),
+                ('entry_count', models.IntegerField(default=0)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expense_summaries', to='aircraft.aircraft', verbose_name='Aircraft')),
+            ],
+            options={
+                'verbose_name': 'Monthly Expense Summary',
+                'verbose_name_plural': 'Monthly Expense Summaries',
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('aircraft', 'month', 'expense_type'), name='unique_monthly_expense_summary')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyFuelSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('fuel_type', models.CharField(choices=[('JET_A', 'Jet A'), ('JET_A1', 'Jet A-1'), ('JET_B', 'Jet B'), ('AVGAS', 'Avgas')], max_length=20)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Amount (USD)')),
+                ('entry_count', models.IntegerField(default=0)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fuel_summaries', to='aircraft.aircraft', verbose_name='Aircraft')),
+            ],
+            options={
+                'verbose_name': 'Monthly Fuel Summary',
+                'verbose_name_plural': 'Monthly Fuel Summaries',
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('aircraft', 'month', 'fuel_type'), name='unique_monthly_fuel_summary')],
+            },
+        ),
+    ]
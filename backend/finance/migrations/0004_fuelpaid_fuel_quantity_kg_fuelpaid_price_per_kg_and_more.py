@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0009_aircraftutilizationdelta'),
+        ('finance', '0003_monthlyexpensesummary_monthlyfuelsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fuelpaid',
+            name='fuel_quantity_kg',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=9, null=True, verbose_name='Quantity (kg)'),
+        ),
+        migrations.AddField(
+            model_name='fuelpaid',
+            name='price_per_kg',
+            field=models.DecimalField(blank=True, decimal_places=4, editable=False, max_digits=12, null=True, verbose_name='Price (USD/kg)'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['fuel_type', 'price_per_kg'], name='fuel_paid_type_price_idx'),
+        ),
+    ]
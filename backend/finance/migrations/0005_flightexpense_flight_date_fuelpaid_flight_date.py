@@ -0,0 +1,62 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_flight_dates(apps, schema_editor):
+    Flight = apps.get_model('aircraft', 'Flight')
+    flight_date = Subquery(Flight.objects.filter(pk=OuterRef('flight_id')).values('flight_date')[:1])
+    for model_name in ('FlightExpense', 'FuelPaid'):
+        apps.get_model('finance', model_name).objects.update(flight_date=flight_date)
+
+
+FLIGHT_DATE_HELP = "Copy of the flight's date, kept for date-ordered scans without a join"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0010_flight_date_indexes_flightenginedata_flight_date'),
+        ('finance', '0004_fuelpaid_fuel_quantity_kg_fuelpaid_price_per_kg_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='flightexpense',
+            options={'ordering': ['-flight_date', '-id'], 'verbose_name': 'Flight Expense', 'verbose_name_plural': 'Flight Expenses'},
+        ),
+        migrations.AlterModelOptions(
+            name='fuelpaid',
+            options={'ordering': ['-flight_date', '-id'], 'verbose_name': 'Fuel Paid', 'verbose_name_plural': 'Fuel Paid'},
+        ),
+        migrations.AddField(
+            model_name='flightexpense',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text=FLIGHT_DATE_HELP, null=True),
+        ),
+        migrations.AddField(
+            model_name='fuelpaid',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text=FLIGHT_DATE_HELP, null=True),
+        ),
+        migrations.RunPython(copy_flight_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='flightexpense',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text=FLIGHT_DATE_HELP),
+        ),
+        migrations.AlterField(
+            model_name='fuelpaid',
+            name='flight_date',
+            field=models.DateField(editable=False, help_text=FLIGHT_DATE_HELP),
+        ),
+        migrations.AddIndex(
+            model_name='flightexpense',
+            index=models.Index(fields=['flight_date', 'id'], name='flight_expense_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['flight_date', 'id'], name='fuel_paid_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0011_flightenginedata_engine_data_altitude_idx'),
+        ('finance', '0005_flightexpense_flight_date_fuelpaid_flight_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flightexpense',
+            index=models.Index(fields=['expense_type', 'flight_date', 'id'], name='flight_expense_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['fuel_type', 'flight_date', 'id'], name='fuel_paid_type_date_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_flightexpense_flight_expense_type_date_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flightexpense',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of the statement line this expense was imported from; empty for manual entries', max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='flightexpense',
+            name='merchant',
+            field=models.CharField(blank=True, default='', help_text='Merchant as printed on the card statement', max_length=255),
+        ),
+    ]
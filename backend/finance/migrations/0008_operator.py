@@ -0,0 +1,69 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+DEFAULT_OPERATOR = 'Default operator'
+
+
+def assign_default_operator(apps, schema_editor):
+    # Follows the flights and aircraft, which all went to the default operator
+    if not apps.get_model('aircraft', 'Aircraft').objects.exists():
+        return
+    operator, _ = apps.get_model('accounts', 'Operator').objects.get_or_create(name=DEFAULT_OPERATOR)
+    for model_name in ('FlightExpense', 'FuelPaid', 'MonthlyExpenseSummary', 'MonthlyFuelSummary'):
+        apps.get_model('finance', model_name).objects.update(operator=operator)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('aircraft', '0013_operator_required'),
+        ('finance', '0007_flightexpense_merchant_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='flightexpense',
+            name='flight_expense_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='flightexpense',
+            name='flight_expense_type_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='fuelpaid',
+            name='fuel_paid_type_price_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='fuelpaid',
+            name='fuel_paid_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='fuelpaid',
+            name='fuel_paid_type_date_idx',
+        ),
+        migrations.AddField(
+            model_name='flightexpense',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AddField(
+            model_name='fuelpaid',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AddField(
+            model_name='monthlyexpensesummary',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AddField(
+            model_name='monthlyfuelsummary',
+            name='operator',
+            field=models.ForeignKey(db_index=False, null=True, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.RunPython(assign_default_operator, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0008 so that the rows it filled are committed before the
+    # tables are altered (PostgreSQL refuses while FK checks are pending)
+
+    dependencies = [
+        ('finance', '0008_operator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flightexpense',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='fuelpaid',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='monthlyexpensesummary',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='monthlyfuelsummary',
+            name='operator',
+            field=models.ForeignKey(db_index=False, editable=False, help_text="Copy of the aircraft's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator'),
+        ),
+        migrations.AlterField(
+            model_name='flightexpense',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of the statement line this expense was imported from; empty for manual entries', max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='flightexpense',
+            index=models.Index(fields=['operator', 'flight_date', 'id'], name='expense_operator_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightexpense',
+            index=models.Index(fields=['operator', 'expense_type', 'flight_date', 'id'], name='expense_operator_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['operator', 'fuel_type', 'price_per_kg'], name='fuel_operator_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['operator', 'flight_date', 'id'], name='fuel_operator_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelpaid',
+            index=models.Index(fields=['operator', 'fuel_type', 'flight_date', 'id'], name='fuel_operator_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monthlyexpensesummary',
+            index=models.Index(fields=['operator', 'month'], name='expense_summary_operator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monthlyfuelsummary',
+            index=models.Index(fields=['operator', 'month'], name='fuel_summary_operator_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='flightexpense',
+            constraint=models.UniqueConstraint(fields=('operator', 'fingerprint'), name='unique_flight_expense_fingerprint'),
+        ),
+    ]
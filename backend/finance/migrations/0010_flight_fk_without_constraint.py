@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft', '0014_flight_fk_without_constraint'),
+        ('finance', '0009_operator_required'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flightexpense',
+            name='flight',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='expenses', to='aircraft.flight', verbose_name='Flight'),
+        ),
+        migrations.AlterField(
+            model_name='fuelpaid',
+            name='flight',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='fuel_paid', to='aircraft.flight', verbose_name='Flight'),
+        ),
+    ]
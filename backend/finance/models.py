@@ -1,5 +1,8 @@
+from decimal import Decimal
 from django.db import models
-from aircraft.models import Flight
+from aircraft.models import Aircraft, Flight
+from core.models import TrackedFieldsMixin
+from core.tenancy import OperatorManager
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -38,15 +41,55 @@ class FuelType(models.TextChoices):
     AVGAS = "AVGAS", "Avgas"
 
 
-class FlightExpense(models.Model):
+# Typical densities at 15 °C, used to convert volumetric uplifts to mass
+FUEL_DENSITY_KG_PER_LITER = {
+    FuelType.JET_A: Decimal("0.804"),
+    FuelType.JET_A1: Decimal("0.804"),
+    FuelType.JET_B: Decimal("0.765"),
+    FuelType.AVGAS: Decimal("0.721"),
+}
+LITERS_PER_GALLON = Decimal("3.785411784")
+KG_PER_POUND = Decimal("0.45359237")
+
+
+def kg_per_unit(fuel_type, fuel_units):
+    """ Kilograms in one unit of fuel_units of the given fuel type """
+    if fuel_units == FuelUnits.KILOGRAMS:
+        return Decimal("1")
+    if fuel_units == FuelUnits.POUNDS:
+        return KG_PER_POUND
+    density = FUEL_DENSITY_KG_PER_LITER[fuel_type]
+    if fuel_units == FuelUnits.GALLONS:
+        return LITERS_PER_GALLON * density
+    return density
+
+
+class FlightExpense(TrackedFieldsMixin, models.Model):
     """" A model to record expenses for a flight """
-    
+
+    TRACKED_FIELDS = ("flight_id", "expense_type", "expense_amount")
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the flight's operator",
+    )
     flight = models.ForeignKey(
         Flight,
         on_delete=models.CASCADE,
+        # Flights are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
         related_name="expenses",
         verbose_name="Flight",
     )
+    flight_date = models.DateField(
+        editable=False,
+        help_text="Copy of the flight's date, kept for date-ordered scans without a join",
+    )
     expense_type = models.CharField(
         max_length=20,
         choices=ExpenseType.choices,
@@ -64,11 +107,24 @@ class FlightExpense(models.Model):
         verbose_name="Expense Amount (USD)",
         help_text="Example: 1200.50",
     )
+    merchant = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Merchant as printed on the card statement",
+    )
     notes = models.TextField(
         blank=True,
         default="",
         help_text="Optional",
     )
+    fingerprint = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Hash of the statement line this expense was imported from; empty for manual entries",
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Created At"
@@ -78,24 +134,58 @@ class FlightExpense(models.Model):
         verbose_name="Updated At"
     )
 
+    objects = OperatorManager()
+
     class Meta:
-        ordering = ["-flight__flight_date"]
+        ordering = ["-flight_date", "-id"]
+        constraints = [
+            # Statement lines are deduplicated per operator
+            models.UniqueConstraint(fields=["operator", "fingerprint"], name="unique_flight_expense_fingerprint"),
+        ]
+        indexes = [
+            models.Index(fields=["operator", "flight_date", "id"], name="expense_operator_date_idx"),
+            models.Index(
+                fields=["operator", "expense_type", "flight_date", "id"], name="expense_operator_type_date_idx"
+            ),
+        ]
         verbose_name = "Flight Expense"
         verbose_name_plural = "Flight Expenses"
 
+    def save(self, *args, **kwargs):
+        self.flight_date = self.flight.flight_date
+        self.operator_id = self.flight.operator_id
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return f"{self.flight.aircraft.registration} {self.flight.flight_date}"
+        return f"{self.flight.aircraft.registration} {self.flight_date}"
 
 
-class FuelPaid(models.Model):
+class FuelPaid(TrackedFieldsMixin, models.Model):
     """" A model to record fuel paid for a flight """
-    
+
+    TRACKED_FIELDS = ("flight_id", "fuel_type", "amount_paid")
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the flight's operator",
+    )
     flight = models.ForeignKey(
         Flight,
         on_delete=models.CASCADE,
+        # Flights are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
         related_name="fuel_paid",
         verbose_name="Flight",
     )
+    flight_date = models.DateField(
+        editable=False,
+        help_text="Copy of the flight's date, kept for date-ordered scans without a join",
+    )
     fuel_type = models.CharField(
         max_length=20,
         choices=FuelType.choices,
@@ -124,6 +214,22 @@ class FuelPaid(models.Model):
         verbose_name="Amount Paid (USD)",
         help_text="Example: 960.75",
     )
+    fuel_quantity_kg = models.DecimalField(
+        max_digits=9,
+        decimal_places=1,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Quantity (kg)",
+    )
+    price_per_kg = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Price (USD/kg)",
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Created At"
@@ -133,12 +239,146 @@ class FuelPaid(models.Model):
         verbose_name="Updated At"
     )
 
+    objects = OperatorManager()
+
     class Meta:
-        ordering = ["-flight__flight_date"]
+        ordering = ["-flight_date", "-id"]
+        indexes = [
+            models.Index(fields=["operator", "fuel_type", "price_per_kg"], name="fuel_operator_type_price_idx"),
+            models.Index(fields=["operator", "flight_date", "id"], name="fuel_operator_date_idx"),
+            models.Index(fields=["operator", "fuel_type", "flight_date", "id"], name="fuel_operator_type_date_idx"),
+        ]
         verbose_name = "Fuel Paid"
         verbose_name_plural = "Fuel Paid"
 
+    def save(self, *args, **kwargs):
+        self.flight_date = self.flight.flight_date
+        self.operator_id = self.flight.operator_id
+        self.set_canonical_values()
+        super().save(*args, **kwargs)
+
+    def set_canonical_values(self):
+        """ Derive the mass quantity and unit price from the uplift as entered """
+        quantity_kg = Decimal(self.fuel_quantity) * kg_per_unit(self.fuel_type, self.fuel_units)
+        self.fuel_quantity_kg = quantity_kg.quantize(Decimal("0.1"))
+        if self.fuel_quantity_kg:
+            self.price_per_kg = (Decimal(self.amount_paid) / quantity_kg).quantize(Decimal("0.0001"))
+        else:
+            self.price_per_kg = None
+
     def __str__(self):
         return (f"{self.flight.departure_airport}-{self.flight.arrival_airport} | "
                 f"{self.flight.aircraft.registration} | {self.fuel_quantity} {self.fuel_units} | "
                 f"{self.fuel_type} | USD ${self.amount_paid}")
+
+
+# ============================
+# SUMMARY MODELS
+# ============================
+
+class MonthlyExpenseSummary(models.Model):
+    """ Expense totals per aircraft, month and expense type, maintained incrementally """
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the aircraft's operator",
+    )
+    aircraft = models.ForeignKey(
+        Aircraft,
+        on_delete=models.CASCADE,
+        related_name="expense_summaries",
+        verbose_name="Aircraft",
+    )
+    month = models.DateField(
+        help_text="First day of the month",
+    )
+    expense_type = models.CharField(
+        max_length=20,
+        choices=ExpenseType.choices,
+    )
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Total Amount (USD)",
+    )
+    entry_count = models.IntegerField(
+        default=0,
+    )
+
+    objects = OperatorManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["aircraft", "month", "expense_type"],
+                name="unique_monthly_expense_summary"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["operator", "month"], name="expense_summary_operator_idx"),
+        ]
+        ordering = ["-month"]
+        verbose_name = "Monthly Expense Summary"
+        verbose_name_plural = "Monthly Expense Summaries"
+
+    def __str__(self):
+        return f"{self.aircraft_id} {self.month:%Y-%m} {self.expense_type}"
+
+
+class MonthlyFuelSummary(models.Model):
+    """ Fuel spend per aircraft, month and fuel type, maintained incrementally """
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the aircraft's operator",
+    )
+    aircraft = models.ForeignKey(
+        Aircraft,
+        on_delete=models.CASCADE,
+        related_name="fuel_summaries",
+        verbose_name="Aircraft",
+    )
+    month = models.DateField(
+        help_text="First day of the month",
+    )
+    fuel_type = models.CharField(
+        max_length=20,
+        choices=FuelType.choices,
+    )
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Total Amount (USD)",
+    )
+    entry_count = models.IntegerField(
+        default=0,
+    )
+
+    objects = OperatorManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["aircraft", "month", "fuel_type"],
+                name="unique_monthly_fuel_summary"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["operator", "month"], name="fuel_summary_operator_idx"),
+        ]
+        ordering = ["-month"]
+        verbose_name = "Monthly Fuel Summary"
+        verbose_name_plural = "Monthly Fuel Summaries"
+
+    def __str__(self):
+        return f"{self.aircraft_id} {self.month:%Y-%m} {self.fuel_type}"
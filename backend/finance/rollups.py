@@ -0,0 +1,146 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from aircraft.models import Flight
+from core.cache import bump_all_data_versions
+from .models import FlightExpense, FuelPaid, MonthlyExpenseSummary, MonthlyFuelSummary
+
+
+# Source model -> (summary model, category field, amount field)
+ROLLUPS = {
+    FlightExpense: (MonthlyExpenseSummary, "expense_type", "expense_amount"),
+    FuelPaid: (MonthlyFuelSummary, "fuel_type", "amount_paid"),
+}
+
+
+def _add_to_summary(summary_model, key, amount, count, operator_id):
+    """ Increment one summary row with an atomic F() update, creating it if missing """
+    changes = {
+        "total_amount": F("total_amount") + amount,
+        "entry_count": F("entry_count") + count,
+    }
+    summaries = summary_model.objects.unscoped()
+    if summaries.filter(**key).update(**changes):
+        if count < 0:
+            summaries.filter(**key, entry_count__lte=0).delete()
+        return
+    try:
+        with transaction.atomic():
+            summaries.create(**key, operator_id=operator_id, total_amount=amount, entry_count=count)
+    except IntegrityError:
+        # Another writer created the row first
+        summaries.filter(**key).update(**changes)
+
+
+UPSERT_BATCH_SIZE = 500
+
+
+def add_many_to_summary(source_model, deltas):
+    """
+    Add many expense or fuel totals to their summary rows at once, given
+    {(operator id, aircraft id, month, category): (amount, count)}.
+
+    On PostgreSQL and SQLite this is one INSERT ... ON CONFLICT DO UPDATE per
+    batch of keys, adding to whatever the rows hold at that moment; other
+    backends fall back to one update per key.
+    """
+    summary_model, category_field, _ = ROLLUPS[source_model]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        for (operator_id, aircraft_id, month, category), (amount, count) in deltas.items():
+            key = {"aircraft_id": aircraft_id, "month": month, category_field: category}
+            _add_to_summary(summary_model, key, amount, count, operator_id)
+        return
+
+    table = connection.ops.quote_name(summary_model._meta.db_table)
+    category = connection.ops.quote_name(category_field)
+    sql = (
+        f"INSERT INTO {table} (operator_id, aircraft_id, month, {category}, total_amount, entry_count) "
+        f"VALUES {{values}} "
+        f"ON CONFLICT (aircraft_id, month, {category}) DO UPDATE SET "
+        f"total_amount = {table}.total_amount + EXCLUDED.total_amount, "
+        f"entry_count = {table}.entry_count + EXCLUDED.entry_count"
+    )
+    rows = [(*key, amount, count) for key, (amount, count) in deltas.items()]
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                sql.format(values=", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(batch))),
+                [value for row in batch for value in row],
+            )
+    if any(count < 0 for _, count in deltas.values()):
+        summary_model.objects.unscoped().filter(entry_count__lte=0).delete()
+
+
+def apply_to_summary(source_model, values, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one expense or fuel entry, given its
+    tracked values, to the summary row of its flight's aircraft and month.
+    """
+    summary_model, category_field, amount_field = ROLLUPS[source_model]
+    aircraft_id, flight_date, operator_id = (
+        Flight.objects.unscoped().values_list("aircraft_id", "flight_date", "operator_id").get(pk=values["flight_id"])
+    )
+    key = {
+        "aircraft_id": aircraft_id,
+        "month": flight_date.replace(day=1),
+        category_field: values[category_field],
+    }
+    _add_to_summary(summary_model, key, sign * values[amount_field], sign, operator_id)
+
+
+def move_flight_summaries(flight_id, previous, current, operator_id):
+    """
+    Re-key a flight's expense and fuel contributions after its aircraft or
+    month changed; ``operator_id`` is the flight's operator now.
+    """
+    for source_model, (summary_model, category_field, amount_field) in ROLLUPS.items():
+        totals = (
+            source_model.objects.unscoped()
+            .filter(flight_id=flight_id)
+            .order_by()
+            .values(category_field)
+            .annotate(amount=Sum(amount_field), count=Count("id"))
+        )
+        for row in totals:
+            for (aircraft_id, flight_date), sign in ((previous, -1), (current, 1)):
+                key = {
+                    "aircraft_id": aircraft_id,
+                    "month": flight_date.replace(day=1),
+                    category_field: row[category_field],
+                }
+                _add_to_summary(summary_model, key, sign * row["amount"], sign * row["count"], operator_id)
+
+
+def rebuild_summaries():
+    """ Recompute every summary row from scratch with one GROUP BY per source table """
+    rebuilt = {}
+    with transaction.atomic():
+        for source_model, (summary_model, category_field, amount_field) in ROLLUPS.items():
+            rows = (
+                source_model.objects.unscoped()
+                .order_by()
+                .values(
+                    category_field, "operator_id", aircraft=F("flight__aircraft_id"), month=TruncMonth("flight_date")
+                )
+                .annotate(amount=Sum(amount_field), count=Count("id"))
+            )
+            summary_model.objects.unscoped().delete()
+            summaries = summary_model.objects.bulk_create(
+                (
+                    summary_model(
+                        operator_id=row["operator_id"],
+                        aircraft_id=row["aircraft"],
+                        month=row["month"],
+                        total_amount=row["amount"],
+                        entry_count=row["count"],
+                        **{category_field: row[category_field]},
+                    )
+                    for row in rows.iterator()
+                ),
+                batch_size=5000,
+            )
+            rebuilt[summary_model] = len(summaries)
+        bump_all_data_versions()
+    return rebuilt
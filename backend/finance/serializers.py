@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from .models import FlightExpense, FuelPaid
+
+
+class FlightExpenseSerializer(serializers.ModelSerializer):
+    aircraft = serializers.IntegerField(source="flight.aircraft_id", read_only=True)
+
+    class Meta:
+        model = FlightExpense
+        fields = "__all__"
+
+
+class FuelPaidSerializer(serializers.ModelSerializer):
+    aircraft = serializers.IntegerField(source="flight.aircraft_id", read_only=True)
+
+    class Meta:
+        model = FuelPaid
+        fields = "__all__"
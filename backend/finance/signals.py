@@ -0,0 +1,92 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from aircraft.models import Aircraft, Flight
+from aircraft.signals import deleted_with, flight_aircraft_id
+from core.cache import bump_data_version
+from core.events import publish
+from .models import FlightExpense, FuelPaid, MonthlyExpenseSummary, MonthlyFuelSummary
+from .rollups import apply_to_summary, move_flight_summaries
+
+
+@receiver(post_save, sender=FlightExpense)
+@receiver(post_save, sender=FuelPaid)
+def roll_entry_into_summary(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    current = instance.tracked_values()
+    if not created and previous is not None:
+        if previous == current:
+            return
+        apply_to_summary(sender, previous, -1)
+    apply_to_summary(sender, current, 1)
+
+
+@receiver(post_delete, sender=FlightExpense)
+@receiver(post_delete, sender=FuelPaid)
+def roll_entry_out_of_summary(sender, instance, origin=None, **kwargs):
+    # Summaries are deleted along with the aircraft itself
+    if deleted_with(origin, Aircraft):
+        return
+    apply_to_summary(sender, instance.tracked_values(), -1)
+
+
+@receiver(post_save, sender=Flight)
+def move_summaries_with_flight(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None:
+        return
+    current = instance.tracked_values()
+    before = (previous["aircraft_id"], previous["flight_date"])
+    after = (current["aircraft_id"], current["flight_date"])
+    changes = {
+        name: current[name] for name in ("flight_date", "operator_id") if previous[name] != current[name]
+    }
+    if changes:
+        FlightExpense.objects.unscoped().filter(flight_id=instance.pk).update(**changes)
+        FuelPaid.objects.unscoped().filter(flight_id=instance.pk).update(**changes)
+    if before[0] != after[0] or before[1].replace(day=1) != after[1].replace(day=1):
+        move_flight_summaries(instance.pk, before, after, current["operator_id"])
+
+
+@receiver(post_save, sender=Aircraft)
+def move_entries_with_aircraft(sender, instance, created, **kwargs):
+    """ Follow an aircraft that changed operator; its flights are moved in aircraft.signals """
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None or previous["operator_id"] == instance.operator_id:
+        return
+    for model in (FlightExpense, FuelPaid):
+        model.objects.unscoped().filter(flight__aircraft_id=instance.pk).update(operator_id=instance.operator_id)
+    for model in (MonthlyExpenseSummary, MonthlyFuelSummary):
+        model.objects.unscoped().filter(aircraft_id=instance.pk).update(operator_id=instance.operator_id)
+
+
+@receiver(post_save, sender=FlightExpense)
+@receiver(post_save, sender=FuelPaid)
+def bump_entry_data_version(sender, instance, **kwargs):
+    bump_data_version(flight_aircraft_id(instance), operator_ids=[instance.operator_id])
+
+
+@receiver(post_delete, sender=FlightExpense)
+@receiver(post_delete, sender=FuelPaid)
+def bump_deleted_entry_data_version(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Aircraft, Flight):
+        bump_data_version(flight_aircraft_id(instance), operator_ids=[instance.operator_id])
+
+
+def expense_event(expense, aircraft_id):
+    """ The live feed's data for a new expense (see core.events) """
+    return {
+        "id": expense.pk,
+        "flight": expense.flight_id,
+        "aircraft": aircraft_id,
+        "flight_date": expense.flight_date,
+        "expense_type": expense.expense_type,
+        "expense_amount": expense.expense_amount,
+        "merchant": expense.merchant,
+    }
+
+
+@receiver(post_save, sender=FlightExpense)
+def publish_new_expense(sender, instance, created, **kwargs):
+    if created:
+        publish("expense", instance.operator_id, expense_event(instance, flight_aircraft_id(instance)))
@@ -0,0 +1,275 @@
+"""
+Import of card statement lines as flight expenses.
+
+Every line is fingerprinted from its date, amount, payment method and
+merchant; fingerprints are unique per operator, so importing a statement
+twice adds nothing the second time. A whole statement takes a fixed handful of
+queries: aircraft and flights are looked up for all lines at once, known
+fingerprints are filtered out with one query, and the rest are inserted
+with INSERT ... ON CONFLICT DO NOTHING.
+"""
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils.dateparse import parse_date
+
+from aircraft.ingest import IngestReport
+from aircraft.models import Aircraft, Flight
+from core.cache import bump_data_version
+from core.events import BULK_EVENT_LIMIT, publish_many
+from .models import ExpenseType, FlightExpense
+from .rollups import add_many_to_summary
+from .signals import expense_event
+
+
+# Charges often post the day after the flight; try the same day first
+MATCH_DAY_OFFSETS = (0, -1, 1)
+
+STATEMENT_DATE_FORMATS = ("%m/%d/%Y", "%d.%m.%Y")
+
+MAX_AMOUNT = Decimal("99999.99")
+
+
+class StatementReport(IngestReport):
+    """ An ingestion report that also counts lines already imported before """
+
+    def __init__(self):
+        super().__init__()
+        self.duplicates = 0
+
+    def as_dict(self):
+        return {**super().as_dict(), "duplicates": self.duplicates}
+
+
+def _parse_statement_date(value):
+    value = (value or "").strip()
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        return None
+    if parsed is None:
+        for date_format in STATEMENT_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+    return parsed
+
+
+def _parse_amount(value):
+    try:
+        amount = Decimal((value or "").strip().replace("$", "").replace(",", ""))
+    except InvalidOperation:
+        return None
+    return amount.quantize(Decimal("0.01")) if amount.is_finite() else None
+
+
+def _expense_type(category):
+    """ Map a statement category to an ExpenseType by value or label, defaulting to Other """
+    category = (category or "").strip().casefold()
+    for value, label in ExpenseType.choices:
+        if category in (value.casefold(), label.casefold()):
+            return value
+    return ExpenseType.OTHER
+
+
+def normalize_merchant(merchant):
+    return " ".join((merchant or "").split()).casefold()
+
+
+def fingerprint(line_date, amount, payment_method, merchant, occurrence=1):
+    """
+    Identity of one statement line.
+
+    ``occurrence`` tells apart identical charges on the same day (two equal
+    fuel tickets, say); it numbers them in statement order, which stays the
+    same when the statement is uploaded again.
+    """
+    key = f"{line_date.isoformat()}|{amount:.2f}|{payment_method}|{normalize_merchant(merchant)}|{occurrence}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _parse_lines(rows, payment_method, default_aircraft, report):
+    """ Clean (row_number, row) pairs into line dicts, rejecting malformed ones """
+    lines = []
+    occurrences = Counter()
+    for row_number, row in rows:
+        if isinstance(row, Exception):
+            report.reject(row_number, {"row": [str(row)]})
+            continue
+        errors = {}
+        line_date = _parse_statement_date(row.get("date"))
+        if line_date is None:
+            errors["date"] = ["Enter a date as YYYY-MM-DD or MM/DD/YYYY."]
+        amount = _parse_amount(row.get("amount"))
+        if amount is None:
+            errors["amount"] = ["Enter a number."]
+        elif amount <= 0:
+            errors["amount"] = ["Credits and refunds are not imported."]
+        elif amount > MAX_AMOUNT:
+            errors["amount"] = [f"Amounts above {MAX_AMOUNT} cannot be stored."]
+        merchant = (row.get("merchant") or "").strip()
+        if not merchant:
+            errors["merchant"] = ["This field is required."]
+        registration = (row.get("aircraft") or "").strip().upper() or default_aircraft
+        if not registration:
+            errors["aircraft"] = ["Give the aircraft registration on the line or for the whole statement."]
+        if errors:
+            report.reject(row_number, errors)
+            continue
+
+        identity = (line_date, amount, normalize_merchant(merchant))
+        occurrences[identity] += 1
+        lines.append({
+            "row_number": row_number,
+            "date": line_date,
+            "amount": amount,
+            "merchant": merchant[:255],
+            "registration": registration,
+            "expense_type": _expense_type(row.get("category")),
+            "notes": (row.get("description") or "").strip(),
+            "fingerprint": fingerprint(line_date, amount, payment_method, merchant, occurrences[identity]),
+        })
+    return lines
+
+
+def _match_flights(lines):
+    """
+    Look up the aircraft of every registration, and map (aircraft id, date)
+    to (flight id, aircraft id, flight date, operator id) of the aircraft's
+    first flight that day. Registrations held by more than one aircraft in
+    scope (e.g. of several operators, when unscoped) are returned apart and
+    matched to none.
+    """
+    registrations = {line["registration"] for line in lines}
+    aircraft_ids, ambiguous = {}, set()
+    for registration, pk in Aircraft.objects.filter(registration__in=registrations).values_list("registration", "pk"):
+        if registration in aircraft_ids:
+            ambiguous.add(registration)
+        aircraft_ids[registration] = pk
+    for registration in ambiguous:
+        del aircraft_ids[registration]
+    dates = [line["date"] for line in lines]
+    flights = {}
+    rows = (
+        Flight.objects
+        .filter(
+            aircraft_id__in=aircraft_ids.values(),
+            flight_date__gte=min(dates) - timedelta(days=max(MATCH_DAY_OFFSETS)),
+            flight_date__lte=max(dates) - timedelta(days=min(MATCH_DAY_OFFSETS)),
+        )
+        .order_by("id")
+        .values_list("aircraft_id", "flight_date", "pk", "operator_id")
+    )
+    for aircraft_id, flight_date, flight_id, operator_id in rows:
+        flights.setdefault((aircraft_id, flight_date), (flight_id, aircraft_id, flight_date, operator_id))
+    return aircraft_ids, ambiguous, flights
+
+
+def _publish_expenses(expenses, aircraft_ids):
+    """ Announce expenses inserted in bulk; ignore_conflicts leaves their ids to be read back """
+    ids = dict(
+        ((operator_id, fingerprint), pk) for pk, operator_id, fingerprint in
+        FlightExpense.objects.unscoped()
+        .filter(fingerprint__in=[expense.fingerprint for expense in expenses])
+        .values_list("pk", "operator_id", "fingerprint")
+    )
+    for expense in expenses:
+        expense.pk = ids.get((expense.operator_id, expense.fingerprint))
+    publish_many("expense", (
+        (expense.operator_id, expense_event(expense, aircraft_id))
+        for expense, aircraft_id in zip(expenses, aircraft_ids) if expense.pk is not None
+    ))
+
+
+def import_statement(rows, payment_method, default_aircraft=None):
+    """
+    Import (row_number, row) pairs of a card statement as flight expenses.
+
+    Rows carry ``date``, ``amount`` and ``merchant``, and may carry
+    ``aircraft`` (a registration, else ``default_aircraft`` applies),
+    ``category`` (an expense type) and ``description``. Each line is booked
+    to the aircraft's flight on that date, or on the day before or after.
+    Registrations are looked up among the active operator's aircraft, and
+    duplicates are detected per operator.
+    """
+    report = StatementReport()
+    default_aircraft = (default_aircraft or "").strip().upper() or None
+    lines = _parse_lines(rows, payment_method, default_aircraft, report)
+    if not lines:
+        return report
+
+    aircraft_ids, ambiguous, flights = _match_flights(lines)
+    candidates = {}
+    for line in lines:
+        aircraft_id = aircraft_ids.get(line["registration"])
+        if line["registration"] in ambiguous:
+            report.reject(line["row_number"], {"aircraft": [
+                f"{line['registration']} is registered to more than one aircraft; import for one operator."
+            ]})
+            continue
+        if aircraft_id is None:
+            report.reject(line["row_number"], {"aircraft": [f"No aircraft registered as {line['registration']}."]})
+            continue
+        match = next(
+            (
+                flights[(aircraft_id, line["date"] + timedelta(days=offset))]
+                for offset in MATCH_DAY_OFFSETS
+                if (aircraft_id, line["date"] + timedelta(days=offset)) in flights
+            ),
+            None,
+        )
+        if match is None:
+            report.reject(line["row_number"], {"date": [f"{line['registration']} has no flight around {line['date']}."]})
+            continue
+        candidates[line["fingerprint"]] = (line, match)
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # One statement import at a time, so the filter below sees every
+            # earlier import and the summaries are adjusted exactly once
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext('finance.import_statement'))")
+        known = set(
+            FlightExpense.objects
+            .filter(fingerprint__in=list(candidates))
+            .values_list("operator_id", "fingerprint")
+        )
+        new = [(line, match) for key, (line, match) in candidates.items() if (match[3], key) not in known]
+        report.duplicates = len(candidates) - len(new)
+        expenses = FlightExpense.objects.bulk_create(
+            [
+                FlightExpense(
+                    operator_id=operator_id,
+                    flight_id=flight_id,
+                    flight_date=flight_date,
+                    expense_type=line["expense_type"],
+                    payment_method=payment_method,
+                    expense_amount=line["amount"],
+                    merchant=line["merchant"],
+                    notes=line["notes"],
+                    fingerprint=line["fingerprint"],
+                )
+                for line, (flight_id, _, flight_date, operator_id) in new
+            ],
+            batch_size=2000,
+            ignore_conflicts=True,
+        )
+
+        # bulk_create sends no signals, so roll the new rows into the summaries here
+        totals = defaultdict(lambda: [Decimal("0.00"), 0])
+        for line, (_, aircraft_id, flight_date, operator_id) in new:
+            key = (operator_id, aircraft_id, flight_date.replace(day=1), line["expense_type"])
+            totals[key][0] += line["amount"]
+            totals[key][1] += 1
+        add_many_to_summary(FlightExpense, totals)
+        bump_data_version(
+            *{aircraft_id for _, aircraft_id, _, _ in totals},
+            operator_ids={operator_id for operator_id, _, _, _ in totals},
+        )
+        _publish_expenses(expenses[-BULK_EVENT_LIMIT:], [match[1] for _, match in new[-BULK_EVENT_LIMIT:]])
+    report.accepted = len(new)
+    return report
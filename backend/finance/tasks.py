@@ -0,0 +1,7 @@
+from jobs.registry import task
+from .rollups import rebuild_summaries as rebuild
+
+
+@task()
+def rebuild_summaries():
+    return {summary_model._meta.label: count for summary_model, count in rebuild().items()}
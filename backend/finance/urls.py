@@ -0,0 +1,15 @@
+from django.urls import path
+from .api_views import (
+    FinanceSummaryView, FlightExpenseExportView, FlightExpenseListView, FuelPaidExportView, FuelPaidListView,
+    FuelPriceView, StatementImportView,
+)
+
+urlpatterns = [
+    path("expenses/", FlightExpenseListView.as_view(), name="expense_list"),
+    path("expenses/import-statement/", StatementImportView.as_view(), name="statement_import"),
+    path("expenses/export/<str:file_format>/", FlightExpenseExportView.as_view(), name="expense_export"),
+    path("fuel/", FuelPaidListView.as_view(), name="fuel_list"),
+    path("fuel/export/<str:file_format>/", FuelPaidExportView.as_view(), name="fuel_export"),
+    path("summary/", FinanceSummaryView.as_view(), name="finance_summary"),
+    path("fuel-prices/", FuelPriceView.as_view(), name="fuel_prices"),
+]
@@ -2,6 +2,8 @@
 ASGI config for jetbench project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with e.g. ``uvicorn jetbench.asgi:application --workers 4``; see the
+README section "Running Under ASGI".
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
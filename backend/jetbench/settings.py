@@ -53,15 +53,21 @@ INSTALLED_APPS = [
     'analytics',
     'aircraft',
     'finance',
+    'jobs',
+    'reports',
+    'telemetry',
 ]
 
 MIDDLEWARE = [
+    'core.tenancy.OperatorScopeMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.tenancy.SessionOperatorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -97,9 +103,64 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST'),
         'PORT': env('DB_PORT'),
+        # Keep connections open between requests, checking them before reuse.
+        # Under ASGI set DB_CONN_MAX_AGE=0 and pool with PgBouncer instead
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+        # Required behind PgBouncer in transaction mode; exports then buffer
+        # each query's rows on the client instead of streaming them
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
     }
 }
 
+# Dashboard and export reads go to a streaming replica when one is set
+# (see core.routers); users read from the primary for a few seconds after
+# they write, until the replica has caught up
+
+if env('DB_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': env('DB_REPLICA_HOST'),
+        'PORT': env('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = env.int('DB_REPLICA_STICKY_SECONDS', default=5)
+
+# Cache
+# Analytics responses are cached per aircraft data version. Any deployment with
+# more than one process needs a shared backend, e.g. CACHE_URL=redis://host:6379/1
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Threads per process that async views use to run independent queries
+# concurrently; each holds its own database connection while in use
+
+ASYNC_QUERY_THREADS = env.int('ASYNC_QUERY_THREADS', default=16)
+
+# Seconds a single-use ticket for an event stream stays valid (see core.async_api).
+# Tickets are kept in the cache, so several processes need the shared backend above
+
+STREAM_TICKET_TTL = env.int('STREAM_TICKET_TTL', default=30)
+
+# Background jobs (see the jobs app and the run_worker command)
+# A running job whose worker has not heartbeated for this many seconds is requeued
+JOBS_STALE_AFTER = env.int('JOBS_STALE_AFTER', default=300)
+
+# Schedules synced into PeriodicJob when a worker starts; cron times are UTC
+JOBS_PERIODIC = [
+    {'name': 'Compact utilization ledger', 'task': 'aircraft.compact_utilization_ledger', 'cron': '*/5 * * * *'},
+    {'name': 'Create flight partitions', 'task': 'aircraft.create_partitions', 'cron': '0 1 * * *'},
+    {'name': 'Reconcile engine counters', 'task': 'engines.reconcile_engine_counters', 'cron': '30 2 * * *'},
+    {'name': 'Refresh overhaul forecasts', 'task': 'engines.refresh_overhaul_forecasts', 'cron': '45 2 * * *'},
+    {'name': 'Rebuild finance summaries', 'task': 'finance.rebuild_summaries', 'cron': '0 3 * * 0'},
+    {'name': 'Render monthly reports', 'task': 'reports.render_monthly_reports', 'cron': '0 4 1 * *'},
+    {'name': 'Purge expired tokens', 'task': 'accounts.purge_expired_tokens', 'cron': '15 * * * *'},
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,6 +198,9 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files, e.g. imports waiting for a background job
+MEDIA_ROOT = env('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -152,9 +216,16 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # REST framework settings
+# 'cached' loads request users through a short-lived per-process cache;
+# 'stateless' never loads them and trusts the access token's claims
+JWT_AUTH_MODE = env('JWT_AUTH_MODE', default='cached')
+AUTH_USER_CACHE_TTL = env.int('AUTH_USER_CACHE_TTL', default=60)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication'
+        if JWT_AUTH_MODE == 'stateless'
+        else 'accounts.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
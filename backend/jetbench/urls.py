@@ -20,4 +20,11 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('accounts.urls')),
+    path('api/aircraft/', include('aircraft.urls')),
+    path('api/analytics/', include('analytics.urls')),
+    path('api/engines/', include('engines.urls')),
+    path('api/finance/', include('finance.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/reports/', include('reports.urls')),
+    path('api/telemetry/', include('telemetry.urls')),
 ]
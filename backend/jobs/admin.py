@@ -0,0 +1,48 @@
+from django.contrib import admin, messages
+from django.utils import timezone
+
+from core.admin import OperatorScopedAdmin
+
+from .models import Job, JobStatus, PeriodicJob
+
+
+@admin.register(Job)
+class JobAdmin(OperatorScopedAdmin):
+    model = Job
+
+    list_display = ("id", "task", "status", "priority", "attempts", "progress", "run_after", "finished_at", "locked_by")
+    list_filter = ("status", "task")
+    search_fields = ("task", "locked_by")
+    ordering = ("-id",)
+    list_select_related = ("created_by", "periodic_job")
+    raw_id_fields = ("created_by", "periodic_job")
+    readonly_fields = (
+        "attempts", "progress", "progress_message", "result", "error", "locked_by",
+        "heartbeat_at", "created_at", "started_at", "finished_at",
+    )
+    actions = ("retry_jobs", "cancel_jobs")
+
+    @admin.action(description="Retry selected failed or cancelled jobs")
+    def retry_jobs(self, request, queryset):
+        retried = queryset.filter(status__in=[JobStatus.FAILED, JobStatus.CANCELLED]).update(
+            status=JobStatus.QUEUED, run_after=timezone.now(), attempts=0, finished_at=None, error="",
+        )
+        self.message_user(request, f"Requeued {retried} jobs.", messages.SUCCESS)
+
+    @admin.action(description="Cancel selected queued jobs")
+    def cancel_jobs(self, request, queryset):
+        cancelled = queryset.filter(status=JobStatus.QUEUED).update(
+            status=JobStatus.CANCELLED, finished_at=timezone.now(),
+        )
+        self.message_user(request, f"Cancelled {cancelled} jobs.", messages.SUCCESS)
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    model = PeriodicJob
+
+    list_display = ("name", "task", "cron", "enabled", "next_run_at", "last_enqueued_at")
+    list_filter = ("enabled",)
+    search_fields = ("name", "task")
+    ordering = ("name",)
+    readonly_fields = ("next_run_at", "last_enqueued_at")
@@ -0,0 +1,80 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.tenancy import operator_filter
+from .models import Job, JobStatus
+from .registry import enqueue
+from .serializers import JobSerializer
+
+
+# Newest jobs returned by the list endpoint
+JOB_LIST_LIMIT = 100
+
+
+def visible_jobs(user):
+    """ Staff see every job of their operator; other users only the jobs they started """
+    jobs = Job.objects.filter(operator_filter())
+    return jobs if user.is_staff else jobs.filter(created_by_id=user.pk)
+
+
+class JobListView(generics.ListCreateAPIView):
+    """
+    Recent jobs, optionally filtered by ``status`` and ``task``, and
+    enqueueing of a registered task.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        jobs = visible_jobs(self.request.user)
+        for name in ("status", "task"):
+            value = self.request.query_params.get(name)
+            if value:
+                jobs = jobs.filter(**{name: value})
+        return jobs.order_by("-id")[:JOB_LIST_LIMIT]
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        serializer.instance = enqueue(
+            data["task"],
+            kwargs=data.get("kwargs"),
+            # Only staff may jump the queue
+            priority=data.get("priority") if self.request.user.is_staff else None,
+            created_by=self.request.user,
+        )
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    """ One job's status and progress, for clients to poll """
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        return visible_jobs(self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class JobCancelView(APIView):
+    """ Cancel a job that has not started yet """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        job = get_object_or_404(visible_jobs(request.user), pk=pk)
+        cancelled = Job.objects.filter(pk=job.pk, status=JobStatus.QUEUED).update(
+            status=JobStatus.CANCELLED, finished_at=timezone.now(),
+        )
+        job.refresh_from_db()
+        if not cancelled:
+            return Response(
+                {"detail": f"Only queued jobs can be cancelled; this job is {job.status}."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(JobSerializer(job).data)
@@ -0,0 +1,86 @@
+"""
+A minimal five-field cron expression parser.
+
+Fields are minute, hour, day of month, month and day of week (0 or 7 is
+Sunday). Each accepts ``*``, numbers, ranges ``a-b``, steps ``*/n`` or
+``a-b/n``, and comma-separated lists of those. As in cron, when both day
+fields are restricted a day matches if either of them does.
+"""
+from datetime import timedelta
+
+
+FIELD_RANGES = (
+    (0, 59),   # minute
+    (0, 23),   # hour
+    (1, 31),   # day of month
+    (1, 12),   # month
+    (0, 7),    # day of week
+)
+
+# Enough to cover any schedule that matches at all (e.g. 29 February)
+MAX_SEARCH_DAYS = 366 * 8
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"'{text}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse(expression):
+    """ Parse a cron expression into (minutes, hours, days, months, weekdays, day fields restricted) """
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError("A cron expression needs exactly five fields.")
+    try:
+        minutes, hours, days, months, weekdays = (
+            _parse_field(text, low, high) for text, (low, high) in zip(fields, FIELD_RANGES)
+        )
+    except ValueError as exc:
+        raise ValueError(f"Invalid cron expression '{expression}': {exc}") from None
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+    # As in cron, a day field starting with "*" (e.g. "*/2") does not restrict
+    # the day, so the other day field alone decides
+    return minutes, hours, days, months, weekdays, (not fields[2].startswith("*"), not fields[4].startswith("*"))
+
+
+def next_run(expression, after):
+    """ The first time strictly after ``after`` at which the expression fires """
+    minutes, hours, days, months, weekdays, (days_restricted, weekdays_restricted) = parse(expression)
+
+    def day_matches(moment):
+        in_days = moment.day in days
+        # Python weekday() is Monday=0; cron is Sunday=0
+        in_weekdays = (moment.weekday() + 1) % 7 in weekdays
+        if days_restricted and weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = moment + timedelta(days=MAX_SEARCH_DAYS)
+    while moment < limit:
+        if moment.month not in months or not day_matches(moment):
+            moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        if moment.hour not in hours:
+            moment = (moment + timedelta(hours=1)).replace(minute=0)
+            continue
+        if moment.minute not in minutes:
+            moment += timedelta(minutes=1)
+            continue
+        return moment
+    raise ValueError(f"Cron expression '{expression}' never fires.")
@@ -0,0 +1,33 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run a background job worker until SIGTERM/SIGINT (running jobs are allowed to finish)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="Jobs run at once")
+        parser.add_argument(
+            "--mode", choices=["thread", "process"], default="thread",
+            help="Run jobs on threads (I/O-bound) or processes (CPU-bound)",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between queue polls")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        if not logging.getLogger("jobs").handlers:
+            handler = logging.StreamHandler(self.stdout)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            logging.getLogger("jobs").addHandler(handler)
+            logging.getLogger("jobs").setLevel(logging.INFO)
+
+        worker = Worker(
+            concurrency=options["concurrency"],
+            mode=options["mode"],
+            poll_interval=options["poll_interval"],
+        )
+        processed = worker.run(burst=options["burst"])
+        self.stdout.write(self.style.SUCCESS(f"Worker processed {processed} jobs."))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='operator',
+            field=models.ForeignKey(blank=True, help_text='The task runs scoped to this operator; unscoped when empty', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='accounts.operator'),
+        ),
+    ]
@@ -0,0 +1,214 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from . import cron
+
+
+# ============================
+# ENUM CHOICES
+# ============================
+
+class JobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    SUCCEEDED = "succeeded", "Succeeded"
+    FAILED = "failed", "Failed"
+    CANCELLED = "cancelled", "Cancelled"
+
+
+# ============================
+# JOB MODEL
+# ============================
+
+class Job(models.Model):
+    """ A unit of background work, claimed by workers with SELECT ... FOR UPDATE SKIP LOCKED """
+
+    task = models.CharField(
+        max_length=255,
+        help_text="Registered task name. Example: analytics.recompute_ectm",
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Arguments",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=JobStatus.choices,
+        default=JobStatus.QUEUED,
+    )
+    priority = models.SmallIntegerField(
+        default=0,
+        help_text="Higher runs first",
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Run After",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name="Max Attempts",
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Percent complete, as reported by the task",
+    )
+    progress_message = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="Progress Message",
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+    )
+    error = models.TextField(
+        blank=True,
+        default="",
+        help_text="Traceback of the last failed attempt",
+    )
+    locked_by = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="Worker",
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Heartbeat At",
+    )
+    periodic_job = models.ForeignKey(
+        "PeriodicJob",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+        verbose_name="Periodic Job",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+        verbose_name="Created By",
+    )
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs",
+        help_text="The task runs scoped to this operator; unscoped when empty",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Started At",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Finished At",
+    )
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            # The claim query scans only queued rows, in claim order
+            models.Index(
+                fields=["-priority", "run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queue_idx",
+            ),
+            models.Index(
+                fields=["heartbeat_at"],
+                condition=models.Q(status="running"),
+                name="job_running_idx",
+            ),
+        ]
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+
+    def __str__(self):
+        return f"#{self.pk} {self.task} ({self.status})"
+
+
+# ============================
+# PERIODIC JOB MODEL
+# ============================
+
+class PeriodicJob(models.Model):
+    """ A cron schedule that enqueues a task whenever it comes due """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+    )
+    task = models.CharField(
+        max_length=255,
+        help_text="Registered task name. Example: engines.reconcile_engine_counters",
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Arguments",
+    )
+    cron = models.CharField(
+        max_length=100,
+        help_text="Minute hour day-of-month month day-of-week, in UTC. Example: 30 2 * * *",
+    )
+    priority = models.SmallIntegerField(
+        default=0,
+    )
+    enabled = models.BooleanField(
+        default=True,
+    )
+    next_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Next Run At",
+    )
+    last_enqueued_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Last Enqueued At",
+    )
+
+    class Meta:
+        verbose_name = "Periodic Job"
+        verbose_name_plural = "Periodic Jobs"
+
+    def __str__(self):
+        return f"{self.name} ({self.cron})"
+
+    def clean(self):
+        super().clean()
+        try:
+            cron.parse(self.cron)
+        except ValueError as exc:
+            raise ValidationError({"cron": str(exc)})
+
+    def save(self, *args, **kwargs):
+        # An edited schedule is picked up from its new expression
+        update_fields = kwargs.get("update_fields")
+        if self.pk is not None and (update_fields is None or "cron" in update_fields):
+            previous = PeriodicJob.objects.filter(pk=self.pk).values_list("cron", flat=True).first()
+            if previous != self.cron:
+                self.next_run_at = None
+        super().save(*args, **kwargs)
@@ -0,0 +1,101 @@
+"""
+Task registration, enqueueing and progress reporting.
+
+Apps declare tasks in their ``tasks.py`` with the ``@task`` decorator; the
+jobs app imports those modules at startup. A task is a plain function taking
+JSON-serializable keyword arguments and returning a JSON-serializable result.
+"""
+from contextvars import ContextVar
+
+from django.core.exceptions import PermissionDenied
+from django.utils import timezone
+
+from core.tenancy import NO_OPERATOR, current_operator_id
+from .models import Job, JobStatus
+
+
+TASKS = {}
+
+# (job id, worker, attempt) of the claim the running task belongs to
+_current_claim = ContextVar("current_claim", default=None)
+
+
+class Task:
+    """ A registered task and its enqueueing defaults """
+
+    def __init__(self, function, name, priority=0, max_attempts=3, api=False):
+        self.function = function
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.api = api
+
+    def __call__(self, **kwargs):
+        return self.function(**kwargs)
+
+    def enqueue(self, **kwargs):
+        return enqueue(self.name, **kwargs)
+
+
+def task(name=None, priority=0, max_attempts=3, api=False):
+    """
+    Register a function as a background task.
+
+    ``api=True`` lets any authenticated user enqueue it through the jobs
+    endpoint; other tasks can only be enqueued from code or by staff.
+    """
+    def decorator(function):
+        task_name = name or f"{function.__module__.split('.')[0]}.{function.__name__}"
+        registered = Task(function, task_name, priority=priority, max_attempts=max_attempts, api=api)
+        TASKS[task_name] = registered
+        return registered
+    return decorator
+
+
+def enqueue(task_name, kwargs=None, priority=None, run_after=None, max_attempts=None,
+            created_by=None, periodic_job=None):
+    """
+    Queue a registered task; the job becomes visible to workers when the transaction commits.
+
+    The job runs in the operator scope active when it was queued.
+    """
+    if task_name not in TASKS:
+        raise KeyError(f"Unknown task '{task_name}'.")
+    operator_id = current_operator_id()
+    if operator_id == NO_OPERATOR:
+        raise PermissionDenied("Only users of an operator can start jobs.")
+    registered = TASKS[task_name]
+    return Job.objects.create(
+        task=task_name,
+        kwargs=kwargs or {},
+        priority=registered.priority if priority is None else priority,
+        run_after=run_after or timezone.now(),
+        max_attempts=registered.max_attempts if max_attempts is None else max_attempts,
+        # By id, since under stateless auth request.user is no model instance
+        created_by_id=getattr(created_by, "pk", None),
+        operator_id=operator_id,
+        periodic_job=periodic_job,
+    )
+
+
+def report_progress(percent, message=""):
+    """
+    Record the running job's progress; a no-op when called outside a job.
+
+    Pollers only see the update once it commits, so call this between
+    transactions rather than inside a long one.
+    """
+    claim = _current_claim.get()
+    if claim is None:
+        return
+    job_id, worker, attempt = claim
+    Job.objects.filter(pk=job_id, status=JobStatus.RUNNING, locked_by=worker, attempts=attempt).update(
+        progress=max(0, min(int(percent), 100)),
+        progress_message=message[:255],
+        heartbeat_at=timezone.now(),
+    )
+
+
+def current_job_id():
+    claim = _current_claim.get()
+    return None if claim is None else claim[0]
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+from .models import Job
+from .registry import TASKS
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id", "task", "kwargs", "status", "priority", "attempts", "max_attempts",
+            "progress", "progress_message", "result", "error", "run_after",
+            "created_at", "started_at", "finished_at",
+        ]
+        read_only_fields = [field for field in fields if field not in ("task", "kwargs", "priority")]
+
+    def validate_task(self, value):
+        registered = TASKS.get(value)
+        if registered is None:
+            raise serializers.ValidationError(f"Unknown task '{value}'.")
+        if not registered.api and not self.context["request"].user.is_staff:
+            raise serializers.ValidationError("Only staff can run this task.")
+        return value
+
+    def validate_kwargs(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Must be an object of keyword arguments.")
+        return value
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+
+from .cron import next_run, parse
+
+
+class CronParseTests(SimpleTestCase):
+    def test_steps(self):
+        minutes, hours, *_ = parse("*/15 10-20/5 * * *")
+        self.assertEqual(minutes, {0, 15, 30, 45})
+        self.assertEqual(hours, {10, 15, 20})
+        # A step from a single number runs to the end of the field
+        self.assertEqual(parse("5/20 * * * *")[0], {5, 25, 45})
+
+    def test_ranges_and_lists(self):
+        minutes, hours, days, months, weekdays, _ = parse("0,30 9-11,17 1-3 6,12 1-5")
+        self.assertEqual(minutes, {0, 30})
+        self.assertEqual(hours, {9, 10, 11, 17})
+        self.assertEqual(days, {1, 2, 3})
+        self.assertEqual(months, {6, 12})
+        self.assertEqual(weekdays, {1, 2, 3, 4, 5})
+
+    def test_seven_is_sunday(self):
+        self.assertEqual(parse("0 0 * * 5-7")[4], {0, 5, 6})
+
+    def test_day_fields_starting_with_a_star_are_unrestricted(self):
+        self.assertEqual(parse("0 0 * * *")[5], (False, False))
+        self.assertEqual(parse("0 0 */2 * 1")[5], (False, True))
+        self.assertEqual(parse("0 0 1 * *")[5], (True, False))
+
+    def test_rejected_expressions(self):
+        for expression in (
+            "", "* * * *", "* * * * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * 32 * *",
+            "* * * 0 *", "* * * 13 *", "* * * * 8", "5-1 * * * *", "*/0 * * * *", "a * * * *",
+            "1-2-3 * * * *", "*/x * * * *", "1,,2 * * * *",
+        ):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                parse(expression)
+
+
+class CronNextRunTests(SimpleTestCase):
+    def assertNextRun(self, expression, after, expected):
+        self.assertEqual(next_run(expression, after), expected)
+
+    def test_strictly_after(self):
+        self.assertNextRun("0 * * * *", datetime(2026, 1, 5, 10, 0), datetime(2026, 1, 5, 11, 0))
+        self.assertNextRun("0 * * * *", datetime(2026, 1, 5, 10, 0, 30), datetime(2026, 1, 5, 11, 0))
+        self.assertNextRun("*/15 * * * *", datetime(2026, 1, 5, 10, 7), datetime(2026, 1, 5, 10, 15))
+
+    def test_rolls_over_hour_day_month_and_year(self):
+        self.assertNextRun("30 2 * * *", datetime(2026, 1, 5, 3, 0), datetime(2026, 1, 6, 2, 30))
+        self.assertNextRun("0 0 1 * *", datetime(2026, 1, 31, 23, 59), datetime(2026, 2, 1, 0, 0))
+        self.assertNextRun("0 0 1 1 *", datetime(2026, 6, 1), datetime(2027, 1, 1, 0, 0))
+
+    def test_weekday_range(self):
+        # Friday 9 January 2026, after the morning run: next is Monday
+        self.assertNextRun("0 9 * * 1-5", datetime(2026, 1, 9, 10, 0), datetime(2026, 1, 12, 9, 0))
+        self.assertNextRun("0 0 * * 7", datetime(2026, 1, 1), datetime(2026, 1, 4, 0, 0))
+
+    def test_day_of_month_or_day_of_week(self):
+        # Both restricted: the 13th or any Friday, whichever comes first
+        self.assertNextRun("0 0 13 * 5", datetime(2026, 1, 1), datetime(2026, 1, 2, 0, 0))
+        self.assertNextRun("0 0 13 * 5", datetime(2026, 1, 9), datetime(2026, 1, 13, 0, 0))
+        # Only one restricted: that one alone decides
+        self.assertNextRun("0 0 13 * *", datetime(2026, 1, 1), datetime(2026, 1, 13, 0, 0))
+        self.assertNextRun("0 0 * * 5", datetime(2026, 1, 3), datetime(2026, 1, 9, 0, 0))
+        # A stepped "*" day field still restricts, but does not switch to OR
+        self.assertNextRun("0 0 */2 * 1", datetime(2026, 1, 6), datetime(2026, 1, 19, 0, 0))
+
+    def test_29_february(self):
+        self.assertNextRun("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 0))
+        self.assertNextRun("0 12 29 2 *", datetime(2028, 2, 29, 12, 0), datetime(2032, 2, 29, 12, 0))
+
+    def test_never_fires(self):
+        with self.assertRaises(ValueError):
+            next_run("0 0 30 2 *", datetime(2026, 1, 1))
+        with self.assertRaises(ValueError):
+            next_run("0 0 31 4,6,9,11 *", datetime(2026, 1, 1))
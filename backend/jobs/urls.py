@@ -0,0 +1,8 @@
+from django.urls import path
+from .api_views import JobCancelView, JobDetailView, JobListView
+
+urlpatterns = [
+    path("", JobListView.as_view(), name="job_list"),
+    path("<int:pk>/", JobDetailView.as_view(), name="job_detail"),
+    path("<int:pk>/cancel/", JobCancelView.as_view(), name="job_cancel"),
+]
@@ -0,0 +1,337 @@
+"""
+The job worker: claims queued jobs and runs them on a thread or process pool.
+
+Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+workers on any number of hosts can poll the same table without handing a
+job out twice. The worker heartbeats the jobs it holds; a running job whose
+heartbeat goes stale (its worker was killed) is requeued by whichever worker
+notices first.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.tenancy import operator_scope
+from . import cron
+from .models import Job, JobStatus, PeriodicJob
+from .registry import TASKS, _current_claim, enqueue
+
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 15
+BACKOFF_MAX_SECONDS = 3600
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def retry_delay(attempts):
+    """ Exponential backoff with jitter, so failing jobs do not retry in lockstep """
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+# ============================
+# QUEUE OPERATIONS
+# ============================
+
+def claim_jobs(worker, limit):
+    """
+    Atomically mark up to ``limit`` due jobs as running under ``worker`` and
+    return (id, attempt) pairs; the pair identifies this claim of the job.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            Job.objects
+            .filter(status=JobStatus.QUEUED, run_after__lte=now)
+            .order_by("-priority", "run_after", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:limit]
+        )
+        if job_ids:
+            Job.objects.filter(id__in=job_ids).update(
+                status=JobStatus.RUNNING,
+                locked_by=worker,
+                started_at=now,
+                heartbeat_at=now,
+                finished_at=None,
+                attempts=F("attempts") + 1,
+                progress=0,
+                progress_message="",
+            )
+            attempts = dict(Job.objects.filter(id__in=job_ids).values_list("id", "attempts"))
+            return [(job_id, attempts[job_id]) for job_id in job_ids]
+    return []
+
+
+def _claimed(job_id, worker, attempt):
+    """
+    The job while it is still running under this claim. A job requeued as
+    stale and claimed again must not be settled by its first worker.
+    """
+    return Job.objects.filter(pk=job_id, status=JobStatus.RUNNING, locked_by=worker, attempts=attempt)
+
+
+def record_failure(job_id, error, worker, attempt):
+    """ Requeue a failed attempt with backoff, or fail the job once its attempts are used up """
+    now = timezone.now()
+    job = _claimed(job_id, worker, attempt).only("attempts", "max_attempts").first()
+    if job is None:
+        return None
+    if job.attempts < job.max_attempts:
+        _claimed(job_id, worker, attempt).update(
+            status=JobStatus.QUEUED,
+            run_after=now + retry_delay(job.attempts),
+            locked_by="",
+            heartbeat_at=None,
+            error=error,
+        )
+        return JobStatus.QUEUED
+    _claimed(job_id, worker, attempt).update(
+        status=JobStatus.FAILED,
+        finished_at=now,
+        heartbeat_at=None,
+        error=error,
+    )
+    return JobStatus.FAILED
+
+
+def execute_job(job_id, worker, attempt):
+    """ Run one claimed job and record its outcome; called inside a pool thread or process """
+    close_old_connections()
+    token = _current_claim.set((job_id, worker, attempt))
+    try:
+        job = Job.objects.only("task", "kwargs", "operator_id").get(pk=job_id)
+        registered = TASKS.get(job.task)
+        if registered is None:
+            # Retrying cannot help; fail straight away
+            _claimed(job_id, worker, attempt).update(
+                status=JobStatus.FAILED,
+                finished_at=timezone.now(),
+                error=f"Unknown task '{job.task}'.",
+            )
+            return JobStatus.FAILED
+        try:
+            with operator_scope(job.operator_id):
+                result = registered.function(**job.kwargs)
+            # Fail the attempt here rather than on the UPDATE below
+            json.dumps(result, cls=DjangoJSONEncoder)
+        except Exception:
+            logger.exception("Job %s (%s) failed", job_id, job.task)
+            return record_failure(job_id, traceback.format_exc(), worker, attempt)
+        succeeded = _claimed(job_id, worker, attempt).update(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            progress=100,
+            finished_at=timezone.now(),
+            heartbeat_at=None,
+            error="",
+        )
+        return JobStatus.SUCCEEDED if succeeded else None
+    finally:
+        _current_claim.reset(token)
+        close_old_connections()
+
+
+def requeue_stale_jobs(stale_after):
+    """ Recover jobs whose worker stopped heartbeating; returns how many were recovered """
+    now = timezone.now()
+    stale = Job.objects.filter(status=JobStatus.RUNNING, heartbeat_at__lt=now - stale_after)
+    error = "The worker running this job stopped responding."
+    requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+        status=JobStatus.QUEUED, run_after=now, locked_by="", heartbeat_at=None, error=error,
+    )
+    failed = stale.update(status=JobStatus.FAILED, finished_at=now, heartbeat_at=None, error=error)
+    return requeued + failed
+
+
+# ============================
+# PERIODIC SCHEDULES
+# ============================
+
+def sync_periodic_jobs():
+    """
+    Create or update the schedules declared in settings.JOBS_PERIODIC.
+
+    Schedules created in the admin are left alone; a declared schedule whose
+    cron expression changes is rescheduled from now.
+    """
+    for declared in getattr(settings, "JOBS_PERIODIC", []):
+        cron.parse(declared["cron"])
+        periodic, created = PeriodicJob.objects.get_or_create(
+            name=declared["name"],
+            defaults={
+                "task": declared["task"],
+                "cron": declared["cron"],
+                "kwargs": declared.get("kwargs", {}),
+                "priority": declared.get("priority", 0),
+            },
+        )
+        if created:
+            continue
+        changes = {
+            "task": declared["task"],
+            "cron": declared["cron"],
+            "kwargs": declared.get("kwargs", {}),
+            "priority": declared.get("priority", 0),
+        }
+        if any(getattr(periodic, field) != value for field, value in changes.items()):
+            if periodic.cron != changes["cron"]:
+                changes["next_run_at"] = None
+            PeriodicJob.objects.filter(pk=periodic.pk).update(**changes)
+
+
+def enqueue_due_periodic_jobs():
+    """
+    Enqueue a job for every schedule that has come due and advance it.
+
+    Runs missed while no worker was up collapse into a single job, and no
+    job is added while the previous one from the same schedule is still
+    queued or running. Returns the number of jobs enqueued.
+    """
+    now = timezone.now()
+    enqueued = 0
+    with transaction.atomic():
+        due = (
+            PeriodicJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(next_run_at__lte=now) | Q(next_run_at__isnull=True), enabled=True)
+        )
+        for periodic in due:
+            if periodic.next_run_at is not None and periodic.task in TASKS:
+                pending = periodic.jobs.filter(status__in=[JobStatus.QUEUED, JobStatus.RUNNING]).exists()
+                if not pending:
+                    enqueue(periodic.task, kwargs=periodic.kwargs, priority=periodic.priority, periodic_job=periodic)
+                    periodic.last_enqueued_at = now
+                    enqueued += 1
+            elif periodic.task not in TASKS:
+                logger.warning("Periodic job '%s' names unknown task '%s'", periodic.name, periodic.task)
+            periodic.next_run_at = cron.next_run(periodic.cron, now)
+            periodic.save(update_fields=["next_run_at", "last_enqueued_at"])
+    return enqueued
+
+
+# ============================
+# WORKER LOOP
+# ============================
+
+class Worker:
+    """
+    Poll the queue and keep up to ``concurrency`` jobs running.
+
+    ``mode="thread"`` suits jobs that mostly wait on the database;
+    ``mode="process"`` suits CPU-bound jobs such as NumPy work on large
+    arrays. Each thread or process holds its own database connection.
+    """
+
+    def __init__(self, concurrency=4, mode="thread", poll_interval=1.0, stale_after=None, name=None):
+        if mode not in ("thread", "process"):
+            raise ValueError("mode must be 'thread' or 'process'.")
+        self.concurrency = concurrency
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after or timedelta(seconds=getattr(settings, "JOBS_STALE_AFTER", 300))
+        self.name = name or worker_name()
+        self._stopping = threading.Event()
+
+    def _make_pool(self):
+        if self.mode == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                # Spawned processes set Django up (and register tasks) themselves
+                initializer=django.setup,
+            )
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job")
+
+    def stop(self, *args):
+        if not self._stopping.is_set():
+            logger.info("Worker %s stopping once running jobs finish", self.name)
+        self._stopping.set()
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def _housekeeping(self, in_flight):
+        if in_flight:
+            for job_id, attempt in in_flight.values():
+                _claimed(job_id, self.name, attempt).update(heartbeat_at=timezone.now())
+        requeue_stale_jobs(self.stale_after)
+        enqueue_due_periodic_jobs()
+        close_old_connections()
+
+    def _collect(self, pool, in_flight):
+        """ Wait up to one poll interval for running jobs; returns the (possibly replaced) pool and count done """
+        done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            job_id, attempt = in_flight.pop(future)
+            if future.exception() is not None:
+                # Only reached when the pool itself failed, e.g. a process was killed
+                record_failure(job_id, repr(future.exception()), self.name, attempt)
+                broken = broken or isinstance(future.exception(), BrokenProcessPool)
+        if broken and not self._stopping.is_set():
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = self._make_pool()
+        return pool, len(done)
+
+    def run(self, burst=False):
+        """
+        Work until stopped by SIGTERM/SIGINT, letting running jobs finish.
+
+        With ``burst`` the worker exits as soon as the queue is empty.
+        Returns the number of jobs processed.
+        """
+        self._install_signal_handlers()
+        sync_periodic_jobs()
+        pool = self._make_pool()
+        in_flight = {}
+        processed = 0
+        logger.info("Worker %s started (%s x %s)", self.name, self.concurrency, self.mode)
+        try:
+            while not self._stopping.is_set():
+                self._housekeeping(in_flight)
+                free = self.concurrency - len(in_flight)
+                if free > 0:
+                    for job_id, attempt in claim_jobs(self.name, free):
+                        in_flight[pool.submit(execute_job, job_id, self.name, attempt)] = (job_id, attempt)
+                if not in_flight:
+                    if burst:
+                        break
+                    self._stopping.wait(self.poll_interval)
+                    continue
+                pool, finished = self._collect(pool, in_flight)
+                processed += finished
+            # Drain: keep heartbeating so running jobs are not taken for stale
+            while in_flight:
+                self._housekeeping(in_flight)
+                pool, finished = self._collect(pool, in_flight)
+                processed += finished
+        finally:
+            pool.shutdown(wait=True)
+            close_old_connections()
+            logger.info("Worker %s stopped after %s jobs", self.name, processed)
+        return processed
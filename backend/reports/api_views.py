@@ -0,0 +1,64 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from aircraft.models import Aircraft
+from jobs.api_views import visible_jobs
+from jobs.models import JobStatus
+from .data import parse_month
+from .rendering import REPORT_KINDS, PreparedReport
+from .tasks import render_monthly_reports
+
+
+class ReportDownloadView(APIView):
+    """
+    One aircraft's monthly report as a PDF.
+
+    A report whose data has not changed since it was last rendered is served
+    straight from storage. Otherwise a render job is queued and the response
+    is 202 with the job to poll; request the report again once it succeeds.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, kind, aircraft_id, month):
+        if kind not in REPORT_KINDS:
+            raise Http404(f"Unknown report '{kind}'.")
+        try:
+            month = parse_month(month)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        aircraft = get_object_or_404(Aircraft, pk=aircraft_id)
+
+        report = PreparedReport(kind, aircraft, month)
+        if report.is_cached():
+            etag = f'"{report.digest}"'
+            if etag in request.headers.get("If-None-Match", ""):
+                return HttpResponseNotModified(headers={"ETag": etag})
+            response = FileResponse(
+                default_storage.open(report.path, "rb"),
+                as_attachment=True,
+                filename=report.filename,
+                content_type="application/pdf",
+            )
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            return response
+
+        kwargs = {"month": f"{month:%Y-%m}", "aircraft_ids": [aircraft.pk], "kinds": [kind]}
+        job = visible_jobs(request.user).filter(
+            task=render_monthly_reports.name,
+            kwargs=kwargs,
+            status__in=[JobStatus.QUEUED, JobStatus.RUNNING],
+        ).first()
+        if job is None:
+            # Ahead of batch work: someone is waiting for this one
+            job = render_monthly_reports.enqueue(kwargs=kwargs, priority=10, created_by=request.user)
+        return Response(
+            {"job": job.pk, "status": job.status},
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/api/jobs/{job.pk}/", "Retry-After": "2"},
+        )
@@ -0,0 +1,113 @@
+"""
+The data behind each report, gathered into plain JSON-serializable dicts.
+
+A report's PDF is cached under a hash of this data, so anything that changes
+what the report shows must be part of it and nothing else should be.
+"""
+from datetime import date, timedelta
+
+from django.db.models import Avg, Count, F, Max, Sum
+
+from aircraft.models import Flight
+from analytics.models import EngineDeviation
+from engines.models import Engine
+from finance.models import MonthlyExpenseSummary, MonthlyFuelSummary
+
+
+def parse_month(value):
+    """ Parse ``YYYY-MM`` into the first day of that month """
+    try:
+        year, month = (int(part) for part in value.split("-"))
+        return date(year, month, 1)
+    except ValueError:
+        raise ValueError(f"'{value}' is not a month in YYYY-MM format.") from None
+
+
+def previous_month(today=None):
+    today = today or date.today()
+    return (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+
+def month_end(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def _aircraft_header(aircraft, month):
+    return {
+        "aircraft": {
+            "id": aircraft.pk,
+            "registration": aircraft.registration,
+            "manufacturer": aircraft.get_manufacturer_display(),
+            "model": aircraft.model,
+            "serial": aircraft.serial,
+        },
+        "month": month.isoformat(),
+        "month_label": f"{month:%B %Y}",
+    }
+
+
+def monthly_cost_data(aircraft, month):
+    """ Expense and fuel totals for one aircraft and month, with cost per flight hour """
+    expenses = list(
+        MonthlyExpenseSummary.objects.filter(aircraft=aircraft, month=month)
+        .values("expense_type", "total_amount", "entry_count").order_by("expense_type")
+    )
+    fuel = list(
+        MonthlyFuelSummary.objects.filter(aircraft=aircraft, month=month)
+        .values("fuel_type", "total_amount", "entry_count").order_by("fuel_type")
+    )
+    utilization = Flight.objects.filter(
+        aircraft=aircraft, flight_date__range=(month, month_end(month))
+    ).aggregate(flights=Count("id"), hours=Sum("hours_flown"))
+
+    total = sum(row["total_amount"] for row in expenses) + sum(row["total_amount"] for row in fuel)
+    hours = utilization["hours"]
+    return {
+        **_aircraft_header(aircraft, month),
+        "expenses": expenses,
+        "fuel": fuel,
+        "flights": utilization["flights"],
+        "hours": hours,
+        "total": total,
+        "cost_per_hour": round(total / hours, 2) if hours else None,
+    }
+
+
+def engine_health_data(aircraft, month):
+    """ Time since overhaul and mean ECTM deviations of each installed engine for one month """
+    engines = list(
+        Engine.objects.filter(aircraft=aircraft)
+        .values(
+            "id", "position", "model", "serial", "time_since_new", "cycles_since_new",
+            "time_since_overhaul", "time_between_overhauls",
+        )
+        .order_by("position")
+    )
+    deviations = {
+        row["engine_id"]: row
+        for row in (
+            EngineDeviation.objects
+            .filter(
+                engine_data__flight__aircraft=aircraft,
+                engine_data__flight_date__range=(month, month_end(month)),
+            )
+            .values(engine_id=F("engine_data__engine_id"))
+            .annotate(
+                snapshots=Count("engine_data"),
+                n1=Avg("n1_deviation"),
+                n2=Avg("n2_deviation"),
+                itt=Avg("itt_deviation"),
+                itt_max=Max("itt_deviation"),
+                ff=Avg("ff_deviation"),
+            )
+            .order_by()
+        )
+    }
+    for row in deviations.values():
+        # Rounded so float noise between databases does not change the content hash
+        for name in ("n1", "n2", "itt", "itt_max", "ff"):
+            row[name] = None if row[name] is None else round(row[name], 3)
+    for engine in engines:
+        engine["hours_remaining"] = engine["time_between_overhauls"] - engine["time_since_overhaul"]
+        engine["deviations"] = deviations.get(engine["id"])
+    return {**_aircraft_header(aircraft, month), "engines": engines}
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aircraft.models import Aircraft
+from reports.data import parse_month, previous_month
+from reports.rendering import REPORT_KINDS, render_reports
+
+
+class Command(BaseCommand):
+    help = "Render the monthly PDF reports of every aircraft, skipping those whose data has not changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", help="Month as YYYY-MM (default: last month)")
+        parser.add_argument("--aircraft", type=int, action="append", help="Aircraft id (repeatable)")
+        parser.add_argument("--kind", choices=list(REPORT_KINDS), action="append", help="Report kind (repeatable)")
+        parser.add_argument("--processes", type=int, help="Renderer processes (default: one per CPU)")
+        parser.add_argument("--force", action="store_true", help="Re-render cached reports too")
+
+    def handle(self, *args, **options):
+        try:
+            month = parse_month(options["month"]) if options["month"] else previous_month()
+        except ValueError as exc:
+            raise CommandError(exc)
+        aircraft_list = Aircraft.objects.order_by("pk")
+        if options["aircraft"]:
+            aircraft_list = aircraft_list.filter(pk__in=options["aircraft"])
+
+        started = time.perf_counter()
+        rendered, cached = render_reports(
+            list(aircraft_list),
+            month,
+            kinds=options["kind"],
+            processes=options["processes"],
+            force=options["force"],
+            on_rendered=lambda report: self.stdout.write(f"Rendered {report.path}"),
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{month:%Y-%m}: rendered {rendered} reports, {cached} unchanged, in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,30 @@
+"""
+HTML to PDF conversion with WeasyPrint.
+
+This module imports nothing from Django so that renderer processes start
+quickly. WeasyPrint itself is imported on first use: it needs system
+libraries (Pango) that are only installed where reports are rendered.
+"""
+_stylesheets = {}
+_font_config = None
+
+
+def _resources(stylesheet_path):
+    """ The parsed stylesheet and font configuration, built once per process """
+    global _font_config
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    if _font_config is None:
+        _font_config = FontConfiguration()
+    if stylesheet_path not in _stylesheets:
+        _stylesheets[stylesheet_path] = CSS(filename=stylesheet_path, font_config=_font_config)
+    return _stylesheets[stylesheet_path], _font_config
+
+
+def render_pdf(html, stylesheet_path):
+    """ Render an HTML document to PDF bytes, reusing this process's parsed stylesheet and fonts """
+    from weasyprint import HTML
+
+    stylesheet, font_config = _resources(stylesheet_path)
+    return HTML(string=html).write_pdf(stylesheets=[stylesheet], font_config=font_config)
@@ -0,0 +1,137 @@
+"""
+Rendering of per-aircraft PDF reports, cached by the content they show.
+
+The data of a report is gathered and hashed first; a PDF whose hash is
+already in storage is served as is. Only the reports that changed are
+rendered, spread over a pool of processes. HTML is produced here by the
+template engine and converted to PDF in the pool (see reports.pdf), where
+each process keeps its parsed stylesheet and fonts between renders.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import get_template, render_to_string
+
+from .data import engine_health_data, monthly_cost_data
+from .pdf import render_pdf
+
+
+STYLESHEET = str(Path(__file__).resolve().parent / "static" / "reports" / "report.css")
+
+
+class ReportKind:
+    def __init__(self, title, template, build_data):
+        self.title = title
+        self.template = template
+        self.build_data = build_data
+
+
+REPORT_KINDS = {
+    "monthly_cost": ReportKind("Monthly Cost Report", "reports/monthly_cost.html", monthly_cost_data),
+    "engine_health": ReportKind("Engine Health Report", "reports/engine_health.html", engine_health_data),
+}
+
+
+@lru_cache(maxsize=None)
+def _layout_digest(kind):
+    """ Hash of the template and stylesheet, so a layout change re-renders every report """
+    digest = hashlib.sha256()
+    for template_name in (REPORT_KINDS[kind].template, "reports/base.html"):
+        digest.update(Path(get_template(template_name).origin.name).read_bytes())
+    digest.update(Path(STYLESHEET).read_bytes())
+    return digest.hexdigest()
+
+
+def content_hash(kind, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(f"{_layout_digest(kind)}:{payload}".encode()).hexdigest()
+
+
+def report_directory(kind, aircraft_id):
+    return f"reports/{kind}/{aircraft_id}"
+
+
+def report_path(kind, aircraft_id, month, digest):
+    return f"{report_directory(kind, aircraft_id)}/{month:%Y-%m}-{digest[:20]}.pdf"
+
+
+class PreparedReport:
+    """ One report's data, content hash and storage path """
+
+    def __init__(self, kind, aircraft, month):
+        self.kind = kind
+        self.aircraft_id = aircraft.pk
+        self.month = month
+        self.data = REPORT_KINDS[kind].build_data(aircraft, month)
+        self.digest = content_hash(kind, self.data)
+        self.path = report_path(kind, aircraft.pk, month, self.digest)
+
+    @property
+    def filename(self):
+        return f"{self.kind}-{self.data['aircraft']['registration']}-{self.month:%Y-%m}.pdf"
+
+    def is_cached(self):
+        return default_storage.exists(self.path)
+
+    def html(self):
+        return render_to_string(
+            REPORT_KINDS[self.kind].template,
+            {**self.data, "title": REPORT_KINDS[self.kind].title},
+        )
+
+    def store(self, pdf):
+        """ Save the rendered PDF and remove older renders of the same report """
+        directory = report_directory(self.kind, self.aircraft_id)
+        if default_storage.exists(directory):
+            for name in default_storage.listdir(directory)[1]:
+                if name.startswith(f"{self.month:%Y-%m}-") and f"{directory}/{name}" != self.path:
+                    default_storage.delete(f"{directory}/{name}")
+        if not default_storage.exists(self.path):
+            default_storage.save(self.path, ContentFile(pdf))
+
+
+def render_reports(aircraft_list, month, kinds=None, processes=None, force=False, on_rendered=None):
+    """
+    Bring the given reports of each aircraft for ``month`` up to date.
+
+    Returns (rendered, cached) counts. Up to ``processes`` (default: one per
+    CPU) renderer processes are started, and none at all when everything is
+    cached. ``on_rendered`` is called with each report once it is stored.
+    """
+    pending = []
+    cached = 0
+    for aircraft in aircraft_list:
+        for kind in kinds or REPORT_KINDS:
+            report = PreparedReport(kind, aircraft, month)
+            if not force and report.is_cached():
+                cached += 1
+            else:
+                pending.append(report)
+    if not pending:
+        return 0, cached
+
+    workers = min(len(pending), processes or os.cpu_count() or 1)
+    if workers == 1:
+        # Not worth starting a process; this one keeps its own warm renderer
+        for report in pending:
+            report.store(render_pdf(report.html(), STYLESHEET))
+            if on_rendered is not None:
+                on_rendered(report)
+        return len(pending), cached
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(render_pdf, report.html(), STYLESHEET): report for report in pending}
+        for future in as_completed(futures):
+            report = futures[future]
+            report.store(future.result())
+            if on_rendered is not None:
+                on_rendered(report)
+    return len(pending), cached
@@ -0,0 +1,23 @@
+from aircraft.models import Aircraft
+from jobs.registry import report_progress, task
+from .data import parse_month, previous_month
+from .rendering import REPORT_KINDS, render_reports
+
+
+@task()
+def render_monthly_reports(month=None, aircraft_ids=None, kinds=None, force=False):
+    """ Render the reports of ``month`` (YYYY-MM, default last month) that are not cached yet """
+    month = parse_month(month) if month else previous_month()
+    aircraft_list = Aircraft.objects.order_by("pk")
+    if aircraft_ids:
+        aircraft_list = aircraft_list.filter(pk__in=aircraft_ids)
+    aircraft_list = list(aircraft_list)
+    expected = len(aircraft_list) * len(kinds or REPORT_KINDS)
+    done = []
+
+    def progress(report):
+        done.append(report.path)
+        report_progress(len(done) * 100 / expected, f"{len(done)} reports rendered")
+
+    rendered, cached = render_reports(aircraft_list, month, kinds=kinds, force=force, on_rendered=progress)
+    return {"month": f"{month:%Y-%m}", "rendered": rendered, "cached": cached}
@@ -0,0 +1,6 @@
+from django.urls import path
+from .api_views import ReportDownloadView
+
+urlpatterns = [
+    path("<str:kind>/<int:aircraft_id>/<str:month>/", ReportDownloadView.as_view(), name="report_download"),
+]
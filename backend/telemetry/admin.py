@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import TelemetryRecording
+
+
+@admin.register(TelemetryRecording)
+class TelemetryRecordingAdmin(admin.ModelAdmin):
+    """ Read-only: recordings are stored through the API (see telemetry.store) """
+
+    list_display = ("flight", "operator", "started_at", "sample_interval", "sample_count", "stored_bytes", "created_at")
+    list_filter = ("operator",)
+    search_fields = ("flight__aircraft__registration",)
+    ordering = ("-created_at",)
+    list_select_related = ("flight", "operator")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,71 @@
+import math
+
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from aircraft.models import Flight
+from .models import TelemetryRecording
+from .parsers import read_telemetry_csv
+from .serializers import TelemetryRecordingSerializer
+from .store import DEFAULT_MAX_POINTS, read_series, store_recording
+
+
+MAX_POINTS = 20000
+
+
+def _float_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = math.nan
+    if not math.isfinite(seconds):
+        raise ValueError(f"'{name}' must be a number of seconds.")
+    return seconds
+
+
+class FlightTelemetryView(APIView):
+    """
+    Recorder data of one flight.
+
+    GET returns the recording and the ``series`` asked for (all by default)
+    between ``start`` and ``end`` seconds, merged into at most ``max_points``
+    buckets with their minimum and maximum. POST stores a recorder CSV
+    ``file`` (time in seconds, then one column per series), replacing any
+    earlier recording, and updates the flight's cruise snapshots from it.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def get(self, request, flight_id):
+        recording = get_object_or_404(TelemetryRecording, flight_id=flight_id)
+        requested = request.query_params.get("series")
+        names = requested.split(",") if requested else recording.series
+        try:
+            start = _float_param(request, "start")
+            end = _float_param(request, "end")
+            max_points = request.query_params.get("max_points") or str(DEFAULT_MAX_POINTS)
+            if not max_points.isdecimal() or not 0 < int(max_points) <= MAX_POINTS:
+                raise ValueError(f"'max_points' must be a whole number from 1 to {MAX_POINTS}.")
+            data = read_series(recording, names, start, end, int(max_points))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({**TelemetryRecordingSerializer(recording).data, **data})
+
+    def post(self, request, flight_id):
+        flight = get_object_or_404(Flight, pk=flight_id)
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "No file uploaded."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            interval, series = read_telemetry_csv(upload)
+            recording = store_recording(flight, series, interval)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TelemetryRecordingSerializer(recording).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,89 @@
+"""
+Compression of recorder parameter series.
+
+A series is rounded to its parameter's resolution, which turns it into a
+run of integers. Consecutive recorder samples differ by little, so their
+first differences are small; these are zigzag-encoded and split into byte
+planes (every low byte, then every second byte, ...), so that the mostly
+zero high bytes form long runs, and deflated with zlib. Gaps (NaN) are kept
+in a bitmap and bridged by repeating the last value, which costs nothing in
+the differences.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+
+# Parameter -> resolution the series is stored at. Airframe parameters are
+# recorded once; engine parameters once per engine, as "<parameter>.<position>".
+AIRFRAME_PARAMETERS = {
+    "press_altitude": 1.0,
+    "outside_air_temp": 0.1,
+    "indicated_air_speed": 1.0,
+    "mach_number": 0.001,
+}
+ENGINE_PARAMETERS = {
+    "SpeedN1": 0.1,
+    "SpeedN2": 0.1,
+    "EnginePR": 0.01,
+    "InterstageTT": 0.1,
+    "EngineFF": 1.0,
+    "OilPress": 1.0,
+    "OilTemp": 1.0,
+    "EngineVib": 0.01,
+}
+MAX_ENGINE_POSITION = 4
+
+_HEADER = struct.Struct("<II")
+
+
+def parse_series_name(name):
+    """ Split a series name into (parameter, engine position or None); ValueError if unknown """
+    parameter, _, position = name.partition(".")
+    if not position and parameter in AIRFRAME_PARAMETERS:
+        return parameter, None
+    if parameter in ENGINE_PARAMETERS and position.isdecimal() and 1 <= int(position) <= MAX_ENGINE_POSITION:
+        return parameter, int(position)
+    raise ValueError(f"Unknown series '{name}'.")
+
+
+def resolution(name):
+    parameter, position = parse_series_name(name)
+    return (AIRFRAME_PARAMETERS if position is None else ENGINE_PARAMETERS)[parameter]
+
+
+def encode(values, step):
+    """ Compress a float array stored at resolution ``step`` """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    quantized = np.rint(values / step)
+    if missing.any():
+        # Carry the last value (or the first present one) through each gap
+        positions = np.where(missing, 0, np.arange(len(values)))
+        np.maximum.accumulate(positions, out=positions)
+        quantized = quantized[positions]
+        quantized[np.isnan(quantized)] = 0
+        mask = zlib.compress(np.packbits(missing).tobytes(), 9)
+    else:
+        mask = b""
+    deltas = np.diff(quantized.astype(np.int64), prepend=0).astype(np.int32)
+    zigzag = ((deltas << 1) ^ (deltas >> 31)).view(np.uint32)
+    planes = zigzag.astype("<u4").view(np.uint8).reshape(-1, 4).T
+    return _HEADER.pack(len(values), len(mask)) + mask + zlib.compress(planes.tobytes(), 9)
+
+
+def decode(payload, step):
+    """ Decompress an array written by encode() """
+    count, mask_length = _HEADER.unpack_from(payload)
+    offset = _HEADER.size
+    planes = np.frombuffer(zlib.decompress(payload[offset + mask_length:]), dtype=np.uint8).reshape(4, count)
+    zigzag = np.ascontiguousarray(planes.T).view("<u4").ravel().astype(np.int64)
+    deltas = (zigzag >> 1) ^ -(zigzag & 1)
+    values = np.cumsum(deltas) * step
+    if mask_length:
+        missing = np.unpackbits(
+            np.frombuffer(zlib.decompress(payload[offset:offset + mask_length]), dtype=np.uint8), count=count
+        ).astype(bool)
+        values[missing] = np.nan
+    return values
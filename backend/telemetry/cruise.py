@@ -0,0 +1,116 @@
+"""
+Cruise snapshots from recorder data.
+
+The cruise window is the highest stretch of CRUISE_WINDOW_SECONDS over which
+the pressure altitude stays within CRUISE_ALTITUDE_BAND. The medians of the
+series over it make one FlightEngineData snapshot per engine, the reading a
+crew would take by hand in stable cruise.
+"""
+import warnings
+from decimal import Decimal
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from numpy.lib.stride_tricks import sliding_window_view
+
+from aircraft.models import FlightEngineData
+from engines.models import Engine
+from .codec import AIRFRAME_PARAMETERS, ENGINE_PARAMETERS, parse_series_name
+
+
+CRUISE_WINDOW_SECONDS = 300
+CRUISE_ALTITUDE_BAND = 200
+
+# Altitude is summarised in blocks of a tenth of the window, so finding the
+# window takes time linear in the length of the recording
+BLOCKS_PER_WINDOW = 10
+
+
+def cruise_window(altitude, interval):
+    """ (first, end) sample indices of the cruise window, or None if the flight never levels off """
+    block = max(1, round(CRUISE_WINDOW_SECONDS / interval / BLOCKS_PER_WINDOW))
+    blocks = len(altitude) // block
+    if blocks < BLOCKS_PER_WINDOW:
+        return None
+    grid = altitude[:blocks * block].reshape(blocks, block)
+    # Blocks with gaps come out NaN and never count as level
+    low = sliding_window_view(grid.min(axis=1), BLOCKS_PER_WINDOW).min(axis=1)
+    high = sliding_window_view(grid.max(axis=1), BLOCKS_PER_WINDOW).max(axis=1)
+    level = sliding_window_view(grid.mean(axis=1), BLOCKS_PER_WINDOW).mean(axis=1)
+    stable = np.flatnonzero(high - low <= CRUISE_ALTITUDE_BAND)
+    if not len(stable):
+        return None
+    first = int(stable[np.argmax(level[stable])])
+    return first * block, (first + BLOCKS_PER_WINDOW) * block
+
+
+def _field_value(name, value):
+    """ A median as the snapshot field's value; None when missing or outside the field's range """
+    if np.isnan(value):
+        return None
+    field = FlightEngineData._meta.get_field(name)
+    if field.get_internal_type() == "DecimalField":
+        value = Decimal(f"{value:.{field.decimal_places}f}")
+    else:
+        value = int(round(value))
+    try:
+        field.run_validators(value)
+    except ValidationError:
+        return None
+    return value
+
+
+def cruise_readings(series, interval):
+    """
+    The cruise window and, per engine position with recorded parameters, the
+    snapshot field values over it. The readings are empty when the airframe
+    readings are missing, and the window is None when the flight never
+    levels off.
+    """
+    altitude = series.get("press_altitude")
+    window = None if altitude is None else cruise_window(altitude, interval)
+    if window is None:
+        return None, {}
+    first, end = window
+    with warnings.catch_warnings():
+        # All-NaN slices are series not recorded in cruise
+        warnings.simplefilter("ignore", RuntimeWarning)
+        medians = {name: float(np.nanmedian(values[first:end])) for name, values in series.items()}
+    airframe = {
+        name: _field_value(name, medians[name]) for name in AIRFRAME_PARAMETERS if name in medians
+    }
+    if airframe.get("press_altitude") is None or airframe.get("outside_air_temp") is None:
+        return window, {}
+
+    positions = {position for _, position in map(parse_series_name, series) if position is not None}
+    readings = {}
+    for position in positions:
+        readings[position] = {**airframe, **{
+            name: _field_value(name, medians[f"{name}.{position}"])
+            for name in ENGINE_PARAMETERS if f"{name}.{position}" in medians
+        }}
+    return window, readings
+
+
+def save_cruise_snapshots(flight, series, interval):
+    """
+    Write the cruise snapshot of every installed engine with recorded
+    parameters, updating the flight's existing snapshot of that engine if
+    there is one. Returns the cruise window, or None when there is none.
+    """
+    window, readings = cruise_readings(series, interval)
+    if not readings:
+        return window
+
+    engines = Engine.objects.filter(aircraft_id=flight.aircraft_id, position__in=readings).order_by("position")
+    existing = {}
+    for snapshot in FlightEngineData.objects.filter(flight_id=flight.pk, engine__in=engines).order_by("id"):
+        existing.setdefault(snapshot.engine_id, snapshot)
+    for engine in engines:
+        snapshot = existing.get(engine.pk) or FlightEngineData(flight=flight, engine=engine)
+        for name, value in readings[engine.position].items():
+            # Keep what an earlier entry had for parameters not recorded
+            if value is not None or snapshot.pk is None:
+                setattr(snapshot, name, value)
+        snapshot.save()
+    return window
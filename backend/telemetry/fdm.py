@@ -0,0 +1,140 @@
+"""
+Parallel parsing of flight data monitoring (FDM/QAR) exports.
+
+An export is a CSV of a whole aircraft-month: a header naming ``time`` (UTC
+Unix seconds) and series as in telemetry.codec, then a row per sample of
+every flight, in time order. The file is memory-mapped and cut into chunks
+that end on line boundaries; each chunk is parsed into arrays in a pool of
+processes by numpy's C reader, so no Python object is built per row.
+
+The chunks come back in file order and are cut into flights wherever the
+recording stops for more than FLIGHT_GAP_SECONDS. Nothing here touches
+Django, so the parser processes start without it.
+"""
+import io
+import mmap
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .parsers import read_header
+
+
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# A longer stop in the recording ends the flight
+FLIGHT_GAP_SECONDS = 600
+
+
+def read_file_header(path):
+    """ (column names, offset of the first data line) of an export """
+    with open(path, "rb") as stream:
+        line = stream.readline()
+        return read_header(line), len(line)
+
+
+def chunk_bounds(path, offset, chunk_bytes=CHUNK_BYTES):
+    """ (start, end) byte ranges of about ``chunk_bytes`` from ``offset``, each ending after a newline """
+    size = os.path.getsize(path)
+    if size <= offset:
+        return []
+    bounds = []
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = offset
+        while start < size:
+            newline = data.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if newline == -1 else newline + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def parse_chunk(path, start, end, column_count):
+    """
+    Parse the lines between byte offsets ``start`` and ``end`` into (times,
+    values): float64 seconds and a float32 row per sample, NaN for empty
+    cells. Values are stored at no finer than 0.001, well within float32.
+    """
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end]
+    # The C reader has no notion of an empty cell; spell them out first.
+    # Each pass fills every other one of a run of empty cells.
+    text = b"\n" + text.replace(b"\r", b"") + b"\n"
+    for _ in range(2):
+        text = text.replace(b",,", b",nan,")
+    text = text.replace(b"\n,", b"\nnan,").replace(b",\n", b",nan\n")
+    try:
+        rows = np.loadtxt(io.BytesIO(text), delimiter=",", dtype=np.float64, ndmin=2)
+    except ValueError as exc:
+        raise ValueError(f"Bytes {start}-{end}: {exc}") from None
+    if rows.size == 0:
+        return np.empty(0), np.empty((0, column_count - 1), dtype=np.float32)
+    if rows.shape[1] != column_count:
+        raise ValueError(f"Bytes {start}-{end}: rows have {rows.shape[1]} columns but the header names {column_count}.")
+    return rows[:, 0].copy(), rows[:, 1:].astype(np.float32)
+
+
+def parse_file(path, workers=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield (times, values) of the chunks of an export in file order, parsed
+    in up to ``workers`` processes (default: one per CPU). At most two
+    chunks per process are parsed ahead of the consumer.
+    """
+    names, offset = read_file_header(path)
+    bounds = chunk_bounds(path, offset, chunk_bytes)
+    workers = min(len(bounds), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for start, end in bounds:
+            yield parse_chunk(path, start, end, len(names))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque(
+            pool.submit(parse_chunk, path, start, end, len(names)) for start, end in bounds[:workers * 2]
+        )
+        queued = bounds[workers * 2:]
+        while pending:
+            result = pending.popleft().result()
+            if queued:
+                start, end = queued.pop(0)
+                pending.append(pool.submit(parse_chunk, path, start, end, len(names)))
+            yield result
+
+
+def split_flights(chunks):
+    """
+    Regroup a stream of (times, values) chunks into one (times, values) per
+    flight. A flight ends where the time jumps ahead by more than
+    FLIGHT_GAP_SECONDS or goes backwards. Rows without a time are dropped.
+    """
+    parts = []
+    last_time = None
+    for times, values in chunks:
+        timed = np.isfinite(times)
+        if not timed.all():
+            times, values = times[timed], values[timed]
+        if not len(times):
+            continue
+        steps = np.diff(times, prepend=times[0] if last_time is None else last_time)
+        first = 0
+        # Rows that start a new flight; row 0 when it follows the previous chunk's flight
+        for start in np.flatnonzero((steps > FLIGHT_GAP_SECONDS) | (steps < 0)):
+            if start > first:
+                parts.append((times[first:start], values[first:start]))
+            if parts:
+                yield _join(parts)
+                parts = []
+            first = start
+        parts.append((times[first:], values[first:]))
+        last_time = times[-1]
+    if parts:
+        yield _join(parts)
+
+
+def _join(parts):
+    if len(parts) == 1:
+        return parts[0]
+    return np.concatenate([times for times, _ in parts]), np.concatenate([values for _, values in parts])
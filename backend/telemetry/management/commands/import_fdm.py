@@ -0,0 +1,92 @@
+import os
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from aircraft.models import Aircraft
+from aircraft.partitions import ensure_partitions, month_start
+from telemetry.fdm import CHUNK_BYTES, FLIGHT_GAP_SECONDS, parse_file, read_file_header, split_flights
+from telemetry.models import TelemetryRecording
+from telemetry.store import store_recorded_flights
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a flight data monitoring (QAR/FDM) CSV export of one aircraft as flights with their "
+        "telemetry and cruise snapshots, parsing the file in parallel. Flights already imported are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV with a time column in UTC Unix seconds, then one column per series")
+        parser.add_argument("--aircraft", type=int, required=True, help="Aircraft id")
+        parser.add_argument("--workers", type=int, help="Parser processes (default: one per CPU)")
+        parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // (1024 * 1024), help="Size of the parsed chunks")
+        parser.add_argument(
+            "--min-minutes", type=float, default=5.0,
+            help="Shorter recordings, e.g. ground runs, are not imported as flights",
+        )
+        parser.add_argument("--batch-size", type=int, default=50, help="Flights inserted per transaction")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        aircraft = Aircraft.objects.unscoped().filter(pk=options["aircraft"]).first()
+        if aircraft is None:
+            raise CommandError(f"Aircraft {options['aircraft']} does not exist.")
+        try:
+            names, _ = read_file_header(path)
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+        imported = set(
+            TelemetryRecording.objects.unscoped()
+            .filter(flight__aircraft=aircraft, started_at__isnull=False)
+            .values_list("started_at", flat=True)
+        )
+
+        started = time.perf_counter()
+        flights = skipped = short = 0
+        months = set()
+        batch = []
+
+        def flush():
+            nonlocal flights
+            pending = batch[:]
+            batch.clear()
+            if pending:
+                for flight in store_recorded_flights(aircraft, pending, names[1:]):
+                    self.stdout.write(f"Flight {flight.pk} on {flight.flight_date}: {flight.hours_flown} h")
+                flights += len(pending)
+
+        chunks = parse_file(path, options["workers"], options["chunk_mb"] * 1024 * 1024)
+        try:
+            try:
+                for times, values in split_flights(chunks):
+                    if times[-1] - times[0] < options["min_minutes"] * 60:
+                        short += 1
+                        continue
+                    started_at = datetime.fromtimestamp(float(times[0]), tz=dt_timezone.utc)
+                    if started_at in imported:
+                        skipped += 1
+                        continue
+                    month = month_start(timezone.localdate(started_at))
+                    if month not in months:
+                        ensure_partitions(month, month)
+                        months.add(month)
+                    batch.append((started_at, times, values))
+                    if len(batch) >= options["batch_size"]:
+                        flush()
+            except ValueError:
+                # Keep the flights parsed before a bad line
+                flush()
+                raise
+            flush()
+        except ValueError as exc:
+            raise CommandError(f"{exc} Flights before this point were imported; run again to resume.")
+        elapsed = time.perf_counter() - started
+        megabytes = os.path.getsize(path) / 1e6
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {flights} flights ({skipped} imported before, {short} shorter than "
+            f"{options['min_minutes']:g} min, gaps over {FLIGHT_GAP_SECONDS}s split flights) "
+            f"from {megabytes:.0f} MB in {elapsed:.1f}s ({megabytes / elapsed:.0f} MB/s)."
+        ))
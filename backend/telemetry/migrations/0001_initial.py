@@ -0,0 +1,56 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0004_operator'),
+        ('aircraft', '0015_partition_by_month'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetryRecording',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Recording Start')),
+                ('sample_interval', models.FloatField(default=1.0, verbose_name='Sample Interval (s)')),
+                ('sample_count', models.PositiveIntegerField(default=0, help_text='Samples per series')),
+                ('series', models.JSONField(default=list, help_text='Names of the recorded series, e.g. press_altitude or InterstageTT.1')),
+                ('cruise_start', models.PositiveIntegerField(blank=True, help_text='First sample of the cruise window the snapshots were taken from', null=True)),
+                ('cruise_end', models.PositiveIntegerField(blank=True, help_text='Sample after the last one of the cruise window', null=True)),
+                ('stored_bytes', models.PositiveBigIntegerField(default=0, help_text='Compressed size of all chunks')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('flight', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='telemetry', to='aircraft.flight', verbose_name='Flight')),
+                ('operator', models.ForeignKey(db_index=False, editable=False, help_text="Copy of the flight's operator", on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.operator')),
+            ],
+            options={
+                'verbose_name': 'Telemetry Recording',
+                'verbose_name_plural': 'Telemetry Recordings',
+            },
+        ),
+        migrations.CreateModel(
+            name='TelemetryChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('series', models.CharField(max_length=32)),
+                ('start', models.PositiveIntegerField(help_text="Index of the chunk's first sample in the recording")),
+                ('sample_count', models.PositiveIntegerField()),
+                ('minimum', models.FloatField(blank=True, null=True)),
+                ('mean', models.FloatField(blank=True, null=True)),
+                ('maximum', models.FloatField(blank=True, null=True)),
+                ('payload', models.BinaryField()),
+                ('recording', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='telemetry.telemetryrecording')),
+            ],
+            options={
+                'verbose_name': 'Telemetry Chunk',
+                'verbose_name_plural': 'Telemetry Chunks',
+                'constraints': [models.UniqueConstraint(fields=('recording', 'series', 'start'), name='unique_telemetry_chunk')],
+            },
+        ),
+    ]
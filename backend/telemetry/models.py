@@ -0,0 +1,119 @@
+from django.db import models
+
+from core.tenancy import OperatorManager
+
+
+# ============================
+# TELEMETRY RECORDING MODEL
+# ============================
+
+class TelemetryRecording(models.Model):
+    """ High-rate recorder data of one flight, stored as compressed chunks per series """
+
+    operator = models.ForeignKey(
+        "accounts.Operator",
+        on_delete=models.PROTECT,
+        related_name="+",
+        editable=False,
+        db_index=False,
+        help_text="Copy of the flight's operator",
+    )
+    flight = models.OneToOneField(
+        "aircraft.Flight",
+        on_delete=models.CASCADE,
+        # Flights are partitioned by month, which rules out database
+        # foreign keys to them (see aircraft.partitions)
+        db_constraint=False,
+        related_name="telemetry",
+        verbose_name="Flight",
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Recording Start",
+    )
+    sample_interval = models.FloatField(
+        default=1.0,
+        verbose_name="Sample Interval (s)",
+    )
+    sample_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Samples per series",
+    )
+    series = models.JSONField(
+        default=list,
+        help_text="Names of the recorded series, e.g. press_altitude or InterstageTT.1",
+    )
+    cruise_start = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="First sample of the cruise window the snapshots were taken from",
+    )
+    cruise_end = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Sample after the last one of the cruise window",
+    )
+    stored_bytes = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Compressed size of all chunks",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created At"
+    )
+
+    objects = OperatorManager()
+
+    class Meta:
+        verbose_name = "Telemetry Recording"
+        verbose_name_plural = "Telemetry Recordings"
+
+    def __str__(self):
+        return f"Telemetry of flight {self.flight_id} ({self.sample_count} samples)"
+
+
+# ============================
+# TELEMETRY CHUNK MODEL
+# ============================
+
+class TelemetryChunk(models.Model):
+    """ A run of consecutive samples of one series, compressed (see telemetry.codec) """
+
+    recording = models.ForeignKey(
+        TelemetryRecording,
+        on_delete=models.CASCADE,
+        related_name="chunks",
+        # The unique constraint below leads with the recording
+        db_index=False,
+    )
+    series = models.CharField(
+        max_length=32,
+    )
+    start = models.PositiveIntegerField(
+        help_text="Index of the chunk's first sample in the recording",
+    )
+    sample_count = models.PositiveIntegerField()
+    minimum = models.FloatField(
+        null=True,
+        blank=True,
+    )
+    mean = models.FloatField(
+        null=True,
+        blank=True,
+    )
+    maximum = models.FloatField(
+        null=True,
+        blank=True,
+    )
+    payload = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["recording", "series", "start"], name="unique_telemetry_chunk"),
+        ]
+        verbose_name = "Telemetry Chunk"
+        verbose_name_plural = "Telemetry Chunks"
+
+    def __str__(self):
+        return f"{self.series} from sample {self.start}"
@@ -0,0 +1,63 @@
+import numpy as np
+
+from .codec import parse_series_name
+
+
+# Four days of 1 Hz samples, far beyond any flight
+MAX_RECORDING_SAMPLES = 86400 * 4
+
+
+def read_header(line):
+    """ Column names of a recorder CSV header line: time first, then known series """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    names = [name.strip() for name in line.lstrip("\ufeff").strip().split(",")]
+    if len(names) < 2:
+        raise ValueError("The header must name a time column and at least one series.")
+    for name in names[1:]:
+        parse_series_name(name)
+    return names
+
+
+def read_telemetry_csv(stream):
+    """
+    Read a recorder CSV export into (sample interval, series).
+
+    The first column is the time in seconds and the others are series named
+    as in telemetry.codec, e.g. ``InterstageTT.1``; empty cells are gaps.
+    The columns are converted to arrays in one pass, and the samples placed
+    on a regular grid at the median time step.
+    """
+    names = read_header(stream.readline())
+    data = np.genfromtxt(stream, delimiter=",", dtype=np.float64, ndmin=2, invalid_raise=True)
+    if data.size == 0:
+        raise ValueError("The file has no samples.")
+    if data.shape[1] != len(names):
+        raise ValueError(f"Rows have {data.shape[1]} columns but the header names {len(names)}.")
+    return to_grid(data[:, 0], data[:, 1:], names[1:])
+
+
+def to_grid(times, values, names):
+    """
+    Place samples taken at ``times`` (seconds) on a regular grid at the
+    median time step, as (sample interval, series). ``values`` has a column
+    per name; grid points without a sample are gaps.
+    """
+    present = np.isfinite(times)
+    times, values = times[present], values[present]
+    if not len(times):
+        raise ValueError("The file has no timed samples.")
+    order = np.argsort(times, kind="stable")
+    times, values = times[order], values[order]
+    steps = np.diff(times)
+    interval = float(np.median(steps[steps > 0])) if (steps > 0).any() else 1.0
+    positions = np.rint((times - times[0]) / interval).astype(np.int64)
+    count = int(positions[-1]) + 1
+    if count > MAX_RECORDING_SAMPLES:
+        raise ValueError(f"The recording spans more than {MAX_RECORDING_SAMPLES} samples.")
+    series = {}
+    for column, name in enumerate(names):
+        grid = np.full(count, np.nan)
+        grid[positions] = values[:, column]
+        series[name] = grid
+    return round(interval, 6), series
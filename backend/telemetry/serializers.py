@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+from .models import TelemetryRecording
+
+
+class TelemetryRecordingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TelemetryRecording
+        exclude = ["operator"]
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from aircraft.models import Aircraft, Flight
+from .models import TelemetryRecording
+
+
+@receiver(post_save, sender=Flight)
+def move_recording_with_flight(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None or previous["operator_id"] == instance.operator_id:
+        return
+    TelemetryRecording.objects.unscoped().filter(flight_id=instance.pk).update(operator_id=instance.operator_id)
+
+
+@receiver(post_save, sender=Aircraft)
+def move_recordings_with_aircraft(sender, instance, created, **kwargs):
+    """ Follow an aircraft that changed operator; its flights are moved in aircraft.signals """
+    previous = getattr(instance, "_previous_values", None)
+    if created or previous is None or previous["operator_id"] == instance.operator_id:
+        return
+    TelemetryRecording.objects.unscoped().filter(flight__aircraft_id=instance.pk).update(operator_id=instance.operator_id)
@@ -0,0 +1,228 @@
+"""
+Storage and time-range reads of telemetry recordings.
+
+Each series is cut into chunks of CHUNK_SAMPLES consecutive samples, which
+are compressed separately (see telemetry.codec) and stored with their
+minimum, mean and maximum. A read decompresses only the chunks overlapping
+the requested time range, and an overview coarser than a chunk is served
+from the chunk statistics without decompressing anything.
+"""
+import math
+import warnings
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from aircraft.ledger import record_new_flights
+from aircraft.models import Flight, FlightEngineData
+from aircraft.signals import flight_event
+from analytics.anomaly import score_snapshots
+from analytics.trends import flag_trend_stores_behind, series_to_json
+from core.cache import bump_data_version
+from core.events import publish_many
+from engines.forecast import refresh_forecasts_on_commit
+from engines.models import Engine
+from engines.rollups import apply_flights_to_engines
+from .codec import decode, encode, parse_series_name, resolution
+from .cruise import cruise_readings, save_cruise_snapshots
+from .models import TelemetryChunk, TelemetryRecording
+from .parsers import to_grid
+
+
+CHUNK_SAMPLES = 3600
+DEFAULT_MAX_POINTS = 2000
+
+# ICAO location indicator for "no code": recorder exports do not name airports
+UNKNOWN_AIRPORT = "ZZZZ"
+
+
+def _chunks(name, values):
+    step = resolution(name)
+    for start in range(0, len(values), CHUNK_SAMPLES):
+        part = values[start:start + CHUNK_SAMPLES]
+        present = part[~np.isnan(part)]
+        yield TelemetryChunk(
+            series=name,
+            start=start,
+            sample_count=len(part),
+            minimum=float(present.min()) if len(present) else None,
+            mean=float(present.mean()) if len(present) else None,
+            maximum=float(present.max()) if len(present) else None,
+            payload=encode(part, step),
+        )
+
+
+def _prepare(series, sample_interval):
+    """ Validated float arrays of ``series``, their length and their chunks """
+    for name in series:
+        parse_series_name(name)
+    lengths = {len(values) for values in series.values()}
+    if len(lengths) != 1:
+        raise ValueError("Give one or more series, all with the same number of samples.")
+    if not sample_interval > 0:
+        raise ValueError("The sample interval must be positive.")
+    series = {name: np.asarray(values, dtype=np.float64) for name, values in series.items()}
+    chunks = [chunk for name in sorted(series) for chunk in _chunks(name, series[name])]
+    return series, lengths.pop(), chunks
+
+
+def _recording(flight, series, sample_interval, sample_count, chunks, window, started_at):
+    return TelemetryRecording(
+        operator_id=flight.operator_id,
+        flight=flight,
+        started_at=started_at,
+        sample_interval=sample_interval,
+        sample_count=sample_count,
+        series=sorted(series),
+        cruise_start=window[0] if window else None,
+        cruise_end=window[1] if window else None,
+        stored_bytes=sum(len(chunk.payload) for chunk in chunks),
+    )
+
+
+def store_recording(flight, series, sample_interval=1.0, started_at=None):
+    """
+    Store ``series`` (name -> float array, NaN for gaps, all of one length)
+    as the telemetry of ``flight``, replacing any earlier recording, and
+    update the flight's cruise snapshots from it. Raises ValueError for
+    unknown series names or arrays of different lengths.
+    """
+    series, sample_count, chunks = _prepare(series, sample_interval)
+
+    with transaction.atomic():
+        TelemetryRecording.objects.unscoped().filter(flight_id=flight.pk).delete()
+        window = save_cruise_snapshots(flight, series, sample_interval)
+        recording = _recording(flight, series, sample_interval, sample_count, chunks, window, started_at)
+        recording.save()
+        for chunk in chunks:
+            chunk.recording = recording
+        TelemetryChunk.objects.bulk_create(chunks, batch_size=500)
+    return recording
+
+
+def store_recorded_flights(aircraft, recorded, names):
+    """
+    Log flights of ``aircraft`` from recorder samples, each a (start time,
+    times, values) triple, and store the samples as their recordings.
+    ``times`` are in seconds and ``values`` has a column per series name;
+    a flight lasts from its first sample to its last.
+
+    Flights, snapshots, recordings and chunks are inserted in bulk in one
+    transaction, so the utilization ledger, engine counters, anomaly
+    scoring and forecasts are updated, and the flights announced, once for
+    the batch, as in aircraft.ingest. Returns the flights.
+    """
+    prepared = []
+    for started_at, times, values in recorded:
+        interval, series = to_grid(times, values, names)
+        hours = Decimal(f"{(times[-1] - times[0]) / 3600:.1f}")
+        prepared.append((started_at, hours, interval, *_prepare(series, interval)))
+    engines = list(Engine.objects.filter(aircraft_id=aircraft.pk, position__isnull=False))
+
+    with transaction.atomic():
+        flights = Flight.objects.bulk_create(
+            Flight(
+                aircraft=aircraft,
+                operator_id=aircraft.operator_id,
+                flight_date=timezone.localdate(started_at),
+                departure_airport=UNKNOWN_AIRPORT,
+                arrival_airport=UNKNOWN_AIRPORT,
+                hours_flown=hours,
+            )
+            for started_at, hours, *_ in prepared
+        )
+        snapshots, recordings = [], []
+        for flight, (started_at, _, interval, series, sample_count, chunks) in zip(flights, prepared):
+            window, readings = cruise_readings(series, interval)
+            snapshots.extend(
+                FlightEngineData(
+                    flight=flight,
+                    engine=engine,
+                    flight_date=flight.flight_date,
+                    operator_id=flight.operator_id,
+                    **readings[engine.position],
+                )
+                for engine in engines if engine.position in readings
+            )
+            recordings.append(_recording(flight, series, interval, sample_count, chunks, window, started_at))
+        TelemetryRecording.objects.bulk_create(recordings)
+        for recording, (*_, chunks) in zip(recordings, prepared):
+            for chunk in chunks:
+                chunk.recording = recording
+        TelemetryChunk.objects.bulk_create([chunk for *_, chunks in prepared for chunk in chunks], batch_size=500)
+        FlightEngineData.objects.bulk_create(snapshots)
+
+        # bulk_create sends no signals; roll the batch up here instead
+        record_new_flights(flights)
+        apply_flights_to_engines(aircraft.pk, [(flight.flight_date, flight.hours_flown) for flight in flights])
+        if snapshots:
+            flag_trend_stores_behind([aircraft.pk], min(snapshot.pk for snapshot in snapshots))
+            score_snapshots([snapshot.pk for snapshot in snapshots])
+        refresh_forecasts_on_commit(aircraft_ids=[aircraft.pk])
+        bump_data_version(aircraft.pk, operator_ids=[aircraft.operator_id])
+        publish_many("flight", ((flight.operator_id, flight_event(flight)) for flight in flights))
+    return flights
+
+
+def _bucket(values, size):
+    """ Minimum, mean and maximum of consecutive runs of ``size`` samples """
+    padded = np.pad(values, (0, -len(values) % size), constant_values=np.nan).reshape(-1, size)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmin(padded, axis=1), np.nanmean(padded, axis=1), np.nanmax(padded, axis=1)
+
+
+def read_series(recording, names, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+    """
+    Samples of the named series between ``start`` and ``end`` seconds into
+    the recording. Above ``max_points`` samples, consecutive samples are
+    merged into buckets reported with their minimum and maximum.
+    """
+    unknown = [name for name in names if name not in recording.series]
+    if unknown:
+        raise ValueError(f"Not recorded: {', '.join(unknown)}.")
+    interval = recording.sample_interval
+    count = recording.sample_count
+    lo = 0 if start is None else min(max(math.floor(start / interval), 0), count)
+    hi = count if end is None else min(max(math.floor(end / interval) + 1, lo), count)
+    bucket = max(1, math.ceil((hi - lo) / max(1, max_points)))
+    chunks = TelemetryChunk.objects.filter(
+        recording=recording, series__in=names, start__gte=lo - lo % CHUNK_SAMPLES, start__lt=hi,
+    ).order_by("series", "start")
+
+    if bucket >= CHUNK_SAMPLES:
+        first = lo - lo % CHUNK_SAMPLES
+        columns = {name: ([], [], []) for name in names}
+        for name, minimum, mean, maximum in chunks.values_list("series", "minimum", "mean", "maximum"):
+            for column, value in zip(columns[name], (minimum, mean, maximum)):
+                column.append(np.nan if value is None else value)
+        return {
+            "start": first * interval,
+            "step": CHUNK_SAMPLES * interval,
+            "series": {
+                name: {
+                    "values": series_to_json(np.array(means)),
+                    "min": series_to_json(np.array(minima)),
+                    "max": series_to_json(np.array(maxima)),
+                }
+                for name, (minima, means, maxima) in columns.items()
+            },
+        }
+
+    arrays = {name: np.full(hi - lo, np.nan) for name in names}
+    for name, chunk_start, payload in chunks.values_list("series", "start", "payload"):
+        values = decode(bytes(payload), resolution(name))
+        first, last = max(lo, chunk_start), min(hi, chunk_start + len(values))
+        arrays[name][first - lo:last - lo] = values[first - chunk_start:last - chunk_start]
+    result = {"start": lo * interval, "step": bucket * interval, "series": {}}
+    for name, values in arrays.items():
+        if bucket == 1:
+            result["series"][name] = {"values": series_to_json(values)}
+        else:
+            minima, means, maxima = _bucket(values, bucket)
+            result["series"][name] = {
+                "values": series_to_json(means), "min": series_to_json(minima), "max": series_to_json(maxima),
+            }
+    return result
@@ -0,0 +1,82 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from .codec import decode, encode, parse_series_name, resolution
+from .parsers import to_grid
+
+
+class CodecRoundTripTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.itt = 700 + np.cumsum(rng.normal(0, 0.4, 5000))
+
+    def round_trip(self, values, step):
+        return decode(encode(values, step), step)
+
+    def assertRoundTrips(self, values, step):
+        decoded = self.round_trip(values, step)
+        self.assertEqual(len(decoded), len(values))
+        np.testing.assert_array_equal(np.isnan(decoded), np.isnan(values))
+        present = ~np.isnan(values)
+        # Rounded to the nearest multiple of the step, and no further
+        error = np.abs(decoded[present] - values[present])
+        self.assertLessEqual(error.max(initial=0.0), step / 2 + 1e-9 * np.abs(values[present]).max(initial=1.0))
+        return decoded
+
+    def test_quantization_error_is_at_most_half_a_step(self):
+        for step in (0.001, 0.01, 0.1, 1.0):
+            with self.subTest(step=step):
+                self.assertRoundTrips(self.itt, step)
+
+    def test_values_on_the_grid_are_exact(self):
+        values = np.round(self.itt, 1)
+        np.testing.assert_allclose(self.round_trip(values, 0.1), values, rtol=0, atol=1e-9)
+
+    def test_gaps(self):
+        values = self.itt.copy()
+        values[[10, 11, 12, 500, 4999]] = np.nan
+        values[1000:2000] = np.nan
+        self.assertRoundTrips(values, 0.1)
+
+    def test_leading_gaps(self):
+        values = self.itt.copy()
+        values[:37] = np.nan
+        self.assertRoundTrips(values, 0.1)
+
+    def test_all_missing(self):
+        self.assertTrue(np.isnan(self.round_trip(np.full(100, np.nan), 1.0)).all())
+
+    def test_empty(self):
+        self.assertEqual(len(self.round_trip(np.array([]), 1.0)), 0)
+
+    def test_single_sample_and_negative_values(self):
+        self.assertRoundTrips(np.array([-56.5]), 0.1)
+        self.assertRoundTrips(np.array([-1000.0, 45000.0, -1000.0, 0.0]), 1.0)
+
+    def test_steady_series_compress(self):
+        steady = np.round(np.full(3600, 35000.0) + np.sin(np.arange(3600) / 100) * 20)
+        self.assertLess(len(encode(steady, 1.0)), steady.nbytes // 20)
+
+
+class SeriesNameTests(SimpleTestCase):
+    def test_names(self):
+        self.assertEqual(parse_series_name("press_altitude"), ("press_altitude", None))
+        self.assertEqual(parse_series_name("InterstageTT.2"), ("InterstageTT", 2))
+        self.assertEqual(resolution("mach_number"), 0.001)
+        self.assertEqual(resolution("EngineVib.1"), 0.01)
+        for name in ("InterstageTT", "InterstageTT.0", "InterstageTT.5", "InterstageTT.²", "press_altitude.1", "N1.1"):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                parse_series_name(name)
+
+
+class ToGridTests(SimpleTestCase):
+    def test_places_samples_on_the_median_step(self):
+        times = np.array([0.0, 1.0, 2.0, 4.0, 5.0])
+        interval, series = to_grid(times, np.arange(5.0).reshape(-1, 1), ["press_altitude"])
+        self.assertEqual(interval, 1.0)
+        np.testing.assert_array_equal(series["press_altitude"], [0, 1, 2, np.nan, 3, 4])
+
+    def test_no_timed_samples(self):
+        for times in (np.array([np.nan, np.nan]), np.array([np.inf, np.nan])):
+            with self.subTest(times=times), self.assertRaisesMessage(ValueError, "The file has no timed samples."):
+                to_grid(times, np.ones((2, 1)), ["press_altitude"])
@@ -0,0 +1,6 @@
+from django.urls import path
+from .api_views import FlightTelemetryView
+
+urlpatterns = [
+    path("flights/<int:flight_id>/", FlightTelemetryView.as_view(), name="flight_telemetry"),
+]
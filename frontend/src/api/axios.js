@@ -82,4 +82,5 @@ api.interceptors.response.use(
 	}
 );
 
+export { API_BASE };
 export default api;
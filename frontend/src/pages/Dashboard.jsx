@@ -1,9 +1,75 @@
 // src/pages/Dashboard.jsx
 import React, { useEffect, useState } from "react";
-import api from "../api/axios";
+import api, { API_BASE } from "../api/axios";
+import styles from "./Dashboard.module.css";
+
+const EVENT_KINDS = ["flight", "alert", "expense"];
+const MAX_EVENTS = 50;
+const RECONNECT_MS = 3000;
+
+function describeEvent(kind, data) {
+	switch (kind) {
+		case "flight":
+			return `${data.registration} flew ${data.departure_airport}-${data.arrival_airport} (${data.hours_flown} h)`;
+		case "alert":
+			return `Engine ${data.serial}: ${data.parameter} exceedance, ${Number(data.value).toFixed(1)} against ${Number(data.expected).toFixed(1)} expected`;
+		case "expense":
+			return `${data.expense_type} expense of ${data.expense_amount} on flight ${data.flight}`;
+		default:
+			return kind;
+	}
+}
+
+// Fleet events pushed by the server as they happen, newest first
+function useFleetEvents() {
+	const [events, setEvents] = useState([]);
+
+	useEffect(() => {
+		let source = null;
+		let timer = null;
+		let stopped = false;
+
+		const connect = async () => {
+			if (stopped || !localStorage.getItem("access_token")) return;
+			// EventSource cannot send headers, so a single-use ticket goes in
+			// the query string instead of the access token
+			let ticket;
+			try {
+				({ ticket } = (await api.post("/api/analytics/events/ticket/")).data);
+			} catch {
+				timer = setTimeout(connect, RECONNECT_MS);
+				return;
+			}
+			if (stopped) return;
+			source = new EventSource(`${API_BASE}/api/analytics/events/?ticket=${encodeURIComponent(ticket)}`);
+			const onEvent = (e) => {
+				const data = JSON.parse(e.data);
+				const event = { key: `${e.type}-${data.id}`, kind: e.type, data, receivedAt: new Date() };
+				setEvents((previous) => [event, ...previous].slice(0, MAX_EVENTS));
+			};
+			EVENT_KINDS.forEach((kind) => source.addEventListener(kind, onEvent));
+			source.onerror = () => {
+				// The server ends the stream when the access token expires.
+				// Asking for a new ticket refreshes it (see api/axios).
+				source.close();
+				timer = setTimeout(connect, RECONNECT_MS);
+			};
+		};
+
+		connect();
+		return () => {
+			stopped = true;
+			clearTimeout(timer);
+			if (source) source.close();
+		};
+	}, []);
+
+	return events;
+}
 
 export default function Dashboard() {
 	const [profile, setProfile] = useState(null);
+	const events = useFleetEvents();
 
 	useEffect(() => {
 		let mounted = true;
@@ -22,6 +88,20 @@ export default function Dashboard() {
 			<h2>Welcome {profile.first_name}</h2>
 			<p>Email: {profile.email}</p>
 			<p>Role: {profile.role}</p>
+
+			<h3>Live fleet activity</h3>
+			{events.length === 0 ? (
+				<p className={styles.empty}>No new flights, alerts or expenses yet.</p>
+			) : (
+				<ul className={styles.feed}>
+					{events.map((event) => (
+						<li key={event.key} className={`${styles.event} ${styles[event.kind]}`}>
+							<span className={styles.time}>{event.receivedAt.toLocaleTimeString()}</span>
+							{describeEvent(event.kind, event.data)}
+						</li>
+					))}
+				</ul>
+			)}
 		</div>
 	);
 }